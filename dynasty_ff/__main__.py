@@ -0,0 +1,11 @@
+import os
+import sys
+
+# `python dynasty_ff run ...` from the repo root
+scripts_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+sys.path.insert(0, scripts_path)
+sys.path.insert(1, os.path.join(scripts_path, "scrape"))
+
+from pipeline import main
+
+main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(scripts_dir)
+
+import pandas as pd
+from data_store import read_dataset
+from identity import (
+    IDENTITY_POSITIONS, build_identity_index, canonical_names, load_source_records, name_ngrams, similar_names
+)
+
+# Distinct query names scored against every player on the all-pairs path (it is extrapolated from these)
+ALL_PAIRS_SAMPLE = 300
+
+
+def benchmark_universe():
+    """The cached Sleeper universe, or one player per PFR (name, position, birth year) when it is not cached."""
+    from sleeper_players import PAYLOAD_PATH, load_player_universe
+
+    if os.path.exists(PAYLOAD_PATH):
+        return "Sleeper", load_player_universe()
+
+    fantasy_df = read_dataset("fantasy_scores", columns=["Player", "FantPos", "Year", "Age"]).dropna()
+    birth_year = (fantasy_df["Year"] - fantasy_df["Age"]).astype(int)
+    players = fantasy_df.assign(Birth_Year=birth_year).drop_duplicates(["Player", "FantPos", "Birth_Year"])
+    return "PFR stand-in", pd.DataFrame({
+        "Sleeper_Player_ID": [str(i) for i in range(len(players))],
+        "Full_Name": players["Player"].to_numpy(),
+        "Position": players["FantPos"].to_numpy(),
+        "Birth_Date": players["Birth_Year"].astype(str).to_numpy() + "-07-01",
+        "rookie_year": 0,
+    })
+
+
+def all_pairs_seconds(records, universe):
+    """Estimated time to score every distinct query name against every player (no blocking, no index)."""
+    queries = canonical_names(records["Source_Name"]).drop_duplicates()
+    players = universe[universe["Position"].isin(IDENTITY_POSITIONS)]
+    player_grams = [(name, name_ngrams(name)) for name in canonical_names(players["Full_Name"]).unique()]
+
+    sample = queries.sample(min(ALL_PAIRS_SAMPLE, len(queries)), random_state=0)
+    start = time.perf_counter()
+    for query in sample:
+        grams = name_ngrams(query)
+        for name, other in player_grams:
+            similar_names(query, name, 2 * len(grams & other) / (len(grams) + len(other)))
+    return (time.perf_counter() - start) * len(queries) / len(sample)
+
+
+def run_benchmark():
+    label, universe = benchmark_universe()
+    records = load_source_records()
+    print(f"🔎 {len(records)} source records against the {label} universe ({len(universe)} players)")
+
+    for share in (0.25, 0.5, 1.0):
+        subset = universe.sample(frac=share, random_state=0) if share < 1 else universe
+        start = time.perf_counter()
+        index = build_identity_index(subset, records, overrides_path=None)
+        secs = time.perf_counter() - start
+        resolved = index["Player_ID"].notna().sum()
+        print(f"   {len(subset):6d} players: blocked n-gram index {secs:6.2f}s | {resolved} records resolved")
+
+    print(f"   all pairs (no blocking, estimated): {all_pairs_seconds(records, universe):6.2f}s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
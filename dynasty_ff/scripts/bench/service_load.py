@@ -0,0 +1,132 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from urllib.parse import quote
+
+scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(scripts_dir)
+
+import numpy as np
+import pandas as pd
+from grade_free_agents import PROJECTIONS_PATH
+from projection_service import make_server
+
+# Requests per client thread, and client threads
+REQUESTS_PER_CLIENT = 500
+CLIENTS = 8
+
+# Seconds between projection file rewrites while --reload is on
+REWRITE_INTERVAL = 0.5
+
+
+def request_paths(df, n, seed=0):
+    """A random mix of the service's endpoints, drawn from the projections themselves."""
+    rng = np.random.default_rng(seed)
+    ids = df["Sleeper_Player_ID"].astype(str).to_numpy()
+    names = df["Player"].to_numpy()
+    teams = df["Team"].unique()
+    kinds = [
+        lambda: f"/players/{rng.choice(ids)}",
+        lambda: f"/players?name={quote(str(rng.choice(names)))}",
+        lambda: f"/players?position={rng.choice(['QB', 'RB', 'WR', 'TE'])}&limit=25",
+        lambda: f"/teams/{quote(str(rng.choice(teams)))}",
+        lambda: "/teams",
+        lambda: f"/free-agents?top=25&pos={rng.choice(['QB', 'RB', 'WR', 'TE'])}&mode={rng.choice(['all', 'rookies', 'vets'])}",
+        lambda: "/free-agents?top=50&max_age=25",
+    ]
+    return [kinds[k]() for k in rng.integers(len(kinds), size=n)]
+
+
+def run_client(host, port, paths):
+    """Issues the paths over one keep-alive connection; returns (latencies in ms, errors)."""
+    conn = HTTPConnection(host, port)
+    latencies, errors = [], 0
+    for path in paths:
+        start = time.perf_counter()
+        conn.request("GET", path)
+        response = conn.getresponse()
+        body = response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status != 200:
+            errors += 1
+        else:
+            json.loads(body)
+    conn.close()
+    return latencies, errors
+
+
+def rewrite_projections(path, df, stop):
+    """Keeps replacing the projections file (as the pipeline does) until stopped."""
+    rewrites = 0
+    while not stop.wait(REWRITE_INTERVAL):
+        df.to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        rewrites += 1
+    return rewrites
+
+
+def serve_copy(path, ports):
+    """Child process: serves `path` on a free port and reports the port back."""
+    server = make_server(port=0, path=path, interval=0.1)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def run_benchmark(clients=CLIENTS, requests_per_client=REQUESTS_PER_CLIENT, reload=False):
+    """
+    Load-tests the service on a private copy of the projections. The server
+    runs in its own process, as it would in use, so the client threads here
+    don't compete with it for the GIL.
+    """
+    df = pd.read_csv(PROJECTIONS_PATH)
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "dynasty_projections.csv")
+    shutil.copy(PROJECTIONS_PATH, path)
+
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    server = context.Process(target=serve_copy, args=(path, ports), daemon=True)
+    server.start()
+    host, port = "127.0.0.1", ports.get(timeout=60)
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=clients + 1) as pool:
+        rewriter = pool.submit(rewrite_projections, path, df, stop) if reload else None
+        start = time.perf_counter()
+        results = list(pool.map(
+            run_client,
+            [host] * clients, [port] * clients,
+            [request_paths(df, requests_per_client, seed) for seed in range(clients)]
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        rewrites = rewriter.result() if rewriter else 0
+
+    server.terminate()
+    server.join()
+    shutil.rmtree(workdir)
+
+    latencies = np.concatenate([r[0] for r in results])
+    errors = sum(r[1] for r in results)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"🔎 {len(latencies)} requests from {clients} clients in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"   latency ms: p50 {p50:.2f} | p95 {p95:.2f} | p99 {p99:.2f} | max {latencies.max():.2f}")
+    print(f"   errors: {errors}" + (f" | file rewritten {rewrites} times mid-run" if reload else ""))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the projection service on a private copy of the projections")
+    parser.add_argument("--clients", type=int, default=CLIENTS)
+    parser.add_argument("--requests", type=int, default=REQUESTS_PER_CLIENT, help="requests per client")
+    parser.add_argument("--reload", action="store_true", help="rewrite the projections file while under load")
+    args = parser.parse_args()
+    run_benchmark(args.clients, args.requests, args.reload)
@@ -0,0 +1,68 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_root = os.path.dirname(scripts_dir)
+
+# Optional dependencies that should only load when a command actually needs them
+HEAVY_MODULES = ["sklearn", "xgboost", "matplotlib", "bs4", "selenium", "webdriver_manager", "tqdm", "lxml"]
+
+FREE_AGENT_QUERY = f"""
+import pandas as pd
+from grade_free_agents import rank_free_agents
+rank_free_agents(pd.read_csv({os.path.join(project_root, "data", "league_data", "dynasty_projections.csv")!r}), top_n=50, mode="vets")
+"""
+
+# Entry point -> code run in a fresh interpreter
+ENTRY_POINTS = {
+    "free agent query": FREE_AGENT_QUERY,
+    "grade_free_agents": "import grade_free_agents",
+    "pipeline (CLI)": "import pipeline",
+    "league_batch": "import league_batch",
+    "build_projections": "import build_projections",
+    "calculate_fantasy_points": "import calculate_fantasy_points",
+    "enrich_player_pool": "import enrich_player_pool",
+    "classify_player_pool": "import classify_player_pool",
+    "generate_rookie_models": "import generate_rookie_models",
+    "generate_rookie_projections": "import generate_rookie_projections",
+    "fetch_data": "import fetch_data",
+}
+
+# Startup budget (seconds) for interactive queries
+QUERY_BUDGET = 1.0
+
+
+def time_entry_point(code, runs):
+    """Median wall time of `code` in a fresh interpreter, and the heavy modules it loaded."""
+    report = "\nimport json, sys\nprint(json.dumps([m for m in %r if m in sys.modules]))" % HEAVY_MODULES
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([scripts_dir, os.path.join(scripts_dir, "scrape")]))
+    times, loaded = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code + report], env=env, cwd=scripts_dir,
+                                capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return statistics.median(times), loaded
+
+
+def run_benchmark(runs=5):
+    """Times each entry point's startup (interpreter start + imports) in fresh processes."""
+    for name, code in ENTRY_POINTS.items():
+        secs, loaded = time_entry_point(code, runs)
+        if secs is None:
+            print(f"❌ {name:<28} failed: {loaded}")
+            continue
+        heavy = ", ".join(loaded) or "-"
+        flag = "⚠️" if name == "free agent query" and secs > QUERY_BUDGET else "✅"
+        print(f"{flag} {name:<28} {secs:6.3f}s | heavy modules loaded: {heavy}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,135 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(scripts_dir, "scrape"))
+
+from html_tables import find_table
+from http_cache import get_cache
+
+# Cached pages benchmarked when no files are given
+CACHED_PAGE_PATTERNS = ["pro-football-reference.com", "sports-reference.com/cfb"]
+
+# Runs in a fresh interpreter: peak RSS growth (KB) while extracting one table.
+# Linux resets the peak (VmHWM) on writing 5 to clear_refs, so import-time
+# peaks don't hide the parse.
+MEMORY_PROBE = """
+import json, sys
+sys.path.append({bench_dir!r})
+import bs4, lxml.etree, lxml.html
+from table_parsing import PARSERS
+
+def status_kb(field):
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(field + ":"))
+
+html = open({path!r}, encoding="utf-8").read()
+with open("/proc/self/clear_refs", "w") as f:
+    f.write("5")
+before = status_kb("VmRSS")
+PARSERS[{parser!r}](html, {table_id!r})
+print(json.dumps(status_kb("VmHWM") - before))
+"""
+
+
+def legacy_table_frame(html, table_id=None):
+    """The scrapers' original path: BeautifulSoup the page, then read_html the table's markup."""
+    from io import StringIO
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", {"id": table_id}) if table_id else soup.find("table")
+    if table is None:
+        return pd.DataFrame()
+    return pd.read_html(StringIO(str(table)))[0]
+
+
+def streaming_table_frame(html, table_id=None):
+    import pandas as pd
+
+    table = find_table(html, table_id)
+    return table.to_frame() if table is not None else pd.DataFrame()
+
+
+PARSERS = {
+    "bs4 + read_html": legacy_table_frame,
+    "html_tables": streaming_table_frame,
+}
+
+
+def load_pages(args):
+    """[(label, html, table_id)] from "path[:table_id]" arguments, or PFR pages in the HTTP cache."""
+    pages = []
+    for arg in args:
+        path, _, table_id = arg.partition(":")
+        with open(path, encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read(), table_id or None))
+    if args:
+        return pages
+
+    cache = get_cache()
+    for pattern in CACHED_PAGE_PATTERNS:
+        for url, *_ in cache.entries(pattern):
+            response = cache.get(url, allow_stale=True)
+            if response is not None and response.status_code == 200:
+                pages.append((url, response.text, None))
+    return pages
+
+
+def time_parser(parser, html, table_id, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        df = parser(html, table_id)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(df)
+
+
+def peak_memory(parser_name, html, table_id):
+    """Peak RSS growth (MB) while one table is extracted, measured in a fresh interpreter (Linux only)."""
+    import tempfile
+
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as f:
+        f.write(html)
+    try:
+        code = MEMORY_PROBE.format(
+            bench_dir=os.path.dirname(os.path.abspath(__file__)), path=f.name, parser=parser_name, table_id=table_id
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=scripts_dir)
+        if result.returncode != 0:
+            return None
+        return json.loads(result.stdout.strip().splitlines()[-1]) / 1024
+    finally:
+        os.remove(f.name)
+
+
+def run_benchmark(pages, runs=5):
+    """Parse time and memory of each table extraction path on every page."""
+    if not pages:
+        print("❌ No pages to benchmark: pass saved pages as path[:table_id] or warm the HTTP cache first")
+        return
+
+    for label, html, table_id in pages:
+        print(f"\n📄 {label} ({len(html) / 1024:.0f} KB, table {table_id or 'first'})")
+        baseline = None
+        for name, parser in PARSERS.items():
+            secs, rows = time_parser(parser, html, table_id, runs)
+            mem = peak_memory(name, html, table_id)
+            baseline = baseline or secs
+            mem_text = f"{mem:7.1f} MB" if mem is not None else "      n/a"
+            print(f"   {name:<16} {secs * 1000:8.1f} ms  {mem_text}  {rows:5d} rows  ({baseline / secs:.1f}x)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark HTML table extraction on saved pages")
+    parser.add_argument("pages", nargs="*", help="saved page paths, optionally path:table_id")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(load_pages(args.pages), args.runs)
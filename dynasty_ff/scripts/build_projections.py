@@ -1,16 +1,41 @@
 import os
 import pandas as pd
 import numpy as np
-
-def build_dynasty_projections():
-    current_year = 2025
-    # Paths
+from lookups import player_keys, lookup_rows, draft_capital_rows, curve_rows, load_lookups
+from tiers import tier_scheme
+
+CURRENT_YEAR = 2025
+
+# Ages at which a Flex/Bench player can still be flagged as a breakout
+BREAKOUT_AGE_WINDOWS = {
+    "WR": (24, 28),
+    "RB": (23, 27),
+    "QB": (25, 30),
+    "TE": (25, 30)
+}
+
+# Positional rank a season must reach to count as productive
+PRODUCTIVE_THRESHOLDS = {
+    "QB": 20,
+    "RB": 30,
+    "WR": 40,
+    "TE": 20
+}
+
+# Blended projections (weights can be tuned)
+HISTORICAL_WEIGHT = 0.7
+CURVE_WEIGHT = 0.3
+RECENT_WEIGHTS = [1.0, 0.75, 0.5, 0.35, 0.25]
+
+# Curve evaluation window: up to 5 seasons ahead, career capped at 10 years forward
+FUTURE_YEARS = 6
+CAREER_YEARS = 11
+
+
+def load_projection_inputs():
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_path = os.path.join(project_root, "data", "league_data")
     roster_df = pd.read_csv(os.path.join(data_path, "player_pool_enriched.csv"))
-    aging_df = pd.read_csv(os.path.join(data_path, "aging_curve_coefficients.csv"))
-    fantasy_df = pd.read_csv(os.path.join(project_root, "data", "historical_stats", "fantasy_scores_2000_2024.csv"))
-    rookie_df = pd.read_csv(os.path.join(data_path, "rookie_draft_data.csv"))
 
     # Load breakout probabilities if available
     breakout_path = os.path.join(data_path, "breakout_probabilities.csv")
@@ -19,309 +44,249 @@ def build_dynasty_projections():
     else:
         breakout_df = None
 
+    return roster_df, breakout_df
+
+
+def filter_player_pool(roster_df):
     # Clean + filter player pool
     roster_df = roster_df[roster_df["Status"].isin(["Active", "injured reserve", "non football injury", "physically unable to perform", None])]
     roster_df = roster_df[roster_df["Position"].isin(["QB", "RB", "WR", "TE"])]
-    roster_df = roster_df.dropna(subset=["Age"])
+    roster_df = roster_df.dropna(subset=["Age"]).copy()
     roster_df["Age"] = roster_df["Age"].astype(int)
+    return roster_df.reset_index(drop=True)
+
+
+def prefix_sums(values, lengths):
+    """
+    Row sums of values[:, :length], accumulated in the same order np.sum uses
+    for a 1-D array (sequential below 8 items, 8-way pairwise above) so the
+    results match the scalar path bit for bit.
+    """
+    total = np.zeros(len(values))
+    for j in range(values.shape[1]):
+        total = np.where(j < lengths, total + values[:, j], total)
+
+    if values.shape[1] >= 8:
+        v = values
+        blocked = ((v[:, 0] + v[:, 1]) + (v[:, 2] + v[:, 3])) + ((v[:, 4] + v[:, 5]) + (v[:, 6] + v[:, 7]))
+        for j in range(8, values.shape[1]):
+            blocked = np.where(j < lengths, blocked + v[:, j], blocked)
+        total = np.where(lengths >= 8, blocked, total)
+
+    return total
+
+
+def prefix_means(values, lengths):
+    counts = np.maximum(lengths, 1)
+    return np.where(lengths > 0, prefix_sums(values, lengths) / counts, 0.0)
+
+
+def weighted_recent_avg(past_scores, has_history, max_years):
+    numerator = np.zeros(len(past_scores))
+    denominator = np.zeros(len(past_scores))
+    for j, weight in enumerate(RECENT_WEIGHTS[:max_years]):
+        valid = ~np.isnan(past_scores[:, j])
+        numerator = np.where(valid, numerator + weight * past_scores[:, j], numerator)
+        denominator = np.where(valid, denominator + weight, denominator)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(has_history, numerator / denominator, 0.0)
+
+
+def round_like_scalar(values, python_floats, ndigits):
+    """
+    Rounds an array the way round() treated each scalar in the per-player
+    loop: numpy floats via np.round, plain Python floats via float.__round__.
+    """
+    rounded = np.round(values, ndigits)
+    if python_floats.any():
+        rounded[python_floats] = [round(float(v), ndigits) for v in values[python_floats]]
+    return rounded
+
+
+def project_player_pool(roster_df, breakout_df, lookups, current_year=CURRENT_YEAR):
+    """
+    Computes dynasty projections for the whole player pool at once, using the
+    shared keyed indexes from lookups.load_lookups() for history, draft capital
+    and curve coefficients.
+
+    Every per-player rule (tiering, curve evaluation, blended 1/3/5-year and
+    career projections, breakout multipliers, veteran decay and productive
+    floors) runs as a column operation over the pool.
+    """
+    pool = filter_player_pool(roster_df)
+
+    def column(name, default):
+        return pool[name] if name in pool.columns else pd.Series([default] * len(pool), index=pool.index)
+
+    pos = pool["Position"].to_numpy(dtype=object)
+    age = pool["Age"].to_numpy(dtype=np.int64)
+    full_name = column("Full_Name", "")
+    # Resolved players join each source on their Sleeper ID, the rest by name
+    player_id = column("Sleeper_Player_ID", None)
+    identity_ids = lookups["identity_ids"]
+    history_key = player_keys(player_id, full_name.astype(object), identity_ids["pfr"]).to_numpy(dtype=object)
+    draft_key = player_keys(player_id, full_name.astype(object), identity_ids["draft"]).to_numpy(dtype=object)
+    rookie_year = pool["rookie_year"].fillna(0).astype(int).to_numpy()
+    is_rookie = column("Is_Rookie", False).astype(int).to_numpy()
+    is_sophomore = (rookie_year == current_year - 1).astype(int)
+    is_rostered = column("Is_Rostered", False).astype(int).to_numpy()
+    years_exp = pd.to_numeric(column("years_exp", 0), errors="coerce").to_numpy(dtype=float)
+
+    # Draft capital: first draft entry per player
+    capital = draft_capital_rows(lookups["draft_capital"], draft_key)
+    draft_round = capital["Draft_Round"].to_numpy(dtype=float)
+    overall_pick = capital["Overall_Pick"].to_numpy(dtype=float)
+
+    # Breakout probability: first (Position, Age) entry, 0.0 when missing
+    breakout = breakout_df.drop_duplicates(["Position", "Age"])[["Position", "Age", "Avg_Fantasy_Pts"]]
+    breakout_prob = lookup_rows(breakout, ["Position", "Age"], [pos, age])["Avg_Fantasy_Pts"].fillna(0.0).to_numpy()
+
+    # Historical performance, newest season first
+    history = lookup_rows(lookups["recent_history"].reset_index(), ["Name_Key", "FantPos"], [history_key, pos])
+    past_scores = history[[f"Pts_{i}" for i in range(5)]].to_numpy(dtype=float)
+    past_ranks = history[[f"Rank_{i}" for i in range(3)]].to_numpy(dtype=float)
+    has_history = history["Seasons"].fillna(0).to_numpy() > 0
+
+    # Use average of up to last 3 seasons for tiering
+    valid_ranks = ~np.isnan(past_ranks)
+    rank_counts = valid_ranks.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_rank = np.where(valid_ranks, past_ranks, 0.0).sum(axis=1) / rank_counts
+    # Players without history get their position's widest rank tier
+    rank_tiers = tier_scheme("rank")
+    best_tier = np.where(has_history, rank_tiers.classify(avg_rank, pos), rank_tiers.loosest_tiers(pos))
+
+    # Use curve for position and best tier
+    curve = curve_rows(lookups["curves"], pos, best_tier)
+    has_curve = curve["a"].notna().to_numpy()
+    for name, tier in zip(full_name[~has_curve], best_tier[~has_curve]):
+        print(f"⚠️ Skipping {name} due to missing or invalid curve: {tier}")
+
+    keep = np.flatnonzero(has_curve)
+    pool = pool.iloc[keep].reset_index(drop=True)
+    (pos, age, rookie_year, is_rookie, is_sophomore, is_rostered, years_exp, draft_round, overall_pick,
+     breakout_prob, past_scores, past_ranks, has_history) = (
+        arr[keep] for arr in (pos, age, rookie_year, is_rookie, is_sophomore, is_rostered, years_exp,
+                              draft_round, overall_pick, breakout_prob, past_scores, past_ranks, has_history)
+    )
+    full_name = full_name.iloc[keep].reset_index(drop=True)
+    curve = curve.iloc[keep]
+    a, b, c = (curve[k].to_numpy(dtype=float) for k in ("a", "b", "c"))
+    max_age = curve["max_age"].to_numpy(dtype=np.int64)
+
+    # Age-based curve scores for age .. age + 10
+    ages = age[:, None] + np.arange(CAREER_YEARS)
+    curve_scores = a[:, None] + b[:, None] * ages + c[:, None] * (ages ** 2)
+    curve_len = np.clip(max_age - age + 1, 0, None)
+    future_len = np.minimum(curve_len, FUTURE_YEARS)
+    career_len = np.minimum(curve_len, CAREER_YEARS)
+
+    def future_mean(years):
+        return prefix_means(curve_scores, np.minimum(future_len, years))
+
+    def blend_scores(years):
+        hist_avg = weighted_recent_avg(past_scores, has_history, years)
+        return HISTORICAL_WEIGHT * hist_avg + CURVE_WEIGHT * future_mean(years)
+
+    rookie_or_soph = (is_rookie == 1) | (is_sophomore == 1)
+    no_history_rookie = rookie_or_soph & ~has_history
+
+    proj_1yr = np.where(no_history_rookie, np.where(future_len > 0, curve_scores[:, 0], 0.0), blend_scores(1))
+    proj_3yr = np.where(no_history_rookie, future_mean(3), blend_scores(3))
+    proj_5yr = np.where(no_history_rookie, future_mean(5), blend_scores(5))
+
+    # Limit projections for older low-production veterans
+    recent_total = np.where(np.isnan(past_scores[:, :3]), 0.0, past_scores[:, :3]).sum(axis=1)
+    limit_career = ~rookie_or_soph & (years_exp > 2) & (age > 26) & (recent_total < 100)
+    career_years = np.where(age >= max_age - 2, 1, 3)
+    proj_career = np.where(
+        limit_career,
+        prefix_means(curve_scores, np.minimum(career_len, career_years)),
+        prefix_means(curve_scores, career_len)
+    )
+    if limit_career.any():
+        print(f"⚠️ Limiting career projection for {int(limit_career.sum())} low-production veterans")
+
+    in_window = np.zeros(len(pos), dtype=bool)
+    for p, (lo, hi) in BREAKOUT_AGE_WINDOWS.items():
+        in_window |= (pos == p) & (age >= lo) & (age <= hi)
+    breakout_flag = (
+        np.isin(tier_scheme("value").classify(proj_career, pos), ["Flex", "Bench"]) &
+        (breakout_prob > 0.25) &
+        in_window
+    )
+
+    boost = breakout_flag & (proj_3yr > 0)
+    proj_1yr = np.where(boost, proj_1yr * 1.05, proj_1yr)
+    proj_3yr = np.where(boost, proj_3yr * 1.08, proj_3yr)
+    proj_5yr = np.where(boost, proj_5yr * 1.10, proj_5yr)
+    proj_career = np.where(boost, proj_career * 1.05, proj_career)
+
+    decay = ~rookie_or_soph & (years_exp > 5) & (recent_total < 100)
+    proj_career = np.where(decay, proj_career * 0.75, proj_career)
+    proj_3yr = np.where(decay, proj_3yr * 0.85, proj_3yr)
+    proj_5yr = np.where(decay, proj_5yr * 0.85, proj_5yr)
+
+    # Adjust projections for rookies/sophomores based on draft capital and lack of history
+    drafted_years = np.select(
+        [overall_pick <= 32, overall_pick <= 100, overall_pick <= 224],
+        [6, 4, 2],
+        default=1
+    )
+    drafted_rookie = no_history_rookie & ~np.isnan(overall_pick)
+    undrafted_rookie = no_history_rookie & np.isnan(overall_pick)
+    proj_career = np.where(drafted_rookie, future_mean(drafted_years), proj_career)
+    # Undrafted with no history: very low projection
+    proj_career = np.where(undrafted_rookie, 0.0, proj_career)
+    proj_1yr = np.where(undrafted_rookie, 0.0, proj_1yr)
+    proj_3yr = np.where(undrafted_rookie, 0.0, proj_3yr)
+    proj_5yr = np.where(undrafted_rookie, 0.0, proj_5yr)
+
+    # Raise floor for recent productive players
+    threshold = np.array([PRODUCTIVE_THRESHOLDS.get(p, 36) for p in pos], dtype=float)
+    productive_years = (past_ranks <= threshold[:, None]).sum(axis=1)
+    productive = productive_years >= 2
+    proj_career = np.where(productive & (proj_career < 100), 100.0, proj_career)
+    proj_1yr = np.where(productive & (proj_1yr < 80), 80.0, proj_1yr)
+
+    # Blends with no curve window were plain Python floats in the scalar loop
+    python_floats = ~no_history_rookie & (future_len == 0)
+
+    nfl_team = column("NFL_Team", "").replace("", "FA")
+    return pd.DataFrame({
+        "Sleeper_Player_ID": pool["Sleeper_Player_ID"],
+        "Player": full_name,
+        "Position": pos,
+        "Team": column("Team", None),
+        "NFL Team": nfl_team,
+        "Age": age,
+        "Rookie_Year": rookie_year,
+        "Rookie": is_rookie,
+        "Sophomore": is_sophomore,
+        "Rostered": is_rostered,
+        "Proj_1yr": round_like_scalar(proj_1yr, python_floats, 1),
+        "Proj_3yr": round_like_scalar(proj_3yr, python_floats, 1),
+        "Proj_5yr": round_like_scalar(proj_5yr, python_floats, 1),
+        "Proj_Career": np.round(proj_career, 1),
+        "Tier": tier_scheme("value").classify(proj_career, pos),
+        "BreakoutProb": np.round(breakout_prob, 3),
+        "BreakoutFlag": breakout_flag,
+        "Draft_Round": draft_round,
+        "Overall_Pick": overall_pick,
+    })
+
+
+def build_dynasty_projections():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_path = os.path.join(project_root, "data", "league_data")
+    roster_df, breakout_df = load_projection_inputs()
 
-    tier_labels = {
-        "QB":  [(5, "Top 5"), (10, "Top 10"), (20, "Top 20"), (30, "Top 30")],
-        "RB":  [(5, "Top 5"), (10, "Top 10"), (20, "Top 20"), (30, "Top 30"), (40, "Top 40"), (50, "Top 50")],
-        "WR":  [(5, "Top 5"), (10, "Top 10"), (20, "Top 20"), (30, "Top 30"), (40, "Top 40"), (50, "Top 50"), (60, "Top 60"), (70, "Top 70")],
-        "TE":  [(5, "Top 5"), (10, "Top 10"), (20, "Top 20"), (30, "Top 30")]
-    }
-
-    # Define maximum allowed tier by position
-    max_tiers_by_pos = {
-        "QB": 30,
-        "RB": 50,
-        "WR": 70,
-        "TE": 30
-    }
-
-    projections = []
-    for _, row in roster_df.iterrows():
-        pos = row["Position"]
-        age = int(row["Age"])
-        player_id = row["Sleeper_Player_ID"]
-        rookie_year = int(row["rookie_year"]) if pd.notnull(row["rookie_year"]) else 0
-        is_rookie = int(row.get("Is_Rookie", False))
-        is_sophomore = int(rookie_year == current_year - 1)
-        is_rostered = int(row.get("Is_Rostered", False))
-        full_name = row.get("Full_Name", "")
-        team = row.get("Team")
-
-        rookie_row = rookie_df[rookie_df["Full_Name"] == full_name]
-
-        if not rookie_row.empty:
-            print(f"Found rookie: {full_name}")
-            draft_round = int(rookie_row["Draft_Round"].values[0])
-            overall_pick = int(rookie_row["Overall_Pick"].values[0])
-        else:
-            draft_round = None
-            overall_pick = None
-
-
-        # Look up breakout probability
-        breakout_row = breakout_df[
-            (breakout_df["Position"] == pos) &
-            (breakout_df["Age"] == age)
-        ]
-
-        breakout_prob = breakout_row["Avg_Fantasy_Pts"].values[0] if not breakout_row.empty else 0.0
-
-        # Historical performance
-        player_hist = fantasy_df[fantasy_df["Player"] == full_name]
-        player_hist = player_hist[player_hist["FantPos"] == pos]
-        player_hist = player_hist.sort_values("Year", ascending=False)
-
-        past_scores = player_hist["Fantasy_Pts"].tolist()
-        
-        def assign_dynamic_tier(pos, most_recent_rank):
-            tiers = tier_labels.get(pos)
-            for top_n, label in tiers:
-                if most_recent_rank <= top_n:
-                    return label
-            return "Bench"
-
-        # Then apply:
-        if not player_hist.empty:
-            # Use average of up to last 3 seasons for tiering
-            recent_ranks = player_hist["Fantasy_PosRank"].head(3)
-            avg_rank = recent_ranks.mean()
-            best_tier = assign_dynamic_tier(pos, avg_rank)
-
-            if full_name == "Brandon Aiyuk":
-                print(f"📊 Debug Brandon Aiyuk — Ranks: {recent_ranks.tolist()}, Avg Rank: {avg_rank}, Tier: {best_tier}")
-        else:
-            best_tier = f"Top {max_tiers_by_pos.get(pos, 70)}"
-
-
-        # Use curve for position and best tier
-        curve_row = aging_df[(aging_df["Position"] == pos) & (aging_df["Tier"] == best_tier)]
-        if curve_row.empty:
-            print(f"⚠️ Skipping {full_name} due to missing or invalid curve: {best_tier}")
-            continue  # Skip if curve not found
-
-        a, b, c = curve_row.iloc[0][["a", "b", "c"]]
-        max_age = int(curve_row.iloc[0]["max_age"])
-
-        def score_at_age(a, b, c, x):
-            return a + b * x + c * (x ** 2)
-
-        # Age-based curve scores
-        future_scores = [score_at_age(a, b, c, age + i) for i in range(6)]
-        future_scores = [s for i, s in enumerate(future_scores) if age + i <= max_age]
-        # current_score = score_at_age(a, b, c, age)
-
-        # Blended projections (weights can be tuned)
-        historical_weight = 0.7
-        curve_weight = 0.3
-
-        def safe_mean(values):
-            clean = [v for v in values if pd.notna(v)]
-            return np.nanmean(clean) if clean else 0
-        
-        def weighted_recent_avg(scores, max_years):
-            weights = [1.0, 0.75, 0.5, 0.35, 0.25][:max_years]
-            values = scores[:max_years]
-            return (
-                sum(w * s for w, s in zip(weights, values) if pd.notna(s)) /
-                sum(w for w, s in zip(weights, values) if pd.notna(s))
-            ) if values else 0
-
-        def blend_scores(hist_list, curve_list, years):
-            hist_avg = weighted_recent_avg(hist_list, years)
-            curve_avg = safe_mean(curve_list[:years]) if curve_list else 0
-            return historical_weight * hist_avg + curve_weight * curve_avg
-
-        # Tiering
-        def get_value_tier(score, position):
-            if position == "QB":
-                if score >= 459.3:
-                    return "A"
-                elif score >= 394.4:
-                    return "B"
-                elif score >= 329.2:
-                    return "C"
-                elif score >= 225.3:
-                    return "Flex"
-                else:
-                    return "Bench"
-
-            elif position == "RB":
-                if score >= 226.5:
-                    return "A"
-                elif score >= 185.7:
-                    return "B"
-                elif score >= 154.9:
-                    return "C"
-                elif score >= 99.7:
-                    return "Flex"
-                else:
-                    return "Bench"
-
-            elif position == "WR":
-                if score >= 265.8:
-                    return "A"
-                elif score >= 187.5:
-                    return "B"
-                elif score >= 149.8:
-                    return "C"
-                elif score >= 104.2:
-                    return "Flex"
-                else:
-                    return "Bench"
-
-            elif position == "TE":
-                if score >= 223.0:
-                    return "A"
-                elif score >= 163.0:
-                    return "B"
-                elif score >= 129.4:
-                    return "C"
-                elif score >= 81.2:
-                    return "Flex"
-                else:
-                    return "Bench"
-
-            else:
-                return "Bench"  # fallback for unknown positions
-        
-        def flag_breakout_candidate(pos, age, tier, breakout_prob):
-            if tier in ["Flex", "Bench"] and breakout_prob > 0.25:
-                if pos == "WR" and 24 <= age <= 28:
-                    return True 
-                if pos == "RB" and 23 <= age <= 27:
-                    return True
-                if pos == "QB" and 25 <= age <= 30:
-                    return True
-                if pos == "TE" and 25 <= age <= 30:
-                    return True
-            return False
-
-        if (is_rookie or is_sophomore) and len(past_scores) == 0:
-            proj_1yr = future_scores[0] if future_scores else 0
-            proj_3yr = safe_mean(future_scores[:3])
-            proj_5yr = safe_mean(future_scores[:5])
-        else:
-            proj_1yr = blend_scores(past_scores, future_scores, 1)
-            proj_3yr = blend_scores(past_scores, future_scores, 3)
-            proj_5yr = blend_scores(past_scores, future_scores, 5)
-
-        # Smarter career projection using curve window and player age
-        min_age = int(age)
-        start_age = max(min_age, age)
-        end_age = min(max_age, age + 10)  # cap projection window to 10 years forward
-
-        if start_age > end_age:
-            career_scores = []
-        else:
-            career_scores = [score_at_age(a, b, c, a_val) for a_val in range(start_age, end_age + 1)]
-
-        # Limit projections for older low-production veterans
-        recent_scores = past_scores[:3]
-        recent_total = sum([s for s in recent_scores if pd.notna(s)])
-        limit_career = (
-            is_rookie == 0 and is_sophomore == 0 and
-            float(row.get("years_exp", 0)) > 2 and
-            age > 26 and
-            recent_total < 100
-        )
-
-        if full_name == "Josh Johnson":
-            print("🧪 Debugging Josh Johnson")
-            print(f"Is Rookie: {is_rookie}")
-            print(f"Years Exp: {row.get('years_exp', 0)}")
-            print(f"Age: {age}")
-            print(f"Recent Total: {recent_total}")
-            print(f"Career Scores: {career_scores}")
-
-        if limit_career:
-            print(f"⚠️ Limiting career projection for {full_name}: Age {age}, Exp {row.get('years_exp', 0)}, Recent Total {recent_total:.1f}")
-            career_years = 1 if age >= max_age - 2 else 3
-            proj_career = safe_mean(career_scores[:career_years])
-        else:
-            proj_career = safe_mean(career_scores)
-
-        breakout_flag = flag_breakout_candidate(pos, age, get_value_tier(proj_career, pos), breakout_prob)
-
-        if breakout_flag and proj_3yr > 0:
-            proj_1yr *= 1.05
-            proj_3yr *= 1.08
-            proj_5yr *= 1.10
-            proj_career *= 1.05
-
-        if not is_rookie and not is_sophomore and row.get("years_exp", 0) > 5 and recent_total < 100:
-            proj_career *= 0.75
-            proj_3yr *= 0.85
-            proj_5yr *= 0.85
-
-        # Adjust projections for rookies/sophomores based on draft capital and lack of history
-        if is_rookie or is_sophomore:
-            if len(past_scores) == 0:
-                if pd.notna(overall_pick):
-                    overall_pick = float(overall_pick)
-                    if overall_pick <= 32:
-                        proj_career = safe_mean(future_scores[:6])
-                    elif overall_pick <= 100:
-                        proj_career = safe_mean(future_scores[:4])
-                    elif overall_pick <= 224:
-                        proj_career = safe_mean(future_scores[:2])
-                    else:
-                        proj_career = safe_mean(future_scores[:1])
-                else:
-                    # Undrafted with no history: very low projection
-                    proj_career = 0.0
-                    proj_1yr = 0.0
-                    proj_3yr = 0.0
-                    proj_5yr = 0.0
-
-        # Raise floor for recent productive players
-        productive_thresholds = {
-            "QB": 20,
-            "RB": 30,
-            "WR": 40,
-            "TE": 20
-        }
-
-        threshold = productive_thresholds.get(pos, 36)  # fallback to 36
-        recent_ranks = player_hist["Fantasy_PosRank"].tolist()[:3]
-        productive_years = sum(1 for r in recent_ranks if pd.notna(r) and r <= threshold)
-
-        if productive_years >= 2:
-            if proj_career < 100:
-                proj_career = 100  # bump career floor
-            if proj_1yr < 80:
-                proj_1yr = 80  # bump near-term outlook
-
-        projections.append({
-            "Sleeper_Player_ID": player_id,
-            "Player": full_name,
-            "Position": pos,
-            "Team": team,
-            "NFL Team": row.get("NFL_Team") or "FA",
-            "Age": age,
-            "Rookie_Year": rookie_year,
-            "Rookie": is_rookie,
-            "Sophomore": is_sophomore,
-            "Rostered": is_rostered,
-            "Proj_1yr": round(proj_1yr, 1),
-            "Proj_3yr": round(proj_3yr, 1),
-            "Proj_5yr": round(proj_5yr, 1),
-            "Proj_Career": round(proj_career, 1),
-            "Tier": get_value_tier(proj_career, pos),
-            "BreakoutProb": round(breakout_prob, 3),
-            "BreakoutFlag": breakout_flag,
-            "Draft_Round": draft_round,
-            "Overall_Pick": overall_pick,
-        })
+    proj_df = project_player_pool(roster_df, breakout_df, load_lookups())
 
     # Save
-    proj_df = pd.DataFrame(projections)
     out_path = os.path.join(data_path, "dynasty_projections.csv")
-    proj_df.to_csv(out_path, index=False)
+    proj_df.to_csv(out_path + ".tmp", index=False)
+    os.replace(out_path + ".tmp", out_path)
     print(f"✅ Dynasty projections saved to {out_path}")
 
 if __name__ == "__main__":
@@ -1,57 +1,188 @@
+import hashlib
+import json
 import os
+import numpy as np
 import pandas as pd
-from parse_scoring import load_scoring_rules
+from parse_scoring import SCORING_POSITIONS, STAT_COLUMNS, load_scoring_rules, unsupported_scoring_keys, weight_matrix
+from data_store import csv_path, read_dataset, write_dataset
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POINTS_CACHE_DIR = os.path.join(project_root, "data", "cache", "fantasy_points")
+MAX_CACHED_RULE_SETS = 32
+
+# Columns written back to fantasy_scores as numbers with NaN filled as 0
+COERCED_COLUMNS = [
+    "Passing_Yds", "Passing_TD", "Passing_Int",
+    "Rushing_Yds", "Rushing_TD",
+    "Receiving_Rec", "Receiving_Yds", "Receiving_TD",
+    "Fumbles_FL", "Scoring_2PM", "Scoring_2PP"
+]
+
+# First downs aren't in the fantasy table; (dataset, its column, column added to the history)
+FIRST_DOWN_SOURCES = [
+    ("qb_stats", "1D", "Passing_1D"),
+    ("rb_stats", "Rushing 1D", "Rushing_1D"),
+    ("wr_stats", "Receiving 1D", "Receiving_1D"),
+]
 
 def load_fantasy_history(start_year=2010):
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    path = os.path.join(project_root, "data", "historical_stats", "fantasy_history_2000_2024.csv")
-    df = pd.read_csv(path)
-    df = df[df["Year"] >= start_year]
-    return df
+    # Seasons before start_year are pruned at the partition level
+    return read_dataset("fantasy_history", filters=[("Year", ">=", start_year)])
 
-def calculate_fantasy_points_from_flat_columns(df, weights):
+def with_first_downs(df):
+    """
+    Adds passing, rushing and receiving first downs from the per-position
+    stat tables, matched on player, season and team. Multi-team seasons the
+    stat table lists under a single team fall back to player and season
+    when that is unambiguous; unmatched rows are left as NaN (scored as 0).
+    """
     df = df.copy()
+    for dataset, column, target in FIRST_DOWN_SOURCES:
+        if not os.path.exists(csv_path(dataset)):
+            df[target] = np.nan
+            continue
+        stats = read_dataset(dataset, columns=["Player", "Year", "Team", column],
+                             filters=[("Year", ">=", int(df["Year"].min()))] if len(df) else None)
+        stats = stats.rename(columns={column: target})
+        by_team = stats.drop_duplicates(["Player", "Year", "Team"]).set_index(["Player", "Year", "Team"])[target]
+        by_season = stats[~stats.duplicated(["Player", "Year"], keep=False)].set_index(["Player", "Year"])[target]
+        team_keys = pd.MultiIndex.from_arrays([df["Player"], df["Year"], df["Tm"]])
+        season_keys = pd.MultiIndex.from_arrays([df["Player"], df["Year"]])
+        values = by_team.reindex(team_keys).to_numpy()
+        df[target] = np.where(pd.isna(values), by_season.reindex(season_keys).to_numpy(), values)
+    return df
 
-    # List of all scoring-relevant columns we expect
-    numeric_cols = [
-        "Passing_Yds", "Passing_TD", "Passing_Int",
-        "Rushing_Yds", "Rushing_TD",
-        "Receiving_Rec", "Receiving_Yds", "Receiving_TD",
-        "Fumbles_FL", "Scoring_2PM", "Scoring_2PP"
-    ]
+def report_unsupported_keys(weights):
+    unsupported = unsupported_scoring_keys(weights)
+    if unsupported:
+        print(f"⚠️ Scoring keys that need game/play data are not applied: {', '.join(unsupported)}")
 
+def coerce_scoring_columns(df):
     # Make sure all columns exist and are numeric with NaNs filled as 0
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df.get(col, 0), errors="coerce").fillna(0)
+    df = df.copy()
+    for col in COERCED_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+        else:
+            df[col] = 0
+    return df
+
+def stat_column(df, col):
+    if col == "Passing_Inc":
+        return stat_column(df, "Passing_Att") - stat_column(df, "Passing_Cmp")
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=float)
 
-    # Final fantasy point formula
-    df["Fantasy_Pts"] = (
-        df["Passing_Yds"] * weights.get("pass_yd", 0) +
-        df["Passing_TD"] * weights.get("pass_td", 0) +
-        df["Passing_Int"] * weights.get("pass_int", 0) +
+def stat_matrix(df):
+    """(rows x stats) matrix in parse_scoring.STAT_COLUMNS order."""
+    return np.column_stack([stat_column(df, col) for col in STAT_COLUMNS])
 
-        df["Rushing_Yds"] * weights.get("rush_yd", 0) +
-        df["Rushing_TD"] * weights.get("rush_td", 0) +
+def position_index(df):
+    """Each row's column in the weight matrix (SCORING_POSITIONS, OTHER for unknown)."""
+    codes = {pos: i for i, pos in enumerate(SCORING_POSITIONS)}
+    return df["FantPos"].map(codes).fillna(codes["OTHER"]).to_numpy(dtype=int)
 
-        df["Receiving_Rec"] * weights.get("rec", 0) +
-        df["Receiving_Yds"] * weights.get("rec_yd", 0) +
-        df["Receiving_TD"] * weights.get("rec_td", 0) +
+def scoring_key(matrix):
+    """
+    Hash of a (stats x positions) weight matrix together with the stat and
+    position layout it is read against, so rule sets that score identically
+    share a key and changes to parse_scoring's mapping invalidate it.
+    """
+    digest = hashlib.sha256(np.ascontiguousarray(matrix, dtype=float).tobytes())
+    digest.update(json.dumps([STAT_COLUMNS, SCORING_POSITIONS]).encode("utf-8"))
+    return digest.hexdigest()[:16]
 
-        df["Scoring_2PM"] * 2 +
-        df["Scoring_2PP"] * 2 +
+def weights_key(weights):
+    """Key of the weight matrix a scoring weights dict maps onto."""
+    return scoring_key(weight_matrix(weights))
 
-        df["Fumbles_FL"] * weights.get("fum_lost", 0)
-    )
+def matrix_key(matrix, positions):
+    digest = hashlib.sha256(np.ascontiguousarray(matrix).tobytes())
+    digest.update(np.ascontiguousarray(positions).tobytes())
+    return digest.hexdigest()[:16]
+
+def load_cached_points(key, stats_key):
+    path = os.path.join(POINTS_CACHE_DIR, f"{key}.npz")
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as cached:
+        if str(cached["stats_key"]) != stats_key:
+            return None
+        points = cached["points"]
+    os.utime(path)  # mark as recently used
+    return points
+
+def store_cached_points(key, stats_key, points):
+    os.makedirs(POINTS_CACHE_DIR, exist_ok=True)
+    path = os.path.join(POINTS_CACHE_DIR, f"{key}.npz")
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, points=points, stats_key=stats_key)
+    os.replace(path + ".tmp", path)
+    evict_cached_points()
+
+def evict_cached_points(max_entries=MAX_CACHED_RULE_SETS):
+    """Drops the least recently used rule sets beyond `max_entries`."""
+    paths = [os.path.join(POINTS_CACHE_DIR, name) for name in os.listdir(POINTS_CACHE_DIR) if name.endswith(".npz")]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[max_entries:]:
+        os.remove(path)
+
+def fantasy_points(matrix, positions, weight_sets, cache=True):
+    """
+    Points for every row of `matrix` (with its SCORING_POSITIONS index in
+    `positions`) under each weights dict, as a (rows x rule sets) array.
+    Rule sets already cached for this exact stat matrix are reused; the rest
+    are scored together with one matmul per position.
+    """
+    stats_key = matrix_key(matrix, positions) if cache else None
+    rule_matrices = [weight_matrix(weights) for weights in weight_sets]
+    keys = [scoring_key(rules) for rules in rule_matrices]
+    points = np.empty((len(matrix), len(weight_sets)))
+    missing = []
+    for j, key in enumerate(keys):
+        cached = load_cached_points(key, stats_key) if cache else None
+        if cached is None:
+            missing.append(j)
+        else:
+            points[:, j] = cached
+
+    if missing:
+        # (stats x positions x rule sets)
+        weights = np.stack([rule_matrices[j] for j in missing], axis=-1)
+        computed = np.empty((len(matrix), len(missing)))
+        for p in range(len(SCORING_POSITIONS)):
+            rows = positions == p
+            computed[rows] = matrix[rows] @ weights[:, p, :]
+        for i, j in enumerate(missing):
+            points[:, j] = computed[:, i]
+            if cache:
+                store_cached_points(keys[j], stats_key, computed[:, i])
+    return points
+
+def calculate_fantasy_points_from_flat_columns(df, weights, cache=True):
+    df = coerce_scoring_columns(df)
+    df["Fantasy_Pts"] = fantasy_points(stat_matrix(df), position_index(df), [weights], cache)[:, 0]
     return df
 
+def score_rule_sets(history_df, weight_sets, start_year=2010):
+    """One scored copy of the history per weights dict, from a single batched matmul."""
+    for weights in weight_sets:
+        report_unsupported_keys(weights)
+    recent = history_df[history_df["Year"] >= start_year].reset_index(drop=True)
+    recent = coerce_scoring_columns(with_first_downs(recent))
+    points = fantasy_points(stat_matrix(recent), position_index(recent), weight_sets)
+    return [recent.assign(Fantasy_Pts=points[:, j]) for j in range(len(weight_sets))]
+
 def save_fantasy_scores(df):
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    out_path = os.path.join(project_root, "data", "historical_stats", "fantasy_scores_2000_2024.csv")
-    df.to_csv(out_path, index=False)
-    print(f"✅ Saved fantasy points to {out_path}")
+    write_dataset("fantasy_scores", df)
+    print(f"✅ Saved fantasy points to {csv_path('fantasy_scores')}")
+
+def score_fantasy_history(history_df, weights, start_year=2010):
+    report_unsupported_keys(weights)
+    recent = history_df[history_df["Year"] >= start_year].reset_index(drop=True)
+    return calculate_fantasy_points_from_flat_columns(with_first_downs(recent), weights)
 
 def run_fantasy_score_pipeline():
-    weights = load_scoring_rules()
-    df = load_fantasy_history()
-    df_fp = calculate_fantasy_points_from_flat_columns(df, weights)
+    df_fp = score_fantasy_history(load_fantasy_history(), load_scoring_rules())
     save_fantasy_scores(df_fp)
@@ -1,6 +1,6 @@
 import os
 import pandas as pd
-from sleeper_wrapper import Players
+from sleeper_players import load_player_universe
 
 def load_rostered_ids():
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -37,13 +37,24 @@ def classify_player(p, rostered_ids):
 
     return "Retired"
 
+def universe_records(universe):
+    """Shared player universe rows in the shape of Sleeper's player dicts."""
+    df = universe.astype(object).where(universe.notna(), None)
+    for pid, full_name, position, team, status, years_exp, rookie_year in zip(
+        df["Sleeper_Player_ID"], df["Full_Name"], df["Position"], df["NFL_Team"],
+        df["Status"], df["years_exp"], df["rookie_year"]
+    ):
+        yield {
+            "player_id": pid, "full_name": full_name, "position": position, "team": team,
+            "status": status, "years_exp": years_exp, "metadata": {"rookie_year": rookie_year}
+        }
+
 def build_classified_pool():
-    players = Players().get_all_players()
     rostered_ids = load_rostered_ids()
 
     rows = []
-    for p in players.values():
-        full_name = p.get("full_name", "").strip()
+    for p in universe_records(load_player_universe()):
+        full_name = (p.get("full_name") or "").strip()
         if not full_name:
             continue
 
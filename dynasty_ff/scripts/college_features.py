@@ -0,0 +1,119 @@
+import os
+import numpy as np
+import pandas as pd
+from data_store import dataset_version, read_dataset
+from lookups import name_keys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLLEGE_FEATURES_PATH = os.path.join(project_root, "data", "cache", "college_features.pkl")
+
+# Season stats that add up over a career
+COUNTING_STATS = [
+    "G",
+    "Rushing_Att", "Rushing_Yds", "Rushing_TD",
+    "Receiving_Rec", "Receiving_Yds", "Receiving_TD",
+    "Cmp", "Att", "Yds", "TD", "Int",
+]
+
+# Per-season rates, kept for the final season only
+RATE_STATS = [
+    "Rushing_Y/A", "Rushing_Y/G",
+    "Receiving_Y/R", "Receiving_Y/G",
+    "Cmp%", "TD%", "Int%", "Y/A", "AY/A", "Y/C", "Y/G", "Rate",
+]
+
+
+def college_player_id(url):
+    """Sports-reference player slug, e.g. .../cfb/players/shaun-alexander-1.html -> shaun-alexander-1."""
+    if not isinstance(url, str):
+        return None
+    return url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".html")
+
+
+def attach_player_ids(college_df, combine_df):
+    """
+    College_Player_ID for every season row. Rows scraped with their URL use
+    it; older scrapes are matched to the combine row they came from by name
+    and position (the latest draft class wins when that is ambiguous).
+    """
+    combine = combine_df[combine_df["College_Stats_URL"].notna()]
+    combine = combine.sort_values("Draft_Year", kind="stable").drop_duplicates(["Full_Name", "Position"], keep="last")
+    urls = combine.set_index(["Full_Name", "Position"])["College_Stats_URL"]
+
+    keys = pd.MultiIndex.from_frame(college_df[["Full_Name", "Position"]].astype(object))
+    url = pd.Series(urls.reindex(keys).to_numpy(), index=college_df.index)
+    if "College_Stats_URL" in college_df.columns:
+        url = college_df["College_Stats_URL"].where(college_df["College_Stats_URL"].notna(), url)
+    return college_df.assign(College_Player_ID=url.map(college_player_id))
+
+
+def build_college_features(college_df, combine_df):
+    """
+    One row per college player: their final season (team, class and every
+    stat under its usual name), career totals (Career_*), per-game career
+    rates (*_PG) and best single-season values (Best_*).
+    """
+    df = attach_player_ids(college_df, combine_df)
+    df["Season_Year"] = pd.to_numeric(df["Season"].astype(str).str.extract(r"^(\d{4})")[0], errors="coerce")
+
+    # Seasons only (school/career total rows have no year); a season's
+    # passing and rushing/receiving rows collapse into one
+    df = df[df["Season_Year"].notna() & df["College_Player_ID"].notna()]
+    stats = [col for col in COUNTING_STATS + RATE_STATS if col in df.columns]
+    df[stats] = df[stats].apply(pd.to_numeric, errors="coerce")
+    seasons = df.groupby(["College_Player_ID", "Season_Year"], sort=True).first().reset_index()
+    by_player = seasons.groupby("College_Player_ID", sort=True)
+
+    counting = [col for col in COUNTING_STATS if col in seasons.columns]
+    final = seasons.drop_duplicates("College_Player_ID", keep="last").set_index("College_Player_ID")
+    features = pd.DataFrame({
+        "Full_Name": final["Full_Name"],
+        "Name_Key": name_keys(final["Full_Name"]),
+        "Position": final["Position"],
+        "Team": final["Team"],
+        "Class": final["Class"],
+        "Seasons": by_player.size(),
+        "First_Season": by_player["Season_Year"].min(),
+        "Final_Season": final["Season_Year"],
+    })
+    features = features.join(final[stats])
+
+    career = by_player[counting].sum(min_count=1)
+    features = features.join(career.add_prefix("Career_"))
+    per_game = career.drop(columns="G").div(career["G"].where(career["G"] > 0), axis=0)
+    features = features.join(per_game.add_suffix("_PG"))
+    features = features.join(by_player[counting].max().add_prefix("Best_"))
+    return compact_college_features(features.reset_index())
+
+
+def compact_college_features(df):
+    for col in ["Position", "Team", "Class"]:
+        df[col] = df[col].astype("category")
+    for col in ["Seasons", "First_Season", "Final_Season"]:
+        df[col] = df[col].astype("Int16")
+    numeric = df.columns[df.dtypes == np.float64]
+    df[numeric] = df[numeric].astype(np.float32)
+    return df
+
+
+def college_features_version():
+    return [dataset_version("college_stats"), dataset_version("combine_results")]
+
+
+def load_college_features(rebuild=False):
+    """
+    The per-player college feature table, rebuilt only when college_stats or
+    combine_results has been re-scraped since it was cached.
+    """
+    version = college_features_version()
+    if not rebuild and os.path.exists(COLLEGE_FEATURES_PATH):
+        cached = pd.read_pickle(COLLEGE_FEATURES_PATH)
+        if cached["version"] == version:
+            return cached["features"]
+
+    features = build_college_features(read_dataset("college_stats"), read_dataset("combine_results"))
+    os.makedirs(os.path.dirname(COLLEGE_FEATURES_PATH), exist_ok=True)
+    pd.to_pickle({"version": version, "features": features}, COLLEGE_FEATURES_PATH + ".tmp")
+    os.replace(COLLEGE_FEATURES_PATH + ".tmp", COLLEGE_FEATURES_PATH)
+    print(f"✅ Built college features for {len(features)} players")
+    return features
@@ -0,0 +1,238 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV-only fallback when pyarrow is not installed
+    pa = None
+    pq = None
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(project_root, "data")
+PARQUET_DIR = os.path.join(DATA_DIR, "parquet")
+
+# Dataset name -> compatibility CSV (relative to data/) and Parquet partition columns
+DATASETS = {
+    "fantasy_scores": {"csv": os.path.join("historical_stats", "fantasy_scores_2000_2024.csv"), "partition": ["Year"]},
+    "fantasy_history": {"csv": os.path.join("historical_stats", "fantasy_history_2000_2024.csv"), "partition": ["Year"]},
+    "qb_stats": {"csv": os.path.join("historical_stats", "qb_2000_2024.csv"), "partition": ["Year"]},
+    "rb_stats": {"csv": os.path.join("historical_stats", "rb_2000_2024.csv"), "partition": ["Year"]},
+    "wr_stats": {"csv": os.path.join("historical_stats", "wr_2000_2024.csv"), "partition": ["Year"]},
+    "combine_results": {"csv": os.path.join("historical_stats", "combine_results.csv"), "partition": ["Draft_Year"]},
+    "college_stats": {"csv": os.path.join("historical_stats", "college_stats.csv"), "partition": []},
+}
+
+# Hidden column holding each row's position in the written frame, so reads come back in that order
+ROW_COLUMN = "__row"
+
+OPERATORS = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+}
+
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def dataset_lock(name):
+    """One re-entrant lock per dataset, shared by its writers and readers in this process."""
+    with _locks_guard:
+        return _locks.setdefault(name, threading.RLock())
+
+
+def csv_path(name):
+    return os.path.join(DATA_DIR, DATASETS[name]["csv"])
+
+
+def parquet_path(name):
+    return os.path.join(PARQUET_DIR, name)
+
+
+def meta_path(name):
+    return os.path.join(parquet_path(name), "_meta.json")
+
+
+def read_meta(name):
+    if not os.path.exists(meta_path(name)):
+        return None
+    with open(meta_path(name), "r") as f:
+        return json.load(f)
+
+
+def read_csv(name, usecols=None):
+    # round_trip parsing so values match the floats that were written exactly
+    return pd.read_csv(csv_path(name), usecols=usecols, float_precision="round_trip")
+
+
+def with_typed_columns(df):
+    """Numeric-looking text columns become numbers, the rest nullable strings."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            numeric = pd.to_numeric(df[col], errors="coerce")
+            if numeric.notna().sum() == df[col].notna().sum():
+                df[col] = numeric
+            else:
+                df[col] = df[col].astype("string")
+    return df
+
+
+def restore_dtypes(df, dtypes):
+    """
+    Casts columns back to the dtypes they were written with. Text columns
+    come back as the original object/str dtype instead of "string"; text
+    columns that were stored as numbers (see with_typed_columns) stay numeric.
+    """
+    for col in df.columns:
+        original = dtypes.get(col)
+        if original is None or str(df[col].dtype) == original:
+            continue
+        was_numeric = pd.api.types.is_numeric_dtype(pd.Series(dtype=original)) if original != "object" else False
+        if was_numeric != pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        if original == "object":
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+        else:
+            df[col] = df[col].astype(original)
+    return df
+
+
+def write_dataset(name, df, export_csv=True):
+    """
+    Writes `df` as a partitioned Parquet dataset (replacing the previous one)
+    and, for compatibility, to the dataset's CSV path as well. Writers of the
+    same dataset are serialized and each stages into its own directory.
+    """
+    with dataset_lock(name):
+        if export_csv:
+            df.to_csv(csv_path(name), index=False)
+
+        if pq is None:
+            return
+
+        spec = DATASETS[name]
+        typed = with_typed_columns(df)
+        typed[ROW_COLUMN] = range(len(typed))
+        table = pa.Table.from_pandas(typed, preserve_index=False)
+
+        # Write next to the live dataset and swap it in so readers never see a half-written store
+        os.makedirs(PARQUET_DIR, exist_ok=True)
+        target = parquet_path(name)
+        staging = tempfile.mkdtemp(prefix=f".{name}.", dir=PARQUET_DIR)
+        try:
+            if spec["partition"]:
+                pq.write_to_dataset(table, staging, partition_cols=spec["partition"])
+            else:
+                pq.write_table(table, os.path.join(staging, "part-0.parquet"))
+
+            source = csv_path(name)
+            with open(os.path.join(staging, "_meta.json"), "w") as f:
+                json.dump({
+                    "columns": list(df.columns),
+                    "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+                    "csv_mtime": os.path.getmtime(source) if os.path.exists(source) else None,
+                }, f)
+
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def is_stale(name):
+    """True when the CSV has been rewritten since the Parquet copy was made (e.g. by a scraper)."""
+    meta = read_meta(name)
+    if meta is None or "dtypes" not in meta:
+        return True
+    source = csv_path(name)
+    return os.path.exists(source) and os.path.getmtime(source) != meta["csv_mtime"]
+
+
+def sync_dataset(name):
+    with dataset_lock(name):
+        if pq is not None and is_stale(name) and os.path.exists(csv_path(name)):
+            write_dataset(name, read_csv(name), export_csv=False)
+
+
+def dataset_version(name):
+    """Changes whenever the dataset's content does; used as a cache key."""
+    source = csv_path(name)
+    return os.path.getmtime(source) if os.path.exists(source) else None
+
+
+def read_dataset(name, columns=None, filters=None):
+    """
+    Loads a dataset, reading only `columns` and only rows matching `filters`,
+    a list of (column, op, value) tuples ANDed together, e.g.
+    [("Year", ">=", 2023)]. With Parquet, filters on partition columns skip
+    whole files and the rest are pushed down to row groups; without pyarrow
+    the CSV is read with usecols and filtered in pandas.
+
+    Rows come back in the order they were written and columns with the
+    dtypes they were written with, except that text columns holding only
+    numbers are read back as numbers when the Parquet store is used.
+    """
+    filters = filters or []
+    if pq is not None:
+        with dataset_lock(name):
+            sync_dataset(name)
+            meta = read_meta(name)
+            order = list(columns or meta["columns"])
+            table = pq.read_table(
+                parquet_path(name), columns=order + [ROW_COLUMN], filters=filters or None
+            )
+        df = table.to_pandas().sort_values(ROW_COLUMN, kind="stable")
+        for col in DATASETS[name]["partition"]:
+            if col in df.columns:
+                df[col] = df[col].astype("int64")
+        return restore_dtypes(df[order].reset_index(drop=True), meta["dtypes"])
+
+    wanted = None
+    if columns is not None:
+        wanted = list(dict.fromkeys(list(columns) + [col for col, _, _ in filters]))
+    df = read_csv(name, usecols=wanted)
+    for col, op, value in filters:
+        df = df[OPERATORS[op](df[col], value)]
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
+
+
+def convert_all():
+    if pq is None:
+        print("⚠️ pyarrow is not installed; datasets stay CSV-only")
+        return
+    for name in DATASETS:
+        if os.path.exists(csv_path(name)):
+            write_dataset(name, read_csv(name), export_csv=False)
+            print(f"✅ Wrote {name} to {parquet_path(name)}")
+
+
+def export_all():
+    for name in DATASETS:
+        if read_meta(name) is not None:
+            read_dataset(name).to_csv(csv_path(name), index=False)
+            print(f"✅ Exported {name} to {csv_path(name)}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "convert"
+    if command == "convert":
+        convert_all()
+    elif command == "export":
+        export_all()
+    else:
+        print("Usage: python data_store.py [convert|export]")
@@ -1,42 +1,35 @@
 import os
+import numpy as np
 import pandas as pd
-import requests
 from datetime import datetime
+from lookups import name_keys, player_keys, lookup_rows, load_lookups
+from sleeper_players import load_player_universe
 
-def fetch_all_players():
-    url = "https://api.sleeper.app/v1/players/nfl"
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.json()
+def sleeper_player_frame(universe=None):
+    """
+    One row per Sleeper player with a position, excluding practice squads,
+    from the shared player universe (sleeper_players.load_player_universe).
+    """
+    if universe is None:
+        universe = load_player_universe()
+    players = universe[universe["Position"].notna() & (universe["Status"] != "practice squad")]
 
-def enrich_player_pool():
-    # Set project root
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_path = os.path.join(project_root, "data", "league_data")
+    all_players_df = players.reset_index(drop=True).copy()
+    for col in ["Position", "Status", "NFL_Team"]:
+        all_players_df[col] = all_players_df[col].astype(object).where(all_players_df[col].notna(), None)
+    all_players_df["NFL_Team"] = all_players_df["NFL_Team"].fillna("FA")
+    return all_players_df
 
-    # Load Sleeper rostered players
-    rosters_df = pd.read_csv(os.path.join(data_path, "rosters.csv"))
+def build_enriched_pool(rosters_df, all_players_df, recent_history, history_ids=()):
+    """
+    Joins Sleeper player metadata (see sleeper_player_frame) to league rosters
+    and keeps rookies plus anyone with fantasy production in the last two
+    seasons. `recent_history` is the lookups recent-history table and
+    `history_ids` the Sleeper IDs it is keyed by (lookups "identity_ids").
+    """
+    rosters_df = rosters_df.copy()
     rosters_df["Sleeper_Player_ID"] = rosters_df["Sleeper_Player_ID"].astype(str)
 
-    # Fetch full player metadata
-    player_data = fetch_all_players()
-    rows = []
-    for pid, p in player_data.items():
-        if not p.get("position") or p.get("status") == "practice squad":
-            continue
-        rows.append({
-            "Sleeper_Player_ID": pid,
-            "Full_Name": p.get("full_name"),
-            "Position": p.get("position"),
-            "Status": p.get("status"),
-            "NFL_Team": p.get("team") or "FA",
-            "years_exp": p.get("years_exp", 0),
-            "rookie_year": (p.get("metadata") or {}).get("rookie_year", 0),
-            "Birth_Date": p.get("birth_date")
-        })
-
-    all_players_df = pd.DataFrame(rows)
-    all_players_df["Sleeper_Player_ID"] = all_players_df["Sleeper_Player_ID"].astype(str)
     # Merge to find rostered players
     merged = all_players_df.merge(
         rosters_df[["Sleeper_Player_ID", "Team"]],
@@ -45,10 +38,6 @@ def enrich_player_pool():
     )
     merged["Team"] = merged["Team"].fillna("FA")
 
-    # Load fantasy scores to identify active players
-    fantasy_path = os.path.join(project_root, "data", "historical_stats", "fantasy_scores_2000_2024.csv")
-    fantasy_df = pd.read_csv(fantasy_path)
-
     # Convert Birth_Date to datetime and compute Age
     today = pd.to_datetime(datetime.today().date())
     merged["Birth_Date"] = pd.to_datetime(merged["Birth_Date"], errors="coerce")
@@ -56,16 +45,21 @@ def enrich_player_pool():
 
     # Restrict to last 2 seasons
     recent_years = [2023, 2024]
-    recent_fantasy = fantasy_df[
-        fantasy_df["Year"].isin(recent_years) & (fantasy_df["Fantasy_Pts"] > 0)
-    ].copy()
 
-    # Build a set of name-position keys from fantasy stats
-    recent_fantasy["Key"] = recent_fantasy["Player"].str.lower().str.strip() + "|" + recent_fantasy["FantPos"]
+    # Name-position key shared with the history index
+    merged["Key"] = name_keys(merged["Full_Name"]) + "|" + merged["Position"]
 
-    # Same key in merged player pool
-    merged["Key"] = merged["Full_Name"].str.lower().str.strip() + "|" + merged["Position"]
-    recent_keys = set(recent_fantasy["Key"])
+    # Look up each player's most recent seasons in the shared history index
+    history = lookup_rows(
+        recent_history.reset_index(),
+        ["Name_Key", "FantPos"],
+        [
+            player_keys(merged["Sleeper_Player_ID"], merged["Full_Name"], history_ids).to_numpy(dtype=object),
+            merged["Position"].to_numpy(dtype=object)
+        ]
+    )
+    recent_years_played = history.filter(regex=r"^Year_").to_numpy(dtype=float)
+    recent_points = history.filter(regex=r"^Pts_").to_numpy(dtype=float)
 
     # Keep players who are either rookies or appeared in recent seasons
     merged["Rookie_Year"] = pd.to_numeric(merged["rookie_year"], errors="coerce")
@@ -73,13 +67,25 @@ def enrich_player_pool():
         (merged["years_exp"].fillna(0).astype(int) == 0) &
         (merged["Age"] < 26)
     )
-    merged["Had_Recent_Stats"] = merged["Key"].isin(recent_keys)
+    merged["Had_Recent_Stats"] = (np.isin(recent_years_played, recent_years) & (recent_points > 0)).any(axis=1)
 
     # Final filter: keep if they’re rookies OR have recent stats
     merged = merged[merged["Is_Rookie"] | merged["Had_Recent_Stats"]]
 
     # Add flag columns
     merged["Is_Rostered"] = merged["Team"] != "FA"
+    return merged
+
+def enrich_player_pool():
+    # Set project root
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_path = os.path.join(project_root, "data", "league_data")
+
+    # Load Sleeper rostered players and fetch full player metadata
+    rosters_df = pd.read_csv(os.path.join(data_path, "rosters.csv"))
+    players_df = sleeper_player_frame()
+    lookups = load_lookups()
+    merged = build_enriched_pool(rosters_df, players_df, lookups["recent_history"], lookups["identity_ids"]["pfr"])
 
     # Save output
     out_path = os.path.join(data_path, "player_pool_enriched.csv")
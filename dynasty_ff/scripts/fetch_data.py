@@ -1,17 +1,18 @@
 import sys
 import os
-import importlib
-import scrape_all_pfr_stats
 
-# Add the scripts directory to path so imports work
-sys.path.append(os.path.dirname(__file__))
+# Add the scrape directory to path so imports work
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrape"))
 
-importlib.reload(scrape_all_pfr_stats)
-from scrape_all_pfr_stats import scrape_all_positions
+from all_pfr_stats import scrape_all_positions, update_all_positions
 
-def fetch_all_data():
+def fetch_all_data(incremental=True):
     print("Starting NFL data fetch...")
-    scrape_all_positions(start_year=2000, end_year=2024)
+    if incremental:
+        # Only new or in-progress seasons; completed ones stay as stored
+        update_all_positions(start_year=2000)
+    else:
+        scrape_all_positions(start_year=2000, end_year=2024)
     print("Data fetch complete.")
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIGURES_DIR = os.path.join(project_root, "data", "figures")
+
+# PNG text chunk holding the hash of the data a figure was drawn from
+HASH_KEY = "Data-Hash"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def figure_spec(kind, path, **data):
+    """
+    A figure to render later: `kind` names a renderer in RENDERERS, `path` is
+    relative to data/figures/, and `data` holds plain arrays/lists/scalars.
+    """
+    return {"kind": kind, "path": path, "data": data}
+
+
+def spec_hash(spec):
+    # The renderer code is part of the hash so style changes redraw figures
+    digest = hashlib.sha256(json.dumps(jsonable(spec), sort_keys=True).encode("utf-8"))
+    with open(os.path.abspath(__file__), "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def jsonable(value):
+    if isinstance(value, dict):
+        return {k: jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def png_data_hash(path):
+    """The Data-Hash stored in a PNG's text chunks, or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type == b"IEND":
+                return None
+            body = f.read(length)
+            f.read(4)  # CRC
+            if chunk_type == b"tEXt":
+                key, _, value = body.partition(b"\x00")
+                if key.decode("latin-1") == HASH_KEY:
+                    return value.decode("latin-1")
+
+
+def render_line_chart(ax, data):
+    for label, x, y in zip(data["labels"], data["x"], data["y"]):
+        ax.plot(x, y, label=label)
+    ax.legend()
+
+
+def render_fit_chart(ax, data):
+    ax.scatter(data["x"], data["y"], alpha=0.6, label="Actual")
+    ax.plot(data["fit_x"], data["fit_y"], color="red", label=data["fit_label"])
+    ax.legend()
+
+
+RENDERERS = {
+    "line_chart": render_line_chart,
+    "fit_chart": render_fit_chart,
+}
+
+
+def render_figure(spec, data_hash):
+    """Draws one spec with the Agg backend; runs in a worker process."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    data = spec["data"]
+    fig, ax = plt.subplots(figsize=data.get("figsize", (8, 5)))
+    RENDERERS[spec["kind"]](ax, data)
+    ax.set_title(data.get("title", ""))
+    ax.set_xlabel(data.get("xlabel", ""))
+    ax.set_ylabel(data.get("ylabel", ""))
+    ax.grid(True)
+    fig.tight_layout()
+
+    path = os.path.join(FIGURES_DIR, spec["path"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fig.savefig(path, metadata={HASH_KEY: data_hash})
+    plt.close(fig)
+    return path
+
+
+def render_figures(specs, max_workers=None):
+    """
+    Renders the specs whose data changed since their PNG was drawn, in
+    parallel worker processes. Returns the paths that were (re)drawn.
+    """
+    pending = []
+    for spec in specs:
+        data_hash = spec_hash(spec)
+        if png_data_hash(os.path.join(FIGURES_DIR, spec["path"])) != data_hash:
+            pending.append((spec, data_hash))
+    if not pending:
+        return []
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        paths = list(pool.map(render_figure, *zip(*pending)))
+    print(f"🖼️ Rendered {len(paths)} figure(s) to {FIGURES_DIR} ({len(specs) - len(paths)} unchanged)")
+    return paths
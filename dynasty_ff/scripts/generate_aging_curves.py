@@ -1,129 +1,216 @@
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from numpy.polynomial.polynomial import Polynomial
+from data_store import read_dataset
+from tiers import FALLBACK_TIER, tier_scheme
+
+# Fewest distinct ages a tier needs for its curve to be fitted
+MIN_CURVE_AGES = 5
+
+# Bootstrap settings for the curve confidence bands
+BOOTSTRAP_RESAMPLES = 500
+BOOTSTRAP_CHUNK = 50
+BAND_QUANTILES = (0.025, 0.975)
+
+
+def curve_keys():
+    """Every (position, tier) curve of the positional-rank tiers, in output order."""
+    scheme = tier_scheme("rank")
+    return [(pos, tier) for pos in scheme.positions() for tier in scheme.labels(pos) + [FALLBACK_TIER]]
 
-def generate_aging_curve_coefficients():
-    # Define root
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    # Load historical fantasy scores
-    fantasy_path = os.path.join(project_root, "data", "historical_stats", "fantasy_scores_2000_2024.csv")
-    df = pd.read_csv(fantasy_path)
+def curve_seasons(fantasy_df):
+    """
+    Season rows used for the curves as (curve index into curve_keys(), age,
+    points) arrays. Each season is tiered by its points rank within its year
+    and position.
+    """
+    scheme = tier_scheme("rank")
+    df = fantasy_df[fantasy_df["FantPos"].isin(scheme.positions())]
 
-    # Filter positions and clean
-    df = df[df["FantPos"].isin(["QB", "RB", "WR", "TE"])]
+    # Clean
     df = df.dropna(subset=["Player", "Age", "Year", "Fantasy_Pts"])
-    df["Age"] = df["Age"].astype(int)
-    df["PosRank"] = df.groupby(["Year", "FantPos"])["Fantasy_Pts"].rank(method="min", ascending=False)
-
-    # Tiering function
-    def get_tier(pos, rank):
-        if pos == "QB":
-            if rank <= 5:
-                return "Top 5"
-            elif rank <= 10:
-                return "Top 10"
-            elif rank <= 20:
-                return "Top 20"
-            elif rank <= 30:
-                return "Top 30"
-            else:
-                return "Bench"
-
-        elif pos == "RB":
-            if rank <= 5:
-                return "Top 5"
-            elif rank <= 10:
-                return "Top 10"
-            elif rank <= 20:
-                return "Top 20"
-            elif rank <= 30:
-                return "Top 30"
-            elif rank <= 40:
-                return "Top 40"
-            elif rank <= 50:
-                return "Top 50"
-            else:
-                return "Bench"
-
-        elif pos == "WR":
-            if rank <= 5:
-                return "Top 5"
-            elif rank <= 10:
-                return "Top 10"
-            elif rank <= 20:
-                return "Top 20"
-            elif rank <= 30:
-                return "Top 30"
-            elif rank <= 40:
-                return "Top 40"
-            elif rank <= 50:
-                return "Top 50"
-            elif rank <= 60:
-                return "Top 60"
-            elif rank <= 70:
-                return "Top 70"
-            else:
-                return "Bench"
-
-        elif pos == "TE":
-            if rank <= 5:
-                return "Top 5"
-            elif rank <= 10:
-                return "Top 10"
-            elif rank <= 20:
-                return "Top 20"
-            elif rank <= 30:
-                return "Top 30"
-            else:
-                return "Bench"
-
-
-    df["Tier"] = df.apply(lambda row: get_tier(row["FantPos"], row["PosRank"]), axis=1)
-
-    # Group by Age + Tier + Position
-    # agg = df[df["Tier"] != "Bench"].groupby(["FantPos", "Tier", "Age"])["Fantasy_Pts"].mean().reset_index()
-    agg = df.groupby(["FantPos", "Tier", "Age"])["Fantasy_Pts"].mean().reset_index()
-
-    # Fit aging curve for each group
+    df = df.assign(Age=df["Age"].astype(int))
+    rank = df.groupby(["Year", "FantPos"])["Fantasy_Pts"].rank(method="min", ascending=False)
+    tiers = scheme.classify(rank.to_numpy(), df["FantPos"].to_numpy())
+
+    curves = pd.MultiIndex.from_tuples(curve_keys())
+    curve = curves.get_indexer(pd.MultiIndex.from_arrays([df["FantPos"].to_numpy(), tiers])).astype(np.int64)
+    return curve, df["Age"].to_numpy(dtype=np.int64), df["Fantasy_Pts"].to_numpy(dtype=np.float64)
+
+
+def age_means(group, age, pts, n_groups):
+    """Mean points for every (group, age) cell with data, as (group, age, mean) arrays."""
+    first = age.min()
+    span = age.max() - first + 1
+    cell = group * span + (age - first)
+    counts = np.bincount(cell, minlength=n_groups * span)
+    sums = np.bincount(cell, weights=pts, minlength=n_groups * span)
+    present = np.flatnonzero(counts)
+    return present // span, present % span + first, sums[present] / counts[present]
+
+
+def fit_quadratics(group, x, y, n_groups):
+    """
+    Least-squares y = a + b*x + c*x^2 for every group in one batched solve.
+    Each group's x range is mapped onto [-1, 1] first (as Polynomial.fit
+    does) so the normal equations stay well conditioned. Returns an
+    (n_groups, 3) array of (a, b, c), NaN for groups with under 3 points.
+    """
+    lo = np.full(n_groups, np.inf)
+    hi = np.full(n_groups, -np.inf)
+    np.minimum.at(lo, group, x)
+    np.maximum.at(hi, group, x)
+    mid = (lo + hi) / 2
+    half = (hi - lo) / 2
+    fitted = (np.bincount(group, minlength=n_groups) >= 3) & (half > 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        u = (x - mid[group]) / half[group]
+    powers = [np.ones_like(u), u, u ** 2, u ** 3, u ** 4]
+    moments = np.column_stack([np.bincount(group, weights=p, minlength=n_groups) for p in powers])
+    rhs = np.column_stack([np.bincount(group, weights=y * p, minlength=n_groups) for p in powers[:3]])
+
+    coef = np.full((n_groups, 3), np.nan)
+    lhs = moments[fitted][:, [[0, 1, 2], [1, 2, 3], [2, 3, 4]]]
+    coef[fitted] = np.linalg.solve(lhs, rhs[fitted][..., None])[..., 0]
+
+    # Back from u = (x - mid) / half to powers of x
+    p0, p1, p2 = coef.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.column_stack([
+            p0 - p1 * mid / half + p2 * mid ** 2 / half ** 2,
+            p1 / half - 2 * p2 * mid / half ** 2,
+            p2 / half ** 2,
+        ])
+
+
+def fit_curve_table(curve, age, pts, n_curves):
+    """(coefficients, min_age, max_age, number of ages) per curve."""
+    cell_curve, cell_age, cell_mean = age_means(curve, age, pts, n_curves)
+    coef = fit_quadratics(cell_curve, cell_age, cell_mean, n_curves)
+    n_ages = np.bincount(cell_curve, minlength=n_curves)
+    min_age = np.full(n_curves, np.iinfo(np.int64).max)
+    max_age = np.full(n_curves, np.iinfo(np.int64).min)
+    np.minimum.at(min_age, cell_curve, cell_age)
+    np.maximum.at(max_age, cell_curve, cell_age)
+    return coef, min_age, max_age, n_ages
+
+
+def fit_aging_curves(fantasy_df):
+    """Fits a quadratic aging curve per position and tier from historical fantasy scores."""
+    curves = curve_keys()
+    coef, min_age, max_age, n_ages = fit_curve_table(*curve_seasons(fantasy_df), len(curves))
+
     rows = []
-    position_tiers = {
-        "QB":  ["Top 5", "Top 10", "Top 20", "Top 30", "Bench"],
-        "RB":  ["Top 5", "Top 10", "Top 20", "Top 30", "Top 40", "Top 50", "Bench"],
-        "WR":  ["Top 5", "Top 10", "Top 20", "Top 30", "Top 40", "Top 50", "Top 60", "Top 70", "Bench"],
-        "TE":  ["Top 5", "Top 10", "Top 20", "Top 30", "Bench"]
-    }
-
-    for pos, tiers in position_tiers.items():
-        for tier in tiers:
-            subset = agg[(agg["FantPos"] == pos) & (agg["Tier"] == tier)]
-            if subset.shape[0] < 5:
-                continue
-
-            x = subset["Age"]
-            y = subset["Fantasy_Pts"]
-            coefs = Polynomial.fit(x, y, 2).convert().coef
-            a, b, c = coefs
-
-            min_age = int(x.min())
-            max_age = int(x.max())
-
-            rows.append({
-                "Position": pos,
-                "Tier": tier,
-                "a": round(a, 4),
-                "b": round(b, 4),
-                "c": round(c, 4),
-                "min_age": min_age,
-                "max_age": max_age
-            })
+    for i, (pos, tier) in enumerate(curves):
+        if n_ages[i] < MIN_CURVE_AGES:
+            continue
+        a, b, c = np.round(coef[i], 4)
+        rows.append({
+            "Position": pos,
+            "Tier": tier,
+            "a": a,
+            "b": b,
+            "c": c,
+            "min_age": int(min_age[i]),
+            "max_age": int(max_age[i])
+        })
+
+    return pd.DataFrame(rows)
+
+
+def bootstrap_coefficients(curve, age, pts, n_curves, resamples, seed):
+    """
+    (resamples, n_curves, 3) coefficients refitted on seasons drawn with
+    replacement within each curve; all resamples share one batched fit.
+    `curve` must be sorted.
+    """
+    rng = np.random.default_rng(seed)
+    sizes = np.bincount(curve, minlength=n_curves)
+    starts = np.cumsum(sizes) - sizes
+    draws = starts[curve] + (rng.random((resamples, len(curve))) * sizes[curve]).astype(np.int64)
+
+    group = (np.arange(resamples)[:, None] * n_curves + curve).ravel()
+    cell_group, cell_age, cell_mean = age_means(group, age[draws].ravel(), pts[draws].ravel(), resamples * n_curves)
+    coef = fit_quadratics(cell_group, cell_age, cell_mean, resamples * n_curves)
+    return coef.reshape(resamples, n_curves, 3)
+
+
+def bootstrap_aging_bands(fantasy_df, resamples=BOOTSTRAP_RESAMPLES, max_workers=None, seed=0):
+    """
+    Confidence bands for every fitted curve: the fitted points at each age in
+    its range plus the BAND_QUANTILES of `resamples` bootstrap refits.
+    Resamples are fitted in chunks across a process pool; a given seed gives
+    the same bands for any number of workers. Workers are spawned rather
+    than forked, so this is safe to call from a pipeline worker thread.
+    """
+    curves = curve_keys()
+    curve, age, pts = curve_seasons(fantasy_df)
+    coef, min_age, max_age, n_ages = fit_curve_table(curve, age, pts, len(curves))
+
+    order = np.argsort(curve, kind="stable")
+    curve, age, pts = curve[order], age[order], pts[order]
+    chunks = [min(BOOTSTRAP_CHUNK, resamples - start) for start in range(0, resamples, BOOTSTRAP_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        boot = np.concatenate(list(pool.map(
+            bootstrap_coefficients,
+            [curve] * len(chunks), [age] * len(chunks), [pts] * len(chunks), [len(curves)] * len(chunks), chunks, seeds
+        )))
+
+    bands = []
+    for i, (pos, tier) in enumerate(curves):
+        if n_ages[i] < MIN_CURVE_AGES:
+            continue
+        ages = np.arange(min_age[i], max_age[i] + 1)
+        powers = np.vstack([np.ones_like(ages), ages, ages ** 2]).astype(float)
+        samples = boot[:, i, :] @ powers
+        lower, upper = np.nanquantile(samples, BAND_QUANTILES, axis=0)
+        bands.append(pd.DataFrame({
+            "Position": pos,
+            "Tier": tier,
+            "Age": ages,
+            "Fit": np.round(coef[i] @ powers, 2),
+            "Lower": np.round(lower, 2),
+            "Upper": np.round(upper, 2),
+        }))
+
+    return pd.concat(bands, ignore_index=True)
+
+
+def load_curve_scores():
+    # Load historical fantasy scores (only the columns and positions the curves use)
+    return read_dataset(
+        "fantasy_scores",
+        columns=["Player", "Age", "Year", "Fantasy_Pts", "FantPos"],
+        filters=[("FantPos", "in", tier_scheme("rank").positions())]
+    )
+
+
+def generate_aging_curve_coefficients(bands=False, resamples=BOOTSTRAP_RESAMPLES):
+    # Define root
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    df = load_curve_scores()
 
     # Save output
-    output = pd.DataFrame(rows)
+    output = fit_aging_curves(df)
     out_path = os.path.join(project_root, "data", "league_data", "aging_curve_coefficients.csv")
     output.to_csv(out_path, index=False)
     print(f"✅ Saved aging curve formulas to {out_path}")
 
+    if bands:
+        bands_path = os.path.join(project_root, "data", "league_data", "aging_curve_bands.csv")
+        bootstrap_aging_bands(df, resamples).to_csv(bands_path, index=False)
+        print(f"✅ Saved aging curve confidence bands ({resamples} resamples) to {bands_path}")
+
 if __name__ == "__main__":
-    generate_aging_curve_coefficients()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit aging curves per position and tier")
+    parser.add_argument("--bands", action="store_true", help="also write bootstrap confidence bands (as the optional aging_bands stage does)")
+    parser.add_argument("--resamples", type=int, default=BOOTSTRAP_RESAMPLES)
+    args = parser.parse_args()
+    generate_aging_curve_coefficients(bands=args.bands, resamples=args.resamples)
@@ -1,49 +1,63 @@
 import os
 import pandas as pd
+from data_store import read_dataset
+from figures import figure_spec, render_figures
+from tiers import tier_scheme
+
+def compute_breakout_curves(fantasy_df):
+    """Average fantasy points by position, age and positional-rank tier."""
+    scheme = tier_scheme("breakout_rank")
+    fantasy_df = fantasy_df[fantasy_df["FantPos"].isin(scheme.positions())]
+    fantasy_df = fantasy_df.dropna(subset=["Age", "Fantasy_Pts"])
+
+    # Tier every season at once; positions keep the tier table's order
+    df = pd.DataFrame({
+        "Position": pd.Categorical(fantasy_df["FantPos"], categories=scheme.positions()),
+        "Age": fantasy_df["Age"].astype(int),
+        "Tier": scheme.classify(fantasy_df["Fantasy_PosRank"].to_numpy(), fantasy_df["FantPos"].to_numpy()),
+        "Avg_Fantasy_Pts": fantasy_df["Fantasy_Pts"],
+    })
+
+    result_df = df.groupby(["Position", "Age", "Tier"], observed=True)["Avg_Fantasy_Pts"].mean().reset_index()
+    result_df["Position"] = result_df["Position"].astype(str)
+    return result_df[["Age", "Tier", "Avg_Fantasy_Pts", "Position"]]
+
+
+def breakout_curve_figures(breakout_df):
+    """Figure specs (see figures.render_figures): one line per tier of average points by age, per position."""
+    specs = []
+    for pos, pos_df in breakout_df.groupby("Position", sort=False):
+        tiers = [(tier, tier_df["Age"].to_numpy(), tier_df["Avg_Fantasy_Pts"].to_numpy())
+                 for tier, tier_df in pos_df.groupby("Tier", sort=False)]
+        labels, x, y = zip(*tiers)
+        specs.append(figure_spec(
+            "line_chart", f"breakout_curve_{pos}.png",
+            labels=labels, x=x, y=y, figsize=(10, 6),
+            title=f"Breakout Curves by Age: {pos}", xlabel="Age", ylabel="Average Fantasy Points"
+        ))
+    return specs
 
-def generate_breakout_data():
+
+def generate_breakout_data(plots=True):
     # Set paths
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_path = os.path.join(project_root, "data", "historical_stats")
     out_path = os.path.join(project_root, "data", "league_data")
     os.makedirs(out_path, exist_ok=True)
 
     # Load fantasy scores
-    fantasy_df = pd.read_csv(os.path.join(data_path, "fantasy_scores_2000_2024.csv"))
-    fantasy_df = fantasy_df[fantasy_df["FantPos"].isin(["QB", "RB", "WR", "TE"])]
-    fantasy_df = fantasy_df.dropna(subset=["Age", "Fantasy_Pts"])
-    fantasy_df["Age"] = fantasy_df["Age"].astype(int)
-
-    # Define tier cutoffs per position
-    tier_cutoffs = {
-        "QB": [5, 10, 20, 30],
-        "RB": [5, 10, 20, 30],
-        "WR": [5, 10, 20, 30],
-        "TE": [5, 10, 20, 30]
-    }
-
-    all_breakouts = []
-
-    for pos, cutoffs in tier_cutoffs.items():
-        pos_df = fantasy_df[fantasy_df["FantPos"] == pos].copy()
-        pos_df["Tier"] = pos_df["Fantasy_PosRank"].apply(lambda r: next(
-            (f"Top {cut}" for cut in cutoffs if r <= cut), "Bench"
-        ))
-
-        avg_by_age = (
-            pos_df.groupby(["Age", "Tier"])["Fantasy_Pts"]
-            .mean()
-            .reset_index()
-        )
-        avg_by_age["Position"] = pos
-        all_breakouts.append(avg_by_age)
-
-    result_df = pd.concat(all_breakouts, ignore_index=True)
-    result_df = result_df.rename(columns={"Fantasy_Pts": "Avg_Fantasy_Pts"})
+    fantasy_df = read_dataset(
+        "fantasy_scores",
+        columns=["FantPos", "Age", "Fantasy_Pts", "Fantasy_PosRank"],
+        filters=[("FantPos", "in", ["QB", "RB", "WR", "TE"])]
+    )
+    result_df = compute_breakout_curves(fantasy_df)
 
     # Save output
     result_df.to_csv(os.path.join(out_path, "breakout_probabilities.csv"), index=False)
     print(f"✅ Breakout probabilities saved to {out_path}/breakout_probabilities.csv")
 
+    if plots:
+        render_figures(breakout_curve_figures(result_df))
+
 if __name__ == "__main__":
     generate_breakout_data()
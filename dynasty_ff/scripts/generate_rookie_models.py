@@ -1,73 +1,91 @@
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import os
-from sklearn.linear_model import LinearRegression
+from figures import figure_spec, render_figures
 
-def generate_rookie_models():
-    # === Load rookie draft and projection data ===
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_path = os.path.join(project_root, "data", "league_data")
-    output_path = os.path.join(data_path, "rookie_curves")
-    os.makedirs(output_path, exist_ok=True)
+POSITIONS = ["QB", "RB", "WR", "TE"]
 
-    proj_df = pd.read_csv(os.path.join(data_path, "dynasty_projections.csv"))
+def rookie_mask(proj_df):
+    # Rookies with valid pick data
+    return (proj_df["Rookie"] == 1) & proj_df["Overall_Pick"].notna()
 
-    # Focus on rookies with valid pick data
-    rookies_df = proj_df[(proj_df["Rookie"] == 1) & (proj_df["Overall_Pick"].notna())].copy()
+def fit_position_models(rookies_df):
+    """{position: LinearRegression of Proj_Career on Overall_Pick} for positions with rookies."""
+    from sklearn.linear_model import LinearRegression  # sklearn costs ~1s to import
 
-    # Initialize models and output column
     position_models = {}
-    proj_df["Expected_Proj_Career"] = np.nan
-
-    # === Fit + plot for each position ===
-    positions = ["QB", "RB", "WR", "TE"]
-    for pos in positions:
+    for pos in POSITIONS:
         pos_df = rookies_df[rookies_df["Position"] == pos]
         if pos_df.empty:
             continue
 
-        x = pos_df["Overall_Pick"]
-        y = pos_df["Proj_Career"]
-        X = x.values.reshape(-1, 1)
-
-        # Linear Regression
         model = LinearRegression()
-        model.fit(X, y)
+        model.fit(pos_df["Overall_Pick"].to_numpy().reshape(-1, 1), pos_df["Proj_Career"])
         position_models[pos] = model
+    return position_models
+
+def rookie_curve_figures(proj_df):
+    """Figure specs (see figures.render_figures) of each position's fit against its rookies."""
+    rookies_df = proj_df[rookie_mask(proj_df)]
+    specs = []
+    for pos, model in fit_position_models(rookies_df).items():
+        pos_df = rookies_df[rookies_df["Position"] == pos]
+        x = pos_df["Overall_Pick"].to_numpy(dtype=float)
 
         # Predict for plotting
         x_range = np.linspace(x.min(), x.max(), 100)
-        y_pred = model.predict(x_range.reshape(-1, 1))
+        specs.append(figure_spec(
+            "fit_chart", os.path.join("rookie_curves", f"{pos}_rookie_curve.png"),
+            x=x, y=pos_df["Proj_Career"].to_numpy(dtype=float),
+            fit_x=x_range, fit_y=model.predict(x_range.reshape(-1, 1)),
+            fit_label=f"Fit: y = {model.coef_[0]:.2f}x + {model.intercept_:.2f}",
+            title=f"{pos} Rookie Career Projection vs Draft Pick",
+            xlabel="Overall Draft Pick", ylabel="Projected Career Points"
+        ))
+    return specs
 
-        # Plot
-        plt.figure(figsize=(8, 5))
-        plt.scatter(x, y, alpha=0.6, label="Actual")
-        plt.plot(x_range, y_pred, color='red', label=f"Fit: y = {model.coef_[0]:.2f}x + {model.intercept_:.2f}")
-        plt.title(f"{pos} Rookie Career Projection vs Draft Pick")
-        plt.xlabel("Overall Draft Pick")
-        plt.ylabel("Projected Career Points")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_path, f"{pos}_rookie_curve.png"))
-        plt.close()
+def predict_expected_career(proj_df, position_models):
+    """Expected_Proj_Career for every rookie with a pick, one predict call per position."""
+    expected = pd.Series(np.nan, index=proj_df.index)
+    rookies = rookie_mask(proj_df)
+    for pos, model in position_models.items():
+        rows = rookies & (proj_df["Position"] == pos)
+        if rows.any():
+            picks = proj_df.loc[rows, "Overall_Pick"].to_numpy(dtype=float).reshape(-1, 1)
+            expected[rows] = [round(value, 1) for value in model.predict(picks)]
+    return expected
 
-        print(f"✅ Saved curve for {pos}: y = {model.coef_[0]:.2f}x + {model.intercept_:.2f}")
+def fit_rookie_models(proj_df):
+    """
+    Fits career projection vs draft pick per position and returns the
+    projections with Expected_Proj_Career. Plots are drawn separately from
+    rookie_curve_figures.
+    """
+    proj_df = proj_df.copy()
+    position_models = fit_position_models(proj_df[rookie_mask(proj_df)])
+    for pos, model in position_models.items():
+        print(f"✅ Fitted curve for {pos}: y = {model.coef_[0]:.2f}x + {model.intercept_:.2f}")
 
-    # === Apply model predictions to all rookies ===
-    for idx, row in proj_df.iterrows():
-        if row["Rookie"] == 1 and pd.notna(row["Overall_Pick"]):
-            pos = row["Position"]
-            if pos in position_models:
-                model = position_models[pos]
-                expected = model.predict([[row["Overall_Pick"]]])[0]
-                proj_df.at[idx, "Expected_Proj_Career"] = round(expected, 1)
+    proj_df["Expected_Proj_Career"] = predict_expected_career(proj_df, position_models)
+    return proj_df
+
+def generate_rookie_models(plots=True):
+    # === Load rookie draft and projection data ===
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    data_path = os.path.join(project_root, "data", "league_data")
+
+    proj_df = fit_rookie_models(pd.read_csv(os.path.join(data_path, "dynasty_projections.csv")))
 
     # Save updated projections
     output_csv = os.path.join(data_path, "dynasty_projections_adjusted.csv")
     proj_df.to_csv(output_csv, index=False)
     print(f"📁 Saved updated projections to: {output_csv}")
 
+    if plots:
+        render_figures(rookie_curve_figures(proj_df))
+
 if __name__ == "__main__":
-    generate_rookie_models()
+    parser = argparse.ArgumentParser(description="Fit rookie career curves by draft pick.")
+    parser.add_argument("--no-plots", action="store_true", help="skip rendering the per-position curve figures")
+    generate_rookie_models(plots=not parser.parse_args().no_plots)
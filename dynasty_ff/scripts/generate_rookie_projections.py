@@ -1,99 +1,178 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import xgboost as xgb
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
-
-def generate_rookie_projections(max_years_exp=3):
+from college_features import load_college_features
+from identity import resolved_ids
+from lookups import join_keys, load_lookups, name_keys, player_keys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEAGUE_DATA_PATH = os.path.join(project_root, "data", "league_data")
+HISTORICAL_PATH = os.path.join(project_root, "data", "historical_stats")
+MODEL_CACHE_DIR = os.path.join(project_root, "data", "cache", "rookie_xgb")
+
+POSITIONS = ["QB", "RB", "WR", "TE"]
+XGB_PARAMS = {"n_estimators": 100, "max_depth": 4, "learning_rate": 0.1}
+
+# Share of a position's players with college/combine data that must have a feature for it to be used
+MIN_FEATURE_COVERAGE = 0.5
+
+FEATURE_COLUMNS = [
+    # Combine metrics
+    "Height", "Weight", "40yd", "Vertical", "Bench", "Broad Jump", "3Cone", "Shuttle",
+
+    # Rushing stats
+    "Rushing_Att", "Rushing_Yds", "Rushing_Y/A", "Rushing_TD", "Rushing_Y/G",
+
+    # Receiving stats
+    "Receiving_Rec", "Receiving_Yds", "Receiving_Y/R", "Receiving_TD", "Receiving_Y/G",
+
+    # Passing stats (for QBs)
+    "Cmp", "Att", "Cmp%", "Yds", "TD", "TD%", "Int", "Int%", "Y/A", "AY/A", "Y/C", "Y/G", "Rate"
+]
+
+def parse_height(height_str):
+    try:
+        if isinstance(height_str, str):
+            # Remove leading/trailing non-numeric characters like apostrophes or spaces
+            height_str = height_str.strip().lstrip("'").strip()
+            if '-' in height_str:
+                feet, inches = height_str.split('-')
+                return int(feet) * 12 + int(inches)
+        return float(height_str) if height_str else None
+    except:
+        return None  # Return None for malformed or missing values
+
+def player_features(combine_df, college_features, identity=None):
+    """
+    One row per join key (see lookups.join_keys): the player's latest combine
+    entry and his final college season from the college feature table (the
+    most recent player when two share a key). College rows take the key of
+    the combine entry they were scraped from.
+    """
+    ids = None
+    if identity is not None:
+        ids = resolved_ids(identity, "combine", combine_df["Full_Name"], combine_df["Position"], combine_df["Draft_Year"])
+    combine = combine_df.assign(Key=join_keys(combine_df["Full_Name"], ids).to_numpy(dtype=object))
+    combine = combine.sort_values("Draft_Year", kind="stable")
+    entry_keys = combine.drop_duplicates(["Full_Name", "Position"], keep="last").set_index(["Full_Name", "Position"])["Key"]
+    combine = combine.drop_duplicates("Key", keep="last")
+    combine["Height"] = combine["Height"].apply(parse_height)
+
+    college = college_features.sort_values("Final_Season", kind="stable")
+    college_keys = entry_keys.reindex(pd.MultiIndex.from_frame(college[["Full_Name", "Position"]].astype(object))).to_numpy(dtype=object)
+    college = college.assign(Key=np.where(pd.notna(college_keys), college_keys, college["Name_Key"].to_numpy(dtype=object)))
+    college = college.drop_duplicates("Key", keep="last")
+
+    def feature_view(frame):
+        return frame[["Key"] + [col for col in FEATURE_COLUMNS if col in frame.columns]]
+
+    return feature_view(combine).merge(feature_view(college), on="Key", how="outer")
+
+def training_key(pos, X, y, features):
+    import xgboost as xgb
+
+    digest = hashlib.sha256(X.tobytes())
+    digest.update(y.tobytes())
+    digest.update(json.dumps([pos, features, XGB_PARAMS, xgb.__version__]).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def fit_position_model(pos, X, y, features, n_jobs):
+    """XGB model for one position, reused from disk while its training inputs are unchanged."""
+    import xgboost as xgb
+
+    path = os.path.join(MODEL_CACHE_DIR, f"{pos}_{training_key(pos, X, y, features)}.json")
+    model = xgb.XGBRegressor(**XGB_PARAMS, n_jobs=n_jobs)
+    if os.path.exists(path):
+        model.load_model(path)
+        return model, True
+
+    model.fit(X, y)
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    for name in os.listdir(MODEL_CACHE_DIR):
+        if name.startswith(f"{pos}_"):
+            os.remove(os.path.join(MODEL_CACHE_DIR, name))
+    model.save_model(path[:-len(".json")] + ".tmp.json")
+    os.replace(path[:-len(".json")] + ".tmp.json", path)
+    return model, False
+
+def project_position(pos, pos_df, max_years_exp, n_jobs):
+    """(rookie/sophomore projections or None, progress message) for one position."""
+    candidates = [f for f in FEATURE_COLUMNS if f in pos_df.columns]
+    has_data = pos_df[candidates].notna().any(axis=1)
+    coverage = pos_df.loc[has_data, candidates].notna().mean()
+    features = [f for f in candidates if coverage[f] >= MIN_FEATURE_COVERAGE]
+    if not features:
+        return None, f"Skipping {pos}: no features"
+
+    # Built once per position; training and prediction rows are slices of it
+    X = np.ascontiguousarray(pos_df[features].to_numpy(dtype=np.float32))
+    complete = ~np.isnan(X).any(axis=1)
+    has_label = pos_df["Proj_Career"].notna().to_numpy()
+
+    train = complete & has_label
+    if train.sum() < 10:
+        return None, f"Skipping {pos}: not enough training data ({train.sum()} rows)"
+
+    y = pos_df["Proj_Career"].to_numpy(dtype=np.float32)[train]
+    model, reused = fit_position_model(pos, X[train], y, features, n_jobs)
+
+    # Apply model to rookies/sophomores
+    predict = complete & (pos_df["years_exp"] <= max_years_exp).to_numpy()
+    status = "reused cached model" if reused else "trained"
+    message = f"{pos}: {len(features)} features, {train.sum()} training rows ({status}), {predict.sum()} rookies/sophs to predict"
+    if not predict.any():
+        return None, message
+
+    predict_df = pos_df.loc[predict, ["Full_Name", "Position"]].copy()
+    predict_df["Rookie_Proj_Career"] = model.predict(X[predict])
+    return predict_df, message
+
+def generate_rookie_projections(max_years_exp=3, max_workers=None, lookups=None):
     # Load core data
-    pool_df = pd.read_csv("../data/league_data/player_pool_enriched.csv")
-    proj_df = pd.read_csv("../data/league_data/dynasty_projections.csv")
-    combine_df = pd.read_csv("../data/historical_stats/combine_results.csv")
-    college_df = pd.read_csv("../data/historical_stats/college_stats.csv")
+    pool_df = pd.read_csv(os.path.join(LEAGUE_DATA_PATH, "player_pool_enriched.csv"))
+    proj_df = pd.read_csv(os.path.join(LEAGUE_DATA_PATH, "dynasty_projections.csv"))
+    combine_df = pd.read_csv(os.path.join(HISTORICAL_PATH, "combine_results.csv"))
 
-    # Merge in projection values (for training labels)
-    proj_df = proj_df[["Player", "Proj_Career"]].rename(columns={"Player": "Full_Name"})
-    df = pool_df.merge(proj_df, on="Full_Name", how="left")
+    # Shared with the projection stages when run in the same session
+    lookups = lookups or load_lookups()
+    identity = lookups["identity"]
 
-    # Normalize name casing
-    df["Full_Name"] = df["Full_Name"].str.lower().str.strip()
-    combine_df["Full_Name"] = combine_df["Full_Name"].str.lower().str.strip()
-    college_df["Full_Name"] = college_df["Full_Name"].str.lower().str.strip()
+    # Look up projection values (for training labels) by Sleeper ID
+    proj_by_id = proj_df.drop_duplicates("Sleeper_Player_ID").set_index("Sleeper_Player_ID")["Proj_Career"]
+    df = pool_df.copy()
+    df["Proj_Career"] = df["Sleeper_Player_ID"].map(proj_by_id)
 
-    # Merge in combine + college data
-    df = df.merge(combine_df, on="Full_Name", how="left")
-    df = df.merge(college_df, on="Full_Name", how="left")
+    # Join key into the combine/college features: Sleeper ID when resolved, else normalized name
+    df["Key"] = player_keys(df["Sleeper_Player_ID"], df["Full_Name"], lookups["identity_ids"]["combine"]).to_numpy(dtype=object)
+    df["Full_Name"] = name_keys(df["Full_Name"])
 
+    # Combine + college features, one row per player so the join keeps the pool's row count
+    df = df.merge(player_features(combine_df, load_college_features(), identity), on="Key", how="left")
     print(f"Total merged player rows: {len(df)}")
-    print(f"Sample columns: {df.columns.tolist()}")
-
-    results = []
-
-    def parse_height(height_str):
-        try:
-            if isinstance(height_str, str):
-                # Remove leading/trailing non-numeric characters like apostrophes or spaces
-                height_str = height_str.strip().lstrip("'").strip()
-                if '-' in height_str:
-                    feet, inches = height_str.split('-')
-                    return int(feet) * 12 + int(inches)
-            return float(height_str) if height_str else None
-        except:
-            return None  # Return None for malformed or missing values
-
-    for pos in ["QB", "RB", "WR", "TE"]:
-        print(f"\n--- Processing position: {pos} ---")
-        pos_df = df[df["Position"] == pos].copy()
-        pos_df["Height"] = pos_df["Height"].apply(parse_height)
-
-        # Define features and target
-        possible_features = [
-            # Combine metrics
-            "Height", "Weight", "40yd", "Vertical", "Bench", "Broad Jump", "3Cone", "Shuttle",
-
-            # Rushing stats
-            "Rushing_Att", "Rushing_Yds", "Rushing_Y/A", "Rushing_TD", "Rushing_Y/G",
-
-            # Receiving stats
-            "Receiving_Rec", "Receiving_Yds", "Receiving_Y/R", "Receiving_TD", "Receiving_Y/G",
-
-            # Passing stats (for QBs)
-            "Cmp", "Att", "Cmp%", "Yds", "TD", "TD%", "Int", "Int%", "Y/A", "AY/A", "Y/C", "Y/G", "Rate"
-        ]
-
-        features = [f for f in possible_features if f in pos_df.columns and pos_df[f].notna().sum() > 0]
-        print(f"Using {len(features)} features for {pos}: {features}")
-
-        # Training set: must have a target
-        train_df = pos_df[pos_df["Proj_Career"].notna()].dropna(subset=features)
-        print(f"{len(train_df)} rows with training labels for {pos}")
-
-        if len(train_df) < 10 or not features:
-            print(f"Skipping {pos}: not enough training data")
-            continue
 
-        X_train = train_df[features]
-        y_train = train_df["Proj_Career"]
-
-        # Train model
-        model = xgb.XGBRegressor(n_estimators=100, max_depth=4, learning_rate=0.1)
-        model.fit(X_train, y_train)
-
-        # Apply model to rookies/sophomores with missing projections
-        predict_df = pos_df[(pos_df["years_exp"] <= max_years_exp)]
-        predict_df = predict_df.dropna(subset=features)
-        print(f"{len(predict_df)} rookies/sophs with data to predict for {pos}")
-
-        if predict_df.empty:
-            continue
-
-        predict_df["Rookie_Proj_Career"] = model.predict(predict_df[features])
-        results.append(predict_df[["Full_Name", "Position", "Rookie_Proj_Career"]])
+    # Positions train concurrently (XGBoost releases the GIL), splitting the cores between them
+    max_workers = max_workers or len(POSITIONS)
+    n_jobs = max(1, (os.cpu_count() or 1) // max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(project_position, pos, df[df["Position"] == pos], max_years_exp, n_jobs)
+            for pos in POSITIONS
+        ]
+        results = []
+        for future in futures:
+            predict_df, message = future.result()
+            print(message)
+            if predict_df is not None:
+                results.append(predict_df)
 
     if results:
         final_df = pd.concat(results)
-        final_df.to_csv("../data/league_data/projected_rookies.csv", index=False)
-        print("✅ Saved rookie projections to ../data/league_data/projected_rookies.csv")
+        out_path = os.path.join(LEAGUE_DATA_PATH, "projected_rookies.csv")
+        final_df.to_csv(out_path, index=False)
+        print(f"✅ Saved rookie projections to {out_path}")
     else:
         print("⚠️ No rookie projections generated.")
 
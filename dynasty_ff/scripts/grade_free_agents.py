@@ -1,54 +1,135 @@
+import heapq
 import os
+from functools import lru_cache
+from itertools import islice
+import numpy as np
 import pandas as pd
 
-def grade_free_agents(top_n=100, pos=None, mode="all"):
-    """
-    Grades unrostered players by projected value.
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECTIONS_PATH = os.path.join(project_root, "data", "league_data", "dynasty_projections.csv")
+
+# Tier order for ranking (A first); unknown tiers sort last
+TIER_ORDER = {"A": 0, "B": 1, "C": 2, "Flex": 3, "Bench": 4}
+
+# Bookkeeping columns left out of the ranked lists
+HIDDEN_COLUMNS = ["Sleeper_Player_ID", "Rostered", "Rookie", "Rookie_Year", "Draft_Round", "Overall_Pick"]
+
+# Rookie flag values each mode covers
+MODES = {"all": (0, 1), "rookies": (1,), "vets": (0,)}
 
-    Args:
-        top_n (int): number of players to include in top list
-        pos (str or None): filter by position (e.g., 'QB', 'WR'), or None for all
-        mode (str): 'all', 'rookies', or 'vets'
+class FreeAgentIndex:
+    """
+    Unrostered players from a projections frame, ranked once by Tier (A
+    first) then Proj_Career (highest first), with one index per (position,
+    rookie flag) holding its players' ranks in order. A query takes the
+    first top_n matching players from each index it covers and merges those
+    runs, so it never re-sorts the pool.
     """
 
-    # Load data
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    df = pd.read_csv(os.path.join(project_root, "data", "league_data", "dynasty_projections.csv"))
+    def __init__(self, df):
+        df = df[df["Rostered"] == 0]
+        tier_sort = df["Tier"].map(TIER_ORDER)
+        order = np.lexsort((-df["Proj_Career"].fillna(-np.inf).to_numpy(dtype=float), tier_sort.fillna(np.inf).to_numpy(dtype=float)))
+        self.players = df.iloc[order]
+        # Filter columns as plain arrays so a query's mask costs no pandas overhead
+        self.ages = self.players["Age"].to_numpy(dtype=float)
+        self.nfl_teams = self.players["NFL Team"].to_numpy(dtype=object)
+        self.breakout = self.players["BreakoutFlag"].to_numpy()
+        self.indexes = {
+            key: rows.to_numpy()
+            for key, rows in pd.Series(np.arange(len(order))).groupby(
+                [self.players["Position"].to_numpy(dtype=object), self.players["Rookie"].to_numpy()]
+            )
+        }
 
-    # Filter to unrostered
-    df = df[df["Rostered"] == 0]
+    def filter_mask(self, min_age=None, max_age=None, nfl_team=None, breakout=None):
+        """Rows (in rank order) passing the optional filters."""
+        mask = np.ones(len(self.players), dtype=bool)
+        if min_age is not None:
+            mask &= self.ages >= min_age
+        if max_age is not None:
+            mask &= self.ages <= max_age
+        if nfl_team is not None:
+            teams = [nfl_team] if isinstance(nfl_team, str) else list(nfl_team)
+            mask &= np.isin(self.nfl_teams, [team.upper() for team in teams])
+        if breakout is not None:
+            mask &= self.breakout == int(breakout)
+        return mask
 
-    # Apply mode filter
-    if mode == "rookies":
-        df = df[df["Rookie"] == 1]
-    elif mode == "vets":
-        df = df[df["Rookie"] == 0]
+    def top_rows(self, top_n=100, pos=None, mode="all", min_age=None, max_age=None, nfl_team=None, breakout=None):
+        """Positions in self.players of the query's players, best first; see query."""
+        mask = self.filter_mask(min_age, max_age, nfl_team, breakout)
+        runs = [
+            rows[mask[rows]][:top_n]
+            for (position, rookie), rows in self.indexes.items()
+            if (pos is None or position == pos.upper()) and rookie in MODES[mode]
+        ]
+        return list(islice(heapq.merge(*runs), top_n))
 
-    # Apply position filter
-    if pos:
-        df = df[df["Position"] == pos.upper()]
+    def query(self, top_n=100, pos=None, mode="all", min_age=None, max_age=None, nfl_team=None, breakout=None):
+        """
+        Top unrostered players, best first.
 
-    # Rank and trim# Define custom tier order
-    tier_order = {"A": 0, "B": 1, "C": 2, "Flex": 3, "Bench": 4}
+        Args:
+            top_n (int): number of players to return
+            pos (str or None): position (e.g., 'QB', 'WR'), or None for all
+            mode (str): 'all', 'rookies', or 'vets'
+            min_age / max_age (number or None): inclusive age range
+            nfl_team (str, list or None): NFL team code(s), e.g. 'KC'
+            breakout (bool or None): only (non-)breakout candidates
+        """
+        top = self.top_rows(top_n, pos, mode, min_age, max_age, nfl_team, breakout)
+        return self.players.iloc[top].drop(columns=HIDDEN_COLUMNS)
 
-    # Add a helper column for sorting
-    df["Tier_Sort"] = df["Tier"].map(tier_order)
+def rank_free_agents(df, top_n=100, pos=None, mode="all", **filters):
+    """Top unrostered players from a projections frame; see FreeAgentIndex.query."""
+    return FreeAgentIndex(df).query(top_n, pos, mode, **filters)
 
-    # Sort by Tier first (ascending = A first), then by Proj_Career (descending)
-    top_df = df.sort_values(["Tier_Sort", "Proj_Career"], ascending=[True, False]).head(top_n)
+def load_free_agent_index(path=PROJECTIONS_PATH):
+    """The index over the saved projections, rebuilt only when the file changes."""
+    return cached_free_agent_index(path, os.path.getmtime(path))
 
-    # Drop unnecessary columns for cleaner display
-    columns_to_drop = ["Tier_Sort", "Sleeper_Player_ID", "Rostered", "Rookie", "Rookie_Year", "Draft_Round", "Overall_Pick"]
-    top_df = top_df.drop(columns=columns_to_drop)
+@lru_cache(maxsize=1)
+def cached_free_agent_index(path, mtime):
+    return FreeAgentIndex(pd.read_csv(path))
 
-    # Save output
+def free_agents_path(pos=None, mode="all"):
     suffix = f"{mode}_{pos.upper() if pos else 'all'}"
-    output_path = os.path.join(project_root, "data", "league_data", f"top_unrostered_{suffix}.csv")
-    top_df.to_csv(output_path, index=False)
-    print(f"✅ Saved {len(top_df)} players to {output_path}")
+    return os.path.join(project_root, "data", "league_data", f"top_unrostered_{suffix}.csv")
+
+def grade_free_agents(top_n=100, pos=None, mode="all", save=False, **filters):
+    """
+    Grades unrostered players by projected value. Projections are loaded
+    once per process, so repeated queries only rank; save=True also writes
+    the top_unrostered_<mode>_<pos>.csv file. Extra keyword filters are those
+    of FreeAgentIndex.query (min_age, max_age, nfl_team, breakout).
+    """
+    top_df = load_free_agent_index().query(top_n, pos, mode, **filters)
+
+    # Save output
+    if save:
+        output_path = free_agents_path(pos, mode)
+        top_df.to_csv(output_path, index=False)
+        print(f"✅ Saved {len(top_df)} players to {output_path}")
 
     return top_df
 
-# Example usage
 if __name__ == "__main__":
-    grade_free_agents(top_n=50, pos="WR", mode="rookies")  # Top 50 rookie WRs
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rank unrostered players by projected value")
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--pos", help="QB, RB, WR or TE (default: all)")
+    parser.add_argument("--mode", choices=list(MODES), default="all")
+    parser.add_argument("--min-age", type=float)
+    parser.add_argument("--max-age", type=float)
+    parser.add_argument("--team", nargs="+", help="NFL team code(s)")
+    parser.add_argument("--breakout", action="store_true", help="only breakout candidates")
+    parser.add_argument("--save", action="store_true", help="also write top_unrostered_<mode>_<pos>.csv")
+    args = parser.parse_args()
+
+    top_df = grade_free_agents(
+        args.top, args.pos, args.mode, save=args.save, min_age=args.min_age, max_age=args.max_age,
+        nfl_team=args.team, breakout=True if args.breakout else None
+    )
+    print(top_df.to_string(index=False))
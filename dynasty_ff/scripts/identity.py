@@ -0,0 +1,387 @@
+import os
+from collections import Counter
+import numpy as np
+import pandas as pd
+from data_store import read_dataset
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(project_root, "data", "historical_stats")
+LEAGUE_PATH = os.path.join(project_root, "data", "league_data")
+IDENTITY_INDEX_PATH = os.path.join(project_root, "data", "cache", "player_identity.csv")
+IDENTITY_OVERRIDES_PATH = os.path.join(LEAGUE_PATH, "identity_overrides.csv")
+UNMATCHED_PATH = os.path.join(LEAGUE_PATH, "unmatched_players.csv")
+
+# Only fantasy positions are resolved; each one is its own blocking key
+IDENTITY_POSITIONS = ["QB", "RB", "WR", "TE"]
+
+# Sleeper snapshot fields matching reads; a change to one re-matches the player
+MATCH_FIELDS = ["Full_Name", "Position", "Birth_Date", "rookie_year"]
+
+# Name suffixes sources disagree on: generational ones ("Marvin Harrison Jr." vs
+# "Marvin Harrison") and PFR's Hall of Fame marker
+NAME_SUFFIXES = ["jr", "sr", "ii", "iii", "iv", "v", "hof"]
+
+# Fuzzy matching: character n-gram size, candidates scored per name and the Dice
+# score candidates need. A fuzzy match must keep the first initial and either be
+# nearly the same name (CLOSE_SIMILARITY: typos, stray suffixes) or have the same
+# surname and a shortened first name ("Josh"/"Joshua", "Kenny"/"Kenneth", sharing
+# NICKNAME_PREFIX letters), so other players with the surname don't match.
+NGRAM = 3
+MAX_CANDIDATES = 5
+MIN_SIMILARITY = 0.5
+CLOSE_SIMILARITY = 0.8
+NICKNAME_PREFIX = 4
+
+# Largest gaps still treated as the same player: PFR ages are taken late in the
+# season, so Year - Age is within a year of the birth year; Sleeper's rookie
+# year is the draft year
+BIRTH_YEAR_TOLERANCE = 1
+DRAFT_YEAR_TOLERANCE = 0
+
+INDEX_KEY = ["Source", "Source_Name", "Position", "Season"]
+INDEX_COLUMNS = INDEX_KEY + ["Player_ID", "Match", "Score"]
+
+# Matches that resolved a record; anything else is reported as unmatched
+RESOLVED_MATCHES = ["exact", "fuzzy", "override"]
+
+
+def canonical_names(names):
+    """
+    Accent-, case- and punctuation-insensitive names without generational
+    suffixes: "D.J. Moore" -> "dj moore", "Amon-Ra St. Brown" -> "amon ra st
+    brown", "Odell Beckham Jr." -> "odell beckham".
+    """
+    names = pd.Series(names, dtype=object).fillna("").astype(str)
+    names = names.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.lower()
+    names = names.str.replace(r"[.']", "", regex=True).str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+    suffixes = "|".join(NAME_SUFFIXES)
+    return names.str.replace(rf"(?:\s+(?:{suffixes}))+$", "", regex=True)
+
+
+def name_ngrams(name):
+    padded = f" {name} "
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+def similar_names(name, match, score):
+    if score < MIN_SIMILARITY or name[:1] != match[:1]:
+        return False
+    if score >= CLOSE_SIMILARITY:
+        return True
+    parts, match_parts = name.split(), match.split()
+    if len(parts) < 2 or len(match_parts) < 2 or parts[-1] != match_parts[-1]:
+        return False
+    first, match_first = sorted([parts[0], match_parts[0]], key=len)
+    return match_first.startswith(first) or len(os.path.commonprefix([first, match_first])) >= NICKNAME_PREFIX
+
+
+class NgramIndex:
+    """
+    Inverted index from character n-grams to the names containing them. A
+    lookup only scores names sharing an n-gram with the query, so matching
+    a block costs about its size rather than the product of both sides.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.grams = [name_ngrams(name) for name in self.names]
+        self.postings = {}
+        for i, grams in enumerate(self.grams):
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def candidates(self, name, limit=MAX_CANDIDATES):
+        """Up to `limit` (indexed name, Dice similarity) pairs, most shared n-grams first."""
+        grams = name_ngrams(name)
+        shared = Counter(i for gram in grams for i in self.postings.get(gram, ()))
+        return [
+            (self.names[i], 2 * count / (len(grams) + len(self.grams[i])))
+            for i, count in shared.most_common(limit)
+        ]
+
+
+def id_strings(ids):
+    """Player IDs as strings (CSV round trips read Sleeper's numeric IDs as numbers)."""
+    ids = pd.Series(ids)
+    if pd.api.types.is_numeric_dtype(ids):
+        ids = ids.astype("Int64")
+    return ids.astype("string").astype(object).where(ids.notna(), None)
+
+
+def canonical_players(universe):
+    """Canonical side of the index: Sleeper players at the identity positions."""
+    players = universe[universe["Position"].isin(IDENTITY_POSITIONS) & universe["Full_Name"].notna()]
+    birth = pd.to_datetime(players["Birth_Date"], errors="coerce")
+    rookie_year = pd.to_numeric(players["rookie_year"], errors="coerce")
+    return pd.DataFrame({
+        "Player_ID": id_strings(players["Sleeper_Player_ID"]).to_numpy(),
+        "Position": players["Position"].to_numpy(dtype=object),
+        "Canonical": canonical_names(players["Full_Name"]).to_numpy(dtype=object),
+        "Player_Birth_Year": birth.dt.year.to_numpy(dtype=float),
+        "Rookie_Year": rookie_year.where(rookie_year > 0).to_numpy(dtype=float),
+    })
+
+
+def source_frame(source, names, positions, seasons=None, birth_years=None, draft_years=None):
+    n = len(names)
+
+    def floats(values):
+        return np.full(n, np.nan) if values is None else pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+
+    return pd.DataFrame({
+        "Source": source,
+        "Source_Name": pd.Series(names).to_numpy(dtype=object),
+        "Position": pd.Series(positions).to_numpy(dtype=object),
+        "Season": floats(seasons),
+        "Birth_Year": floats(birth_years),
+        "Draft_Year": floats(draft_years),
+    })
+
+
+def pfr_records(fantasy_df=None):
+    """One record per PFR player-season; Year - Age dates the player."""
+    if fantasy_df is None:
+        fantasy_df = read_dataset("fantasy_scores", columns=["Player", "FantPos", "Year", "Age"])
+    df = fantasy_df.dropna(subset=["Player"])
+    return source_frame("pfr", df["Player"], df["FantPos"], df["Year"], birth_years=df["Year"] - df["Age"])
+
+
+def draft_records(path=os.path.join(HISTORY_PATH, "rookie_draft_data.csv")):
+    df = pd.read_csv(path).dropna(subset=["Full_Name"])
+    return source_frame("draft", df["Full_Name"], df["Position"], df["Draft_Year"], draft_years=df["Draft_Year"])
+
+
+def combine_records(path=os.path.join(HISTORY_PATH, "combine_results.csv")):
+    df = pd.read_csv(path).dropna(subset=["Full_Name"])
+    return source_frame("combine", df["Full_Name"], df["Position"], df["Draft_Year"], draft_years=df["Draft_Year"])
+
+
+def ktc_records(path=os.path.join(LEAGUE_PATH, "KTC_Player_Rankings.csv")):
+    df = pd.read_csv(path).dropna(subset=["Player"])
+    return source_frame("ktc", df["Player"], df["Position"])
+
+
+SOURCES = {
+    "pfr": pfr_records,
+    "draft": draft_records,
+    "combine": combine_records,
+    "ktc": ktc_records,
+}
+
+# Files the non-PFR sources read (the PFR records come from the fantasy_scores dataset)
+SOURCE_FILES = [
+    os.path.join(HISTORY_PATH, "rookie_draft_data.csv"),
+    os.path.join(HISTORY_PATH, "combine_results.csv"),
+    os.path.join(LEAGUE_PATH, "KTC_Player_Rankings.csv"),
+]
+
+
+def load_source_records(fantasy_df=None):
+    """
+    Distinct records of every source that exists on disk, at the identity
+    positions. PFR seasons come from `fantasy_df` when given.
+    """
+    loaders = dict(SOURCES, pfr=lambda: pfr_records(fantasy_df))
+    frames = []
+    for name, load in loaders.items():
+        try:
+            frames.append(load())
+        except FileNotFoundError:
+            print(f"⚠️ Identity source {name} not found; skipping")
+    records = pd.concat(frames, ignore_index=True)
+    records = records[records["Position"].isin(IDENTITY_POSITIONS)]
+    return records.drop_duplicates(INDEX_KEY, ignore_index=True)
+
+
+def candidate_pairs(records, players):
+    """
+    (record, player, Score, Match) candidates. Records are blocked by
+    position; names with an exact canonical match in their block take it,
+    the rest retrieve fuzzy candidates from the block's n-gram index. Work
+    is done once per distinct name, not per record.
+    """
+    records = records.assign(Record=np.arange(len(records)), Canonical=canonical_names(records["Source_Name"]).to_numpy())
+    players = players.assign(Player=np.arange(len(players)))
+
+    exact = records.merge(players, on=["Position", "Canonical"])[["Record", "Player"]].assign(Score=1.0, Match="exact")
+    pending = records[~records["Record"].isin(exact["Record"]) & (records["Canonical"] != "")]
+
+    fuzzy = []
+    for pos, block in pending.groupby("Position"):
+        block_players = players[players["Position"] == pos]
+        index = NgramIndex(block_players["Canonical"].unique())
+        for name in block["Canonical"].unique():
+            fuzzy += [
+                (pos, name, match, score) for match, score in index.candidates(name)
+                if similar_names(name, match, score)
+            ]
+
+    fuzzy = pd.DataFrame(fuzzy, columns=["Position", "Canonical", "Match_Name", "Score"])
+    fuzzy = (
+        pending[["Record", "Position", "Canonical"]]
+        .merge(fuzzy, on=["Position", "Canonical"])
+        .merge(players[["Player", "Position", "Canonical"]].rename(columns={"Canonical": "Match_Name"}), on=["Position", "Match_Name"])
+    )
+    fuzzy = fuzzy[["Record", "Player", "Score"]].assign(Match="fuzzy")
+    return pd.concat([exact, fuzzy], ignore_index=True).astype({"Score": float})
+
+
+def era_gaps(records, players, pairs):
+    """
+    (birth-year gap, draft-year gap) between each record and its candidate:
+    PFR seasons are dated by birth year, draft/combine entries by draft year
+    against Sleeper's rookie year. NaN where a side cannot be dated.
+    """
+    rec = records.iloc[pairs["Record"].to_numpy()]
+    pl = players.iloc[pairs["Player"].to_numpy()]
+    birth_gap = np.abs(rec["Birth_Year"].to_numpy() - pl["Player_Birth_Year"].to_numpy())
+    draft_gap = np.abs(rec["Draft_Year"].to_numpy() - pl["Rookie_Year"].to_numpy())
+    return birth_gap, draft_gap
+
+
+def resolve_records(records, players):
+    """
+    Player_ID, Match and Score for every record. Candidates from another era
+    are dropped; the best score wins, then the closest era. A tie on both
+    (two same-named players nothing tells apart) is left "ambiguous" rather
+    than guessed, and records without a candidate are "unmatched".
+    """
+    records = records.reset_index(drop=True)
+    pairs = candidate_pairs(records, players)
+    birth_gap, draft_gap = era_gaps(records, players, pairs)
+    pairs["Gap"] = np.fmin(birth_gap, draft_gap)
+    pairs = pairs[~((birth_gap > BIRTH_YEAR_TOLERANCE) | (draft_gap > DRAFT_YEAR_TOLERANCE))]
+    pairs = pairs.sort_values(["Record", "Score", "Gap"], ascending=[True, False, True], na_position="last", kind="stable")
+
+    best = pairs.drop_duplicates("Record")
+    runner_up = pairs[pairs.duplicated("Record")].drop_duplicates("Record").set_index("Record")
+    tie_score = runner_up["Score"].reindex(best["Record"]).to_numpy()
+    tie_gap = runner_up["Gap"].reindex(best["Record"]).to_numpy()
+    gap = best["Gap"].to_numpy()
+    tied = (tie_score == best["Score"].to_numpy()) & ((tie_gap == gap) | (np.isnan(tie_gap) & np.isnan(gap)))
+
+    resolved = records[INDEX_KEY].assign(Player_ID=None, Match="unmatched", Score=np.nan)
+    rows = best["Record"].to_numpy()
+    resolved.loc[rows, "Player_ID"] = np.where(tied, None, players["Player_ID"].to_numpy()[best["Player"].to_numpy()])
+    resolved.loc[rows, "Match"] = np.where(tied, "ambiguous", best["Match"].to_numpy())
+    resolved.loc[rows, "Score"] = best["Score"].round(3).to_numpy()
+    return resolved
+
+
+def key_index(df):
+    return pd.MultiIndex.from_frame(df[INDEX_KEY].astype({"Season": float}))
+
+
+def apply_overrides(index, path=IDENTITY_OVERRIDES_PATH):
+    """Pins records listed in the overrides file (Source, Source_Name, Position, Player_ID) to their ID."""
+    if path is None or not os.path.exists(path):
+        return index
+    overrides = pd.read_csv(path, dtype={"Player_ID": str}).drop_duplicates(["Source", "Source_Name", "Position"], keep="last")
+    pinned = index[["Source", "Source_Name", "Position"]].merge(overrides, how="left")["Player_ID"].to_numpy(dtype=object)
+    has_override = pd.notna(pinned)
+    index = index.copy()
+    index.loc[has_override, "Player_ID"] = pinned[has_override]
+    index.loc[has_override, "Match"] = "override"
+    index.loc[has_override, "Score"] = np.nan
+    return index
+
+
+def build_identity_index(universe, records=None, previous=None, overrides_path=IDENTITY_OVERRIDES_PATH, changed_ids=()):
+    """
+    Maps every source record (name, position, season) to a canonical player
+    ID, the Sleeper player ID. Resolved records of a `previous` index keep
+    their ID while that player still exists and isn't in `changed_ids`
+    (players whose matching fields changed since the last Sleeper snapshot),
+    so IDs stay stable as new players arrive and only new, unresolved or
+    changed players' records are matched.
+    """
+    if records is None:
+        records = load_source_records()
+    players = canonical_players(universe)
+
+    kept = pd.DataFrame(columns=INDEX_COLUMNS)
+    if previous is not None and len(previous):
+        previous = previous.assign(Player_ID=id_strings(previous["Player_ID"]).to_numpy())
+        kept = previous[
+            previous["Match"].isin(["exact", "fuzzy"])
+            & previous["Player_ID"].isin(players["Player_ID"])
+            & ~previous["Player_ID"].isin(set(changed_ids))
+            & key_index(previous).isin(key_index(records))
+        ]
+        records = records[~key_index(records).isin(key_index(kept))]
+
+    index = pd.concat([kept[INDEX_COLUMNS], resolve_records(records, players)], ignore_index=True)
+    index = apply_overrides(index, overrides_path)
+    return index.sort_values(INDEX_KEY, kind="stable", ignore_index=True)
+
+
+def load_identity_index(path=IDENTITY_INDEX_PATH):
+    """The saved index, or None before one has been built."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, dtype={"Player_ID": str})
+
+
+def save_identity_index(index, path=IDENTITY_INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index.to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+def unmatched_records(index):
+    return index[~index["Match"].isin(RESOLVED_MATCHES)]
+
+
+def report_unmatched(index, path=UNMATCHED_PATH):
+    """Prints resolution counts per source and writes the unresolved records to `path`."""
+    summary = pd.crosstab(index["Source"], index["Match"])
+    print(summary.to_string())
+    unmatched = unmatched_records(index)
+    unmatched.to_csv(path, index=False)
+    print(f"⚠️ {len(unmatched)} unresolved records saved to {path}")
+
+
+def resolved_ids(index, source, names, positions, seasons=None):
+    """
+    Canonical ID of each (name, position[, season]) record of `source`
+    (None where unresolved), aligned to the given arrays. Without `seasons`
+    a name resolves only when all its records agree on one player.
+    """
+    rows = index[(index["Source"] == source) & index["Match"].isin(RESOLVED_MATCHES)]
+    rows = rows.assign(Player_ID=id_strings(rows["Player_ID"]).to_numpy())
+    names = pd.Series(names).to_numpy(dtype=object)
+    positions = pd.Series(positions).to_numpy(dtype=object)
+    if seasons is None:
+        ids = rows.groupby(["Source_Name", "Position"])["Player_ID"].agg(lambda ids: ids.iloc[0] if ids.nunique() == 1 else None)
+        query = pd.MultiIndex.from_arrays([names, positions])
+    else:
+        ids = rows.set_index(["Source_Name", "Position", rows["Season"].astype(float)])["Player_ID"]
+        ids = ids[~ids.index.duplicated()]
+        query = pd.MultiIndex.from_arrays([names, positions, pd.to_numeric(pd.Series(seasons), errors="coerce").to_numpy(dtype=float)])
+    ids = ids.reindex(query).to_numpy(dtype=object)
+    return np.where(pd.notna(ids), ids, None)
+
+
+def source_player_ids(index, source):
+    """Canonical IDs that at least one record of `source` resolved to."""
+    rows = index[(index["Source"] == source) & index["Match"].isin(RESOLVED_MATCHES)]
+    return set(id_strings(rows["Player_ID"]).dropna())
+
+
+def refresh_identity_index(universe=None, path=IDENTITY_INDEX_PATH):
+    """Rebuilds the saved index on top of the previous one and reports what is still unmatched."""
+    from sleeper_players import changed_player_ids, load_player_universe
+
+    if universe is None:
+        universe = load_player_universe()
+    index = build_identity_index(
+        universe, previous=load_identity_index(path), changed_ids=changed_player_ids(("changed",), MATCH_FIELDS)
+    )
+    save_identity_index(index, path)
+    print(f"✅ Saved player identity index ({len(index)} records) to {path}")
+    report_unmatched(index)
+    return index
+
+
+if __name__ == "__main__":
+    refresh_identity_index()
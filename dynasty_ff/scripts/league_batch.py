@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from build_projections import project_player_pool
+from calculate_fantasy_points import score_rule_sets, weights_key
+from data_store import read_dataset
+from enrich_player_pool import build_enriched_pool, sleeper_player_frame
+from generate_aging_curves import fit_aging_curves
+from generate_breakout_curves import compute_breakout_curves
+from grade_free_agents import rank_free_agents
+from identity import load_identity_index
+from lookups import build_lookups
+from parse_scoring import load_scoring_rules
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEAGUES_PATH = os.path.join(project_root, "data", "leagues")
+SCORING_PATH = os.path.join(LEAGUES_PATH, "scoring")
+
+
+def league_dir(league_id):
+    return os.path.join(LEAGUES_PATH, str(league_id))
+
+
+def fetch_league_files(league_ids, max_concurrency=8):
+    """
+    Pulls rosters, settings, traded picks and transactions for every league
+    concurrently and writes them to data/leagues/<id>/.
+    """
+    from sleeper_client import fetch_leagues
+    from sleeper_import import save_league_files
+
+    leagues = fetch_leagues(league_ids, max_concurrency=max_concurrency)
+    for league_id, league in leagues.items():
+        save_league_files(league, league_dir(league_id))
+
+
+def build_scoring_groups(league_ids, history_df):
+    """
+    Scores the shared fantasy history for every distinct scoring rule set in
+    one batch and fits aging/breakout curves once per rule set.
+    Returns ({key: frames}, {league_id: key}).
+    """
+    rule_sets, league_keys = {}, {}
+    for league_id in league_ids:
+        weights = load_scoring_rules(os.path.join(league_dir(league_id), "scoring_raw.json"))
+        key = weights_key(weights)
+        league_keys[league_id] = key
+        rule_sets.setdefault(key, weights)
+
+    groups = {}
+    scored = score_rule_sets(history_df, list(rule_sets.values()))
+    for (key, weights), fantasy_df in zip(rule_sets.items(), scored):
+        groups[key] = {
+            "fantasy_scores": fantasy_df,
+            "aging_curves": fit_aging_curves(fantasy_df),
+            "breakout_curves": compute_breakout_curves(fantasy_df),
+        }
+
+        out_path = os.path.join(SCORING_PATH, key)
+        os.makedirs(out_path, exist_ok=True)
+        with open(os.path.join(out_path, "weights.json"), "w") as f:
+            json.dump(weights, f, indent=2, sort_keys=True)
+        for name, df in groups[key].items():
+            df.to_csv(os.path.join(out_path, f"{name}.csv"), index=False)
+        print(f"✅ Scored history and fitted curves for scoring set {key}")
+    return groups, league_keys
+
+
+# Per-worker copies of the league-independent inputs, set once by init_worker
+_shared = {}
+_lookups = {}
+
+
+def init_worker(shared):
+    _shared.update(shared)
+
+
+def group_lookups(key):
+    if key not in _lookups:
+        frames = _shared["groups"][key]
+        _lookups[key] = build_lookups(
+            frames["fantasy_scores"], _shared["rookie_df"], frames["aging_curves"], _shared["identity"]
+        )
+    return _lookups[key]
+
+
+def run_league(league_id, key):
+    """Roster join, projections and free-agent grades for one league."""
+    out_path = league_dir(league_id)
+    lookups = group_lookups(key)
+    rosters_df = pd.read_csv(os.path.join(out_path, "rosters.csv"))
+
+    pool_df = build_enriched_pool(
+        rosters_df, _shared["players_df"], lookups["recent_history"], lookups["identity_ids"]["pfr"]
+    )
+    proj_df = project_player_pool(pool_df, _shared["groups"][key]["breakout_curves"], lookups)
+    top_df = rank_free_agents(proj_df, top_n=50, mode="vets")
+
+    pool_df.to_csv(os.path.join(out_path, "player_pool_enriched.csv"), index=False)
+    proj_df.to_csv(os.path.join(out_path, "dynasty_projections.csv"), index=False)
+    top_df.to_csv(os.path.join(out_path, "top_unrostered_vets_all.csv"), index=False)
+    return league_id, len(proj_df)
+
+
+def run_league_batch(league_ids, fetch=True, max_workers=None, players_df=None):
+    """
+    Projects every league in `league_ids`, writing each league's outputs to
+    data/leagues/<league_id>/. Historical stats, the Sleeper player universe,
+    draft data and the identity index are loaded once; scoring and curves are computed once per
+    distinct scoring rule set; the per-league work fans out over processes.
+    Pass fetch=False to reuse previously downloaded rosters/settings.
+    """
+    league_ids = [str(league_id) for league_id in league_ids]
+    if fetch:
+        fetch_league_files(league_ids)
+
+    history_df = read_dataset("fantasy_history")
+    groups, league_keys = build_scoring_groups(league_ids, history_df)
+
+    rookie_path = os.path.join(project_root, "data", "historical_stats", "rookie_draft_data.csv")
+    shared = {
+        "players_df": players_df if players_df is not None else sleeper_player_frame(),
+        "rookie_df": pd.read_csv(rookie_path) if os.path.exists(rookie_path) else None,
+        "identity": load_identity_index(),
+        "groups": groups,
+    }
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(shared,)) as pool:
+        futures = [pool.submit(run_league, league_id, league_keys[league_id]) for league_id in league_ids]
+        for future in futures:
+            league_id, count = future.result()
+            print(f"✅ League {league_id}: {count} players projected to {league_dir(league_id)}")
@@ -0,0 +1,160 @@
+import os
+from functools import lru_cache
+import pandas as pd
+from data_store import dataset_version, read_dataset
+from identity import IDENTITY_INDEX_PATH, id_strings, load_identity_index, resolved_ids, source_player_ids
+
+HISTORY_COLUMNS = ["Player", "FantPos", "Year", "Fantasy_Pts", "Fantasy_PosRank"]
+
+
+def name_key(name):
+    """Normalized player name used as the join key across sources."""
+    if not isinstance(name, str):
+        return None
+    return name.lower().strip()
+
+
+def name_keys(names):
+    return names.str.lower().str.strip()
+
+
+def join_keys(names, ids):
+    """
+    Join keys for source rows: the canonical player ID where the identity
+    index resolved one (see identity.py), the name key otherwise.
+    """
+    keys = name_keys(pd.Series(names, dtype=object))
+    if ids is None:
+        return keys
+    return keys.where(pd.isna(ids), pd.Series(ids, index=keys.index, dtype=object))
+
+
+def player_keys(player_ids, names, known_ids):
+    """
+    Join keys for Sleeper players: their ID when some row of the source was
+    resolved to it (`known_ids`), the name key otherwise, so players the
+    index could not resolve still join by name.
+    """
+    player_ids = id_strings(player_ids)
+    return join_keys(names, player_ids.where(player_ids.isin(known_ids)).to_numpy(dtype=object))
+
+
+def history_keys(hist, identity):
+    ids = resolved_ids(identity, "pfr", hist["Player"], hist["FantPos"], hist["Year"]) if identity is not None else None
+    return join_keys(hist["Player"], ids).to_numpy(dtype=object)
+
+
+def build_recent_history(fantasy_df, depth=5, identity=None):
+    """
+    Fantasy history keyed by player: one row per (Name_Key, FantPos) holding
+    the most recent `depth` seasons, newest first, as Year_i / Pts_i / Rank_i
+    columns, plus the total number of Seasons on record. With an `identity`
+    index, Name_Key is the canonical player ID for every resolved season.
+    """
+    hist = fantasy_df.loc[
+        fantasy_df["Player"].notna() & fantasy_df["FantPos"].notna(),
+        ["Player", "FantPos", "Year", "Fantasy_Pts", "Fantasy_PosRank"]
+    ].copy()
+    hist["Name_Key"] = history_keys(hist, identity)
+    hist = hist.sort_values(["Name_Key", "FantPos", "Year"], ascending=[True, True, False], kind="mergesort")
+    hist["Season_Idx"] = hist.groupby(["Name_Key", "FantPos"]).cumcount()
+    recent = hist[hist["Season_Idx"] < depth]
+
+    stats = {"Year": "Year", "Fantasy_Pts": "Pts", "Fantasy_PosRank": "Rank"}
+    wide = recent.pivot(index=["Name_Key", "FantPos"], columns="Season_Idx", values=list(stats))
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([list(stats), range(depth)]))
+    wide.columns = [f"{stats[stat]}_{i}" for stat, i in wide.columns]
+    wide["Seasons"] = hist.groupby(["Name_Key", "FantPos"]).size()
+    return wide
+
+
+def build_draft_capital(rookie_df, identity=None):
+    """Join key -> (Draft_Round, Overall_Pick), keeping the first draft entry per key."""
+    drafted = rookie_df.dropna(subset=["Full_Name"]).copy()
+    ids = None
+    if identity is not None:
+        ids = resolved_ids(identity, "draft", drafted["Full_Name"], drafted["Position"], drafted["Draft_Year"])
+    drafted["Name_Key"] = join_keys(drafted["Full_Name"], ids).to_numpy(dtype=object)
+    drafted = drafted.drop_duplicates("Name_Key")
+    return dict(zip(drafted["Name_Key"], zip(drafted["Draft_Round"], drafted["Overall_Pick"])))
+
+
+def build_curve_table(aging_df):
+    """(Position, Tier) -> (a, b, c, max_age) aging-curve coefficients."""
+    curves = aging_df.drop_duplicates(["Position", "Tier"])
+    return {
+        (pos, tier): (a, b, c, int(max_age))
+        for pos, tier, a, b, c, max_age in curves[["Position", "Tier", "a", "b", "c", "max_age"]].itertuples(index=False)
+    }
+
+
+def lookup_rows(table, keys, key_values):
+    """Left-joins `table` (unique on `keys`) onto the given key arrays, preserving their order."""
+    index = pd.MultiIndex.from_arrays(key_values, names=keys)
+    return table.set_index(keys).reindex(index).reset_index(drop=True)
+
+
+def draft_capital_rows(draft_capital, keys):
+    """Draft_Round / Overall_Pick aligned to an array of name keys (NaN when undrafted)."""
+    table = pd.DataFrame.from_dict(draft_capital, orient="index", columns=["Draft_Round", "Overall_Pick"], dtype=float)
+    return table.reindex(keys).reset_index(drop=True)
+
+
+def curve_rows(curves, positions, tiers):
+    """a, b, c, max_age aligned to parallel position/tier arrays (NaN when no curve)."""
+    table = pd.DataFrame(list(curves.values()), columns=["a", "b", "c", "max_age"], dtype=float)
+    table.index = pd.MultiIndex.from_tuples(list(curves.keys()))
+    return table.reindex(pd.MultiIndex.from_arrays([positions, tiers])).reset_index(drop=True)
+
+
+def build_lookups(fantasy_df, rookie_df, aging_df, identity=None):
+    """
+    `identity_ids` holds, per source, the Sleeper IDs the identity index
+    resolved, for building pool-side keys with player_keys; `identity` is
+    the index itself (or None). Without an index (or for unresolved
+    players) everything joins on name keys.
+    """
+    # Draft data, curves and the identity index are produced by later stages and may not exist yet
+    return {
+        "recent_history": build_recent_history(fantasy_df, identity=identity),
+        "draft_capital": build_draft_capital(rookie_df, identity) if rookie_df is not None else {},
+        "curves": build_curve_table(aging_df) if aging_df is not None else {},
+        "identity_ids": {
+            source: source_player_ids(identity, source) if identity is not None else set()
+            for source in ("pfr", "draft", "combine")
+        },
+        "identity": identity,
+    }
+
+
+def lookup_paths():
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return (
+        os.path.join(project_root, "data", "historical_stats", "rookie_draft_data.csv"),
+        os.path.join(project_root, "data", "league_data", "aging_curve_coefficients.csv"),
+        IDENTITY_INDEX_PATH,
+    )
+
+
+def load_lookups():
+    """
+    Builds every shared index once per process. Stages that run in the same
+    session (build_projections, enrich_player_pool, generate_rookie_projections)
+    reuse the same objects instead of re-reading and re-scanning the inputs; the
+    cache is keyed on the inputs' versions so regenerated data is picked up.
+    """
+    return cached_lookups(dataset_version("fantasy_scores"), tuple(
+        (path, os.path.getmtime(path) if os.path.exists(path) else None)
+        for path in lookup_paths()
+    ))
+
+
+@lru_cache(maxsize=1)
+def cached_lookups(fantasy_version, stamped_paths):
+    # Only the history columns the indexes use are read from the fantasy store
+    fantasy_df = read_dataset("fantasy_scores", columns=HISTORY_COLUMNS)
+    (rookie_path, rookie_mtime), (aging_path, aging_mtime), (identity_path, identity_mtime) = stamped_paths
+    rookie_df = pd.read_csv(rookie_path) if rookie_mtime is not None else None
+    aging_df = pd.read_csv(aging_path) if aging_mtime is not None else None
+    identity = load_identity_index(identity_path) if identity_mtime is not None else None
+    return build_lookups(fantasy_df, rookie_df, aging_df, identity)
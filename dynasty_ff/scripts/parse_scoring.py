@@ -1,29 +1,112 @@
 import os
 import json
+import numpy as np
 
-def load_scoring_rules():
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    scoring_path = os.path.join(project_root, "data", "league_data", "scoring_raw.json")
+# Used when a league's scoring_settings omits a key
+DEFAULT_WEIGHTS = {
+    "pass_yd": 0.04,    # 1 pt per 25 yds → 0.04
+    "pass_td": 4,
+    "pass_int": -1,
+    "pass_2pt": 2,
+
+    "rush_yd": 0.1,
+    "rush_td": 6,
+    "rush_2pt": 2,
+
+    "rec": 1,           # full PPR
+    "rec_yd": 0.1,
+    "rec_td": 6,
+    "rec_2pt": 2,
+
+    "fum_lost": -2
+}
+
+# Positions with their own weight column; anything else scores as OTHER
+SCORING_POSITIONS = ["QB", "RB", "WR", "TE", "OTHER"]
+
+# Season-total stat columns scoring can use, in formula order.
+# Passing_Inc is derived (attempts - completions) when the matrix is built;
+# the first-down columns are joined in from the per-position stat tables.
+STAT_COLUMNS = [
+    "Passing_Yds", "Passing_TD", "Passing_Int",
+    "Rushing_Yds", "Rushing_TD",
+    "Receiving_Rec", "Receiving_Yds", "Receiving_TD",
+    "Scoring_2PM", "Scoring_2PP",
+    "Fumbles_FL",
+    "Passing_Cmp", "Passing_Att", "Passing_Inc",
+    "Rushing_Att", "Fumbles_Fmb",
+    "Passing_1D", "Rushing_1D", "Receiving_1D",
+]
+
+# Sleeper scoring key -> [(stat column, positions it applies to or None for all)].
+# PFR only splits two-point conversions into passing (2PP) and other (2PM),
+# so rush_2pt/rec_2pt are told apart by position.
+SLEEPER_STAT_MAP = {
+    "pass_yd": [("Passing_Yds", None)],
+    "pass_td": [("Passing_TD", None)],
+    "pass_int": [("Passing_Int", None)],
+    "pass_cmp": [("Passing_Cmp", None)],
+    "pass_att": [("Passing_Att", None)],
+    "pass_inc": [("Passing_Inc", None)],
+    "pass_2pt": [("Scoring_2PP", None)],
+    "pass_fd": [("Passing_1D", None)],
+
+    "rush_yd": [("Rushing_Yds", None)],
+    "rush_td": [("Rushing_TD", None)],
+    "rush_att": [("Rushing_Att", None)],
+    "rush_fd": [("Rushing_1D", None)],
+    "rush_2pt": [("Scoring_2PM", ("QB", "RB", "OTHER"))],
+
+    "rec": [("Receiving_Rec", None)],
+    "rec_yd": [("Receiving_Yds", None)],
+    "rec_td": [("Receiving_TD", None)],
+    "rec_fd": [("Receiving_1D", None)],
+    "rec_2pt": [("Scoring_2PM", ("WR", "TE"))],
+
+    # Position premiums (e.g. TE premium)
+    "bonus_rec_te": [("Receiving_Rec", ("TE",))],
+    "bonus_rec_rb": [("Receiving_Rec", ("RB",))],
+    "bonus_rec_wr": [("Receiving_Rec", ("WR",))],
+
+    "fum": [("Fumbles_Fmb", None)],
+    "fum_lost": [("Fumbles_FL", None)],
+}
+
+# Offensive keys that need game or play level data (yardage bonuses, 40+ yard
+# scores) and so can't be scored from season totals
+OFFENSE_PREFIXES = ("pass_", "rush_", "rec", "bonus_")
+
+# Offensive fumble keys; fum_rec / fum_rec_td and the like are defensive
+OFFENSE_FUMBLE_KEYS = {"fum", "fum_lost"}
+
+
+def load_scoring_rules(scoring_path=None):
+    if scoring_path is None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        scoring_path = os.path.join(project_root, "data", "league_data", "scoring_raw.json")
 
     with open(scoring_path, "r") as f:
         raw = json.load(f)
 
-    raw_scoring = raw.get("scoring_settings", {})
-
     # Use values as-is — Sleeper already gives them as per-yard or per-event points
-    scoring_weights = {
-        "pass_yd": raw_scoring.get("pass_yd", 0.04),    # 1 pt per 25 yds → 0.04
-        "pass_td": raw_scoring.get("pass_td", 4),
-        "pass_int": raw_scoring.get("pass_int", -1),
+    scoring_weights = dict(DEFAULT_WEIGHTS)
+    scoring_weights.update(raw.get("scoring_settings", {}))
+    return scoring_weights
 
-        "rush_yd": raw_scoring.get("rush_yd", 0.1),
-        "rush_td": raw_scoring.get("rush_td", 6),
 
-        "rec": raw_scoring.get("rec", 1),               # full PPR
-        "rec_yd": raw_scoring.get("rec_yd", 0.1),
-        "rec_td": raw_scoring.get("rec_td", 6),
+def weight_matrix(weights):
+    """(len(STAT_COLUMNS) x len(SCORING_POSITIONS)) points per unit of each stat by position."""
+    matrix = np.zeros((len(STAT_COLUMNS), len(SCORING_POSITIONS)))
+    for key, value in weights.items():
+        for column, positions in SLEEPER_STAT_MAP.get(key, []):
+            pos_idx = [SCORING_POSITIONS.index(pos) for pos in positions] if positions else slice(None)
+            matrix[STAT_COLUMNS.index(column), pos_idx] += value
+    return matrix
 
-        "fum_lost": raw_scoring.get("fum_lost", -2)
-    }
 
-    return scoring_weights
+def unsupported_scoring_keys(weights):
+    """Non-zero offensive scoring keys that season totals can't account for."""
+    return sorted(
+        key for key, value in weights.items()
+        if value and (key.startswith(OFFENSE_PREFIXES) or key in OFFENSE_FUMBLE_KEYS) and key not in SLEEPER_STAT_MAP
+    )
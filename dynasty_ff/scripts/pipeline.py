@@ -0,0 +1,380 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrape"))
+
+import build_projections
+import calculate_fantasy_points
+import enrich_player_pool
+import generate_aging_curves
+import generate_breakout_curves
+import generate_rookie_models
+import grade_free_agents
+import fantasy_table
+import identity
+import parse_scoring
+import tiers
+from data_store import DATASETS, csv_path, read_dataset, write_dataset
+from figures import render_figures
+from lookups import build_lookups, build_recent_history
+from sleeper_players import changed_player_ids, load_player_universe
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEAGUE_PATH = os.path.join(project_root, "data", "league_data")
+HISTORY_PATH = os.path.join(project_root, "data", "historical_stats")
+STATE_PATH = os.path.join(project_root, "data", "cache", "pipeline_state.json")
+
+# Stages that classify tiers re-run when the cutoff table or the tiering code changes
+TIER_FILES = [tiers.TIER_CUTOFFS_PATH]
+
+
+
+class Stage:
+    """
+    One pipeline step: `run(inputs)` receives the DataFrames produced by the
+    stages in `deps` (keyed by stage name) and returns its own DataFrame,
+    which is saved to `output` (a data_store dataset name or a CSV path).
+
+    `files` are on-disk inputs the stage reads itself and `code` the modules
+    whose source determines its result; both are part of its content hash.
+    `figures(df)`, if given, returns figure specs drawn from the stage's
+    result once the whole run is done (see figures.render_figures).
+    Remote stages pull from the network, so they only re-run when asked to,
+    when their output is missing or when their deps or files change; edits
+    to their code alone do not trigger a re-fetch. Optional stages are left
+    out of a default run and only run when named as a target.
+    """
+
+    def __init__(self, name, run, output, deps=(), files=(), code=(), remote=False, figures=None, optional=False):
+        self.name = name
+        self.run = run
+        self.output = output
+        self.deps = list(deps)
+        self.files = list(files)
+        self.code = list(code)
+        self.remote = remote
+        self.figures = figures
+        self.optional = optional
+
+    def output_path(self):
+        return csv_path(self.output) if self.output in DATASETS else self.output
+
+    def save(self, df):
+        if self.output in DATASETS:
+            write_dataset(self.output, df)
+        else:
+            # Written aside and swapped in, so readers (the projection service) never see half a file
+            os.makedirs(os.path.dirname(self.output), exist_ok=True)
+            df.to_csv(self.output + ".tmp", index=False)
+            os.replace(self.output + ".tmp", self.output)
+
+    def load(self):
+        if self.output in DATASETS:
+            return read_dataset(self.output)
+        return pd.read_csv(self.output)
+
+
+def scrape_fantasy_history(inputs):
+    fantasy_table.save_fantasy_history()
+    return read_dataset("fantasy_history")
+
+
+def score_fantasy_history(inputs):
+    return calculate_fantasy_points.score_fantasy_history(inputs["fantasy_history"], parse_scoring.load_scoring_rules())
+
+
+def fit_aging_curves(inputs):
+    return generate_aging_curves.fit_aging_curves(inputs["fantasy_scores"])
+
+
+def fit_aging_bands(inputs):
+    return generate_aging_curves.bootstrap_aging_bands(inputs["fantasy_scores"])
+
+
+def compute_breakout_curves(inputs):
+    return generate_breakout_curves.compute_breakout_curves(inputs["fantasy_scores"])
+
+
+def resolve_identities(inputs):
+    index = identity.build_identity_index(
+        load_player_universe(),
+        identity.load_source_records(inputs["fantasy_scores"]),
+        previous=identity.load_identity_index(),
+        changed_ids=changed_player_ids(("changed",), identity.MATCH_FIELDS)
+    )
+    identity.report_unmatched(index)
+    return index
+
+
+def enrich_pool(inputs):
+    return enrich_player_pool.build_enriched_pool(
+        pd.read_csv(os.path.join(LEAGUE_PATH, "rosters.csv")),
+        enrich_player_pool.sleeper_player_frame(),
+        build_recent_history(inputs["fantasy_scores"], identity=inputs["identity"]),
+        identity.source_player_ids(inputs["identity"], "pfr")
+    )
+
+
+def project_pool(inputs):
+    rookie_path = os.path.join(HISTORY_PATH, "rookie_draft_data.csv")
+    rookie_df = pd.read_csv(rookie_path) if os.path.exists(rookie_path) else None
+    lookups = build_lookups(inputs["fantasy_scores"], rookie_df, inputs["aging_curves"], inputs["identity"])
+    return build_projections.project_player_pool(inputs["player_pool"], inputs["breakout_curves"], lookups)
+
+
+def fit_rookie_curves(inputs):
+    return generate_rookie_models.fit_rookie_models(inputs["projections"])
+
+
+def rank_free_agents(inputs):
+    return grade_free_agents.rank_free_agents(inputs["projections"], top_n=50, mode="vets")
+
+
+STAGES = [
+    Stage("fantasy_history", scrape_fantasy_history, "fantasy_history",
+          code=[fantasy_table], remote=True),
+    Stage("fantasy_scores", score_fantasy_history, "fantasy_scores",
+          deps=["fantasy_history"],
+          files=[os.path.join(LEAGUE_PATH, "scoring_raw.json")]
+          + [csv_path(dataset) for dataset, _, _ in calculate_fantasy_points.FIRST_DOWN_SOURCES],
+          code=[calculate_fantasy_points, parse_scoring]),
+    Stage("aging_curves", fit_aging_curves, os.path.join(LEAGUE_PATH, "aging_curve_coefficients.csv"),
+          deps=["fantasy_scores"], files=TIER_FILES, code=[generate_aging_curves, tiers]),
+    Stage("aging_bands", fit_aging_bands, os.path.join(LEAGUE_PATH, "aging_curve_bands.csv"),
+          deps=["fantasy_scores"], files=TIER_FILES, code=[generate_aging_curves, tiers], optional=True),
+    Stage("breakout_curves", compute_breakout_curves, os.path.join(LEAGUE_PATH, "breakout_probabilities.csv"),
+          deps=["fantasy_scores"], files=TIER_FILES, code=[generate_breakout_curves, tiers],
+          figures=generate_breakout_curves.breakout_curve_figures),
+    Stage("identity", resolve_identities, identity.IDENTITY_INDEX_PATH,
+          deps=["fantasy_scores"], files=identity.SOURCE_FILES + [identity.IDENTITY_OVERRIDES_PATH],
+          code=[identity], remote=True),
+    Stage("player_pool", enrich_pool, os.path.join(LEAGUE_PATH, "player_pool_enriched.csv"),
+          deps=["fantasy_scores", "identity"], files=[os.path.join(LEAGUE_PATH, "rosters.csv")],
+          code=[enrich_player_pool], remote=True),
+    Stage("projections", project_pool, os.path.join(LEAGUE_PATH, "dynasty_projections.csv"),
+          deps=["player_pool", "breakout_curves", "aging_curves", "fantasy_scores", "identity"],
+          files=[os.path.join(HISTORY_PATH, "rookie_draft_data.csv")] + TIER_FILES, code=[build_projections, tiers]),
+    Stage("rookie_models", fit_rookie_curves, os.path.join(LEAGUE_PATH, "dynasty_projections_adjusted.csv"),
+          deps=["projections"], code=[generate_rookie_models],
+          figures=generate_rookie_models.rookie_curve_figures),
+    Stage("free_agents", rank_free_agents, grade_free_agents.free_agents_path(mode="vets"),
+          deps=["projections"], code=[grade_free_agents]),
+]
+
+
+def file_hash(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_hash(df):
+    digest = hashlib.sha256("|".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def stage_key(stage, dep_hashes):
+    """Content hash of everything a stage's result depends on."""
+    digest = hashlib.sha256(stage.name.encode("utf-8"))
+    for dep in stage.deps:
+        digest.update(f"{dep}={dep_hashes[dep]}".encode("utf-8"))
+    for path in stage.files:
+        digest.update(f"{path}={file_hash(path)}".encode("utf-8"))
+    # A remote stage's code is left out so editing it never forces a network re-fetch
+    for module in ([] if stage.remote else stage.code):
+        digest.update(f"{module.__name__}={file_hash(module.__file__)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def select_stages(targets=None):
+    """
+    The requested stages plus everything upstream of them, in pipeline order;
+    without targets, every stage that isn't optional.
+    """
+    by_name = {stage.name: stage for stage in STAGES}
+    if not targets:
+        return [stage for stage in STAGES if not stage.optional]
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    needed = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(by_name[name].deps)
+    return [stage for stage in STAGES if stage.name in needed]
+
+
+class PipelineRun:
+    """
+    Executes the selected stages as a DAG. A stage starts as soon as its deps
+    are done, so independent stages (e.g. aging and breakout curves) run in
+    parallel. Results are handed to downstream stages in memory; a skipped
+    stage's output is only read back from disk if something downstream runs.
+    Figures of the stages that ran are rendered after the last stage, in
+    separate processes, so no stage waits on matplotlib.
+    """
+
+    def __init__(self, stages, refresh=False, force=False, dry_run=False, max_workers=4, plots=True):
+        self.stages = stages
+        self.refresh = refresh
+        self.force = force
+        self.dry_run = dry_run
+        self.max_workers = max_workers
+        self.plots = plots
+        self.ran = []
+        self.state = load_state()
+        self.frames = {}
+        self.hashes = {}
+        self.lock = threading.Lock()
+
+    def inputs_for(self, stage):
+        inputs = {}
+        for dep in stage.deps:
+            with self.lock:
+                frame = self.frames.get(dep)
+            if frame is None:
+                frame = next(s for s in STAGES if s.name == dep).load()
+                with self.lock:
+                    self.frames[dep] = frame
+            inputs[dep] = frame
+        return inputs
+
+    def needs_run(self, stage, key):
+        record = self.state.get(stage.name)
+        if not os.path.exists(stage.output_path()):
+            return True
+        if stage.remote:
+            # Adopt outputs produced before the runner existed instead of refetching them
+            return self.refresh or (record is not None and record["key"] != key)
+        return self.force or record is None or record["key"] != key
+
+    def execute(self, stage):
+        key = stage_key(stage, self.hashes)
+        if not self.needs_run(stage, key):
+            record = self.state.get(stage.name)
+            if record is not None:
+                return stage, key, record["output"], "skipped"
+            # Adopted output: hash it the same way as a fresh result so downstream keys stay put
+            df = stage.load()
+            with self.lock:
+                self.frames[stage.name] = df
+            return stage, key, frame_hash(df), "skipped"
+        if self.dry_run:
+            return stage, key, key, "would run"
+
+        df = stage.run(self.inputs_for(stage))
+        stage.save(df)
+        with self.lock:
+            self.frames[stage.name] = df
+        return stage, key, frame_hash(df), "ran"
+
+    def run(self):
+        remaining = {stage.name: stage for stage in self.stages}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while remaining or running:
+                for name, stage in list(remaining.items()):
+                    if all(dep in self.hashes for dep in stage.deps):
+                        running[pool.submit(self.execute, stage)] = name
+                        del remaining[name]
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    stage, key, output_hash, status = future.result()
+                    self.hashes[stage.name] = output_hash
+                    # Outputs found on disk without a state record are adopted as-is
+                    adopted = not self.dry_run and stage.name not in self.state
+                    if adopted or status == "ran":
+                        self.state[stage.name] = {"key": key, "output": output_hash}
+                        save_state(self.state)
+                    if status == "ran":
+                        self.ran.append(stage)
+                    icon = {"ran": "✅", "skipped": "⏭️"}.get(status, "🔎")
+                    print(f"{icon} {stage.name}: {status}")
+
+        if self.plots:
+            specs = [spec for stage in self.ran if stage.figures for spec in stage.figures(self.frames[stage.name])]
+            if specs:
+                render_figures(specs)
+        return self.frames
+
+
+def run_pipeline(targets=None, refresh=False, force=False, dry_run=False, max_workers=4, plots=True):
+    """
+    Runs the pipeline (or just `targets` and their upstream stages), skipping
+    stages whose inputs are unchanged since the last run. refresh=True
+    re-pulls remote data (PFR fantasy history, Sleeper players); force=True
+    re-runs every local stage; plots=False skips figure rendering. Returns
+    the DataFrames produced this run.
+    """
+    return PipelineRun(select_stages(targets), refresh, force, dry_run, max_workers, plots).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="dynasty_ff", description="Run the dynasty projection pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_cmd = sub.add_parser("run", help="run stages whose inputs changed")
+    run_cmd.add_argument("stages", nargs="*", help="target stages (default: all but optional ones)")
+    run_cmd.add_argument("--refresh", action="store_true", help="re-pull remote data (PFR, Sleeper)")
+    run_cmd.add_argument("--force", action="store_true", help="re-run stages even if unchanged")
+    run_cmd.add_argument("--dry-run", action="store_true", help="report what would run")
+    run_cmd.add_argument("--workers", type=int, default=4, help="stages to run in parallel")
+    run_cmd.add_argument("--no-plots", action="store_true", help="skip rendering figures (headless runs)")
+    sub.add_parser("list", help="list stages and their dependencies")
+    batch_cmd = sub.add_parser("batch", help="project many Sleeper leagues at once")
+    batch_cmd.add_argument("league_ids", nargs="+", help="Sleeper league IDs")
+    batch_cmd.add_argument("--no-fetch", action="store_true", help="reuse downloaded rosters/settings")
+    batch_cmd.add_argument("--workers", type=int, default=None, help="worker processes")
+    serve_cmd = sub.add_parser("serve", help="serve the projections over local HTTP/JSON")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for stage in STAGES:
+            deps = ", ".join(stage.deps) or "-"
+            remote = " (remote)" if stage.remote else ""
+            optional = " (optional, run by name)" if stage.optional else ""
+            print(f"{stage.name:<16} <- {deps}{remote}{optional}")
+    elif args.command == "run":
+        run_pipeline(args.stages, args.refresh, args.force, args.dry_run, args.workers, plots=not args.no_plots)
+    elif args.command == "batch":
+        from league_batch import run_league_batch
+        run_league_batch(args.league_ids, fetch=not args.no_fetch, max_workers=args.workers)
+    elif args.command == "serve":
+        from projection_service import serve
+        serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+import numpy as np
+import pandas as pd
+from grade_free_agents import HIDDEN_COLUMNS, PROJECTIONS_PATH, FreeAgentIndex, MODES
+from lookups import name_key
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Seconds between checks of the projections file for changes
+RELOAD_INTERVAL = 2.0
+
+# Default and largest number of players a list endpoint returns
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+
+class ProjectionSnapshot:
+    """
+    One immutable load of the projections: JSON-ready records plus indexes
+    from Sleeper ID, name key, fantasy team and position to record positions
+    (each in projection order, best Proj_Career first), and the free-agent
+    index with its players' records in rank order. Every record, and the
+    responses that don't depend on the query (/teams, /teams/<team> at the
+    default limit), are JSON-encoded once here, so requests mostly just
+    join bytes. Requests only ever read a snapshot, so a reload just swaps it.
+    """
+
+    def __init__(self, df, version):
+        df = df.sort_values("Proj_Career", ascending=False, kind="stable").reset_index(drop=True)
+        self.version = version
+        self.loaded_at = time.time()
+        self.records = json_records(df)
+        self.records_json = [encode_json(record) for record in self.records]
+        self.by_id = {str(pid): i for i, pid in enumerate(df["Sleeper_Player_ID"])}
+        self.by_name = group_positions(df["Player"].map(name_key))
+        self.by_team = group_positions(df["Team"])
+        self.by_position = group_positions(df["Position"])
+        self.team_summary = team_summary(df)
+        self.free_agents = FreeAgentIndex(df)
+        self.free_agents_json = [
+            encode_json(record) for record in json_records(self.free_agents.players.drop(columns=HIDDEN_COLUMNS))
+        ]
+        self.teams_json = encode_json(self.team_summary)
+        self.team_json = {name: encode_json(team_breakdown(self, name, DEFAULT_LIMIT)) for name in self.by_team}
+
+    def rows(self, positions):
+        return [self.records[i] for i in positions]
+
+
+def json_records(df):
+    """Rows as dicts of plain Python values, missing values as None."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def encode_json(body):
+    return json.dumps(body).encode("utf-8")
+
+
+def json_list(encoded, positions):
+    """A JSON array of the pre-encoded items at `positions`."""
+    return b"[" + b", ".join(encoded[i] for i in positions) + b"]"
+
+
+def group_positions(keys):
+    """{key: array of row positions in order}; missing keys are left out."""
+    codes, uniques = pd.factorize(keys)
+    present = np.flatnonzero(codes >= 0)
+    order = present[np.argsort(codes[present], kind="stable")]
+    bounds = np.cumsum(np.bincount(codes[present], minlength=len(uniques)))[:-1]
+    return dict(zip(uniques, np.split(order, bounds)))
+
+
+def team_summary(df):
+    """Every fantasy team with its player count and projection totals, best career total first."""
+    totals = df.groupby("Team").agg(
+        players=("Player", "size"), proj_1yr=("Proj_1yr", "sum"), proj_career=("Proj_Career", "sum")
+    )
+    totals = totals.round(1).sort_values("proj_career", ascending=False, kind="stable")
+    return totals.reset_index().rename(columns={"Team": "team"}).to_dict(orient="records")
+
+
+def file_version(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ProjectionStore:
+    """
+    Holds the current snapshot and swaps in a new one when the projections
+    file changes. The replacement is built completely before the swap, so
+    a request sees either the old data or the new, never a mix. A file
+    caught mid-write fails to parse (or changes again while loading) and is
+    simply retried on the next check, keeping the old snapshot meanwhile.
+    """
+
+    def __init__(self, path=PROJECTIONS_PATH, interval=RELOAD_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.snapshot = None
+        self.stopped = threading.Event()
+        self.reload()
+
+    def reload(self):
+        """Loads the file if it changed; returns True when a new snapshot was swapped in."""
+        version = file_version(self.path)
+        if self.snapshot is not None and self.snapshot.version == version:
+            return False
+        try:
+            df = pd.read_csv(self.path)
+            snapshot = ProjectionSnapshot(df, version)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError, KeyError) as e:
+            if self.snapshot is None:
+                raise
+            print(f"⚠️ Keeping previous projections; reload failed: {e}")
+            return False
+        if file_version(self.path) != version:
+            return False
+        self.snapshot = snapshot
+        print(f"🔄 Loaded {len(snapshot.records)} projections from {self.path}")
+        return True
+
+    def watch(self):
+        # Anything a bad file can throw is logged; the thread must outlive it to keep reloading
+        while not self.stopped.wait(self.interval):
+            try:
+                self.reload()
+            except OSError as e:
+                print(f"⚠️ Projections unavailable: {e}")
+            except Exception as e:
+                print(f"⚠️ Keeping previous projections; reload failed: {e!r}")
+
+    def start_watching(self):
+        thread = threading.Thread(target=self.watch, name="projection-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.stopped.set()
+
+
+class BadRequest(Exception):
+    pass
+
+
+def query_int(params, name, default=None, upper=None):
+    if name not in params:
+        return default
+    try:
+        value = int(params[name])
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+    if value < 0:
+        raise BadRequest(f"{name} must not be negative")
+    return min(value, upper) if upper is not None else value
+
+
+def query_float(params, name):
+    if name not in params:
+        return None
+    try:
+        return float(params[name])
+    except ValueError:
+        raise BadRequest(f"{name} must be a number")
+
+
+def query_flag(params, name):
+    if name not in params:
+        return None
+    return params[name].lower() in ("1", "true", "yes")
+
+
+def health(snapshot, params):
+    return {"status": "ok", "players": len(snapshot.records), "loaded_at": snapshot.loaded_at}
+
+
+def player(snapshot, params, player_id):
+    i = snapshot.by_id.get(player_id)
+    if i is None:
+        return None
+    return snapshot.records_json[i]
+
+
+def players(snapshot, params):
+    """Players by name, fantasy team and/or position, best projection first."""
+    limit = query_int(params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+    selections = []
+    if "name" in params:
+        selections.append(snapshot.by_name.get(name_key(params["name"]), np.array([], dtype=int)))
+    if "team" in params:
+        selections.append(snapshot.by_team.get(params["team"], np.array([], dtype=int)))
+    if "position" in params:
+        selections.append(snapshot.by_position.get(params["position"].upper(), np.array([], dtype=int)))
+    if not selections:
+        rows = np.arange(len(snapshot.records))
+    else:
+        rows = selections[0]
+        for other in selections[1:]:
+            rows = rows[np.isin(rows, other)]
+    return json_list(snapshot.records_json, rows[:limit])
+
+
+def teams(snapshot, params):
+    return snapshot.teams_json
+
+
+def team_breakdown(snapshot, team_name, limit):
+    """The team's best `limit` players grouped by position, best projection first."""
+    rows = snapshot.by_team[team_name]
+    breakdown = {}
+    for record in snapshot.rows(rows[:limit]):
+        breakdown.setdefault(record["Position"], []).append(record)
+    return {"team": team_name, "players": len(rows), "positions": breakdown}
+
+
+def team(snapshot, params, team_name):
+    """A fantasy team's players grouped by position; ?limit= caps how many (best first)."""
+    limit = query_int(params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+    if team_name not in snapshot.by_team:
+        return None
+    if limit == DEFAULT_LIMIT:
+        return snapshot.team_json[team_name]
+    return team_breakdown(snapshot, team_name, limit)
+
+
+def free_agents(snapshot, params):
+    """Top unrostered players; same parameters as grade_free_agents."""
+    mode = params.get("mode", "all")
+    if mode not in MODES:
+        raise BadRequest(f"mode must be one of {', '.join(MODES)}")
+    top = snapshot.free_agents.top_rows(
+        query_int(params, "top", DEFAULT_LIMIT, MAX_LIMIT),
+        params.get("pos"),
+        mode,
+        min_age=query_float(params, "min_age"),
+        max_age=query_float(params, "max_age"),
+        nfl_team=params["nfl_team"].split(",") if "nfl_team" in params else None,
+        breakout=query_flag(params, "breakout"),
+    )
+    return json_list(snapshot.free_agents_json, top)
+
+
+# Path -> handler(snapshot, params), returning a JSON-ready value or pre-encoded bytes;
+# handlers in ITEM_ROUTES also get the path's last segment
+ROUTES = {
+    "/health": health,
+    "/players": players,
+    "/teams": teams,
+    "/free-agents": free_agents,
+}
+ITEM_ROUTES = {
+    "/players/": player,
+    "/teams/": team,
+}
+
+
+class ProjectionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, keep-alive clients wait ~40 ms on delayed ACKs
+    disable_nagle_algorithm = True
+    store = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        # Blank values are kept so ?name= matches nobody rather than dropping the filter
+        params = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+        path = url.path.rstrip("/") or "/"
+        snapshot = self.store.snapshot
+        try:
+            if path in ROUTES:
+                body = ROUTES[path](snapshot, params)
+            else:
+                prefix = next((p for p in ITEM_ROUTES if path.startswith(p)), None)
+                if prefix is None:
+                    return self.send_json(404, {"error": f"unknown path {url.path}"})
+                body = ITEM_ROUTES[prefix](snapshot, params, unquote(path[len(prefix):]))
+                if body is None:
+                    return self.send_json(404, {"error": f"{unquote(path[len(prefix):])} not found"})
+        except BadRequest as e:
+            return self.send_json(400, {"error": str(e)})
+        self.send_json(200, body)
+
+    def send_json(self, status, body):
+        payload = body if isinstance(body, bytes) else encode_json(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, path=PROJECTIONS_PATH, interval=RELOAD_INTERVAL):
+    """A threaded server over a hot-reloading ProjectionStore (not yet serving)."""
+    store = ProjectionStore(path, interval)
+    handler = type("Handler", (ProjectionHandler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.store = store
+    store.start_watching()
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, path=PROJECTIONS_PATH, interval=RELOAD_INTERVAL):
+    """
+    Serves the projections as JSON until interrupted:
+    /health, /players/<sleeper_id>, /players?name=&team=&position=&limit=,
+    /teams, /teams/<team>?limit=, /free-agents?top=&pos=&mode=&min_age=&max_age=&nfl_team=&breakout=
+    """
+    server = make_server(host, port, path, interval)
+    print(f"✅ Serving projections on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.store.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve dynasty projections over local HTTP/JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -1,9 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import os
-from io import StringIO
+from fetcher import PFR_BASE_URL, get_scheduler
+from http_cache import current_season
+from season_store import load_manifest, save_manifest, bootstrap_manifest, years_to_refresh, merge_partitions
+from html_tables import find_table
 
 POSITION_SUFFIX = {
     "QB": "passing",
@@ -12,23 +12,26 @@ POSITION_SUFFIX = {
 }
 
 # Dynamically resolve project root
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 data_dir = os.path.join(project_root, "data", "historical_stats")
 os.makedirs(data_dir, exist_ok=True)
 
-def scrape_position_stats(start_year=2000, end_year=2024, position="QB"):
+def scrape_position_stats(start_year=2000, end_year=2024, position="QB", years=None):
     if position not in POSITION_SUFFIX:
         raise ValueError("Supported positions: QB, RB, WR")
 
     suffix = POSITION_SUFFIX[position]
     all_data = []
 
-    for year in range(start_year, end_year + 1):
-        url = f"https://www.pro-football-reference.com/years/{year}/{suffix}.htm"
-        print(f"Fetching {position} stats for {year}...")
-        res = requests.get(url)
-        soup = BeautifulSoup(res.text, "html.parser")
-        table = soup.find("table")
+    years = list(years) if years is not None else list(range(start_year, end_year + 1))
+    urls = [f"{PFR_BASE_URL}/years/{year}/{suffix}.htm" for year in years]
+    print(f"Fetching {position} stats for {len(years)} seasons...")
+    responses = get_scheduler().fetch_all(urls)
+
+    for year, url, res in zip(years, urls, responses):
+        if res is None:
+            continue
+        table = find_table(res.text)
 
         if table is None:
             print(f"No data found for {year} - skipping.")
@@ -36,7 +39,8 @@ def scrape_position_stats(start_year=2000, end_year=2024, position="QB"):
         else:
             print("Found table at URL: " + url)
         
-        df = pd.read_html(StringIO(str(table)))[0]
+        # Stacked headers are stored as "Rushing Att", "Receiving Yds", ...
+        df = table.to_frame(sep=" ")
 
         # Drop any rows where 'Player' is actually the column header again
         if 'Player' in df.columns:
@@ -47,7 +51,6 @@ def scrape_position_stats(start_year=2000, end_year=2024, position="QB"):
         df["Position"] = position
 
         all_data.append(df)
-        time.sleep(1.5)  # Be respectful to PFR
 
     if not all_data:
         return pd.DataFrame()
@@ -75,5 +78,33 @@ def scrape_all_positions(start_year=2000, end_year=2024):
             print(f"No data for {position} - skipping save.")
 
 
+def update_all_positions(start_year=2000, end_year=None):
+    """
+    Incremental refresh: scrapes only seasons missing from the per-position
+    stores (or still in progress) and merges them in, leaving every other
+    season's rows as they are.
+    """
+    end_year = end_year or current_season()
+    manifest = load_manifest()
+    for position in ["QB", "RB", "WR"]:
+        source = position.lower()
+        filepath = os.path.join(data_dir, f"{source}_2000_2024.csv")
+        bootstrap_manifest(manifest, source, filepath)
+
+        years = years_to_refresh(manifest, source, start_year, end_year)
+        if not years:
+            print(f"{position} stats already up to date.")
+            continue
+
+        df = scrape_position_stats(position=position, years=years)
+        if df.empty:
+            print(f"No data for {position} - skipping save.")
+            continue
+
+        changed = merge_partitions(manifest, source, filepath, df)
+        save_manifest(manifest)
+        print(f"Updated {position} seasons {changed or 'none (unchanged)'} in {filepath}")
+
+
 if __name__ == "__main__":
     scrape_all_positions(start_year=2000, end_year=2024)
@@ -1,83 +1,185 @@
-import pandas as pd
+import json
 import os
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
-from tqdm import tqdm
-from io import StringIO
-
-def scrape_college_stats():
-    combine_csv = "../data/historical_stats/combine_results.csv"
-    out_csv = "../data/historical_stats/college_stats.csv"
-    offensive_positions = ["QB", "RB", "WR", "TE"]
-
-    table_ids = {
-        "QB": ["passing_standard", "rushing_standard"],
-        "RB": ["rushing_standard"],
-        "WR": ["receiving_standard"],
-        "TE": ["receiving_standard"]
-    }
-
-    combine_df = pd.read_csv(combine_csv)
-    combine_df = combine_df[combine_df["Position"].isin(offensive_positions)]
-
-    all_stats = []
-
-    for _, row in tqdm(combine_df.iterrows(), total=len(combine_df), desc="Scraping college stats"):
-        name = row["Full_Name"]
-        position = row["Position"]
-        college_url = row.get("College_Stats_URL")
-
-        if pd.isna(college_url) or not isinstance(college_url, str) or "sports-reference.com" not in college_url:
+import sys
+from concurrent.futures import as_completed
+import pandas as pd
+from fetcher import RETRY_STATUSES, get_scheduler
+from html_tables import find_tables
+from http_cache import current_season
+
+# College player ids and name keys are shared with the feature builders in scripts/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from college_features import attach_player_ids, college_player_id
+from lookups import name_keys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+COMBINE_CSV = os.path.join(project_root, "data", "historical_stats", "combine_results.csv")
+COLLEGE_STATS_CSV = os.path.join(project_root, "data", "historical_stats", "college_stats.csv")
+PLAYER_POOL_CSV = os.path.join(project_root, "data", "league_data", "player_pool_enriched.csv")
+
+# Append-only log of finished pages (one JSON record per line) that crawls resume from
+CHECKPOINT_PATH = os.path.join(project_root, "data", "cache", "college_crawl.jsonl")
+
+OFFENSIVE_POSITIONS = ["QB", "RB", "WR", "TE"]
+
+TABLE_IDS = {
+    "QB": ["passing_standard", "rushing_standard"],
+    "RB": ["rushing_standard"],
+    "WR": ["receiving_standard"],
+    "TE": ["receiving_standard"]
+}
+
+# Draft classes crawled even if none of their players are in the pool yet
+RECENT_CLASSES = 3
+
+def parse_college_page(html, name, position, college_url):
+    """Season rows from a player's college stats page, or None if it has none of the position's tables."""
+    # One pass over the page finds every table, including ones shipped inside comments
+    found = find_tables(html, TABLE_IDS.get(position, []))
+    tables = []
+
+    for tid in TABLE_IDS.get(position, []):
+        table = found.get(tid)
+        if not table:
             continue
 
-        try:
-            response = requests.get(college_url)
-            if response.status_code != 200:
-                print(f"Failed for {name}: {response.status_code}")
+        # Multi-level headers flatten to "Rushing_Att"; ungrouped columns keep their own name
+        df = table.to_frame(sep="_")
+
+        # Clean rows: remove internal headers and career totals
+        df = df[df[df.columns[0]] != df.columns[0]]
+        df = df[df["Season"].notna() & (df["Season"] != "Career")]
+
+        df["Full_Name"] = name
+        df["Position"] = position
+        df["College_Stats_URL"] = college_url
+        tables.append(df)
+
+    if not tables:
+        return None
+    combined = pd.concat(tables, axis=1)
+    return combined.loc[:, ~combined.columns.duplicated()]
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    """{college player id: record} for every page already crawled; a line torn by a crash is ignored."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
                 continue
+            done[record["key"]] = record
+    return done
+
+def crawl_targets(combine_df, college_df, pool_df, done, recent_classes=RECENT_CLASSES, all_players=False):
+    """
+    Combine rows to crawl, one per college stats page: players from the last
+    `recent_classes` drafts plus pool players with no college stats yet
+    (every offensive player with all_players=True), minus pages that are
+    already in college_stats.csv or the checkpoint.
+    """
+    df = combine_df[combine_df["Position"].isin(OFFENSIVE_POSITIONS)]
+    df = df[df["College_Stats_URL"].fillna("").str.contains("sports-reference.com", regex=False)]
+    df = df.assign(Key=df["College_Stats_URL"].map(college_player_id))
+
+    stored = set()
+    if not college_df.empty:
+        stored = set(attach_player_ids(college_df, combine_df)["College_Player_ID"].dropna())
+
+    if not all_players:
+        recent = df["Draft_Year"] > current_season() - recent_classes
+        in_pool = name_keys(df["Full_Name"]).isin(set(name_keys(pool_df["Full_Name"].dropna())))
+        df = df[recent | in_pool]
+    df = df[~df["Key"].isin(stored) & ~df["Key"].isin(set(done))]
+
+    # A page listed under several combine rows is crawled once, for the latest class
+    return df.sort_values("Draft_Year", kind="stable").drop_duplicates("Key", keep="last")
+
+def merge_college_stats(college_df, combine_df, done):
+    """college_stats.csv rows with every checkpointed player's seasons swapped in."""
+    rows = [row for record in done.values() for row in record["rows"]]
+    if not rows:
+        return college_df
+    if college_df.empty:
+        return pd.DataFrame(rows)
+
+    existing = attach_player_ids(college_df, combine_df)
+    existing = existing[~existing["College_Player_ID"].isin(set(done))].drop(columns="College_Player_ID")
+    return pd.concat([existing, pd.DataFrame(rows)], ignore_index=True)
+
+def scrape_college_stats(recent_classes=RECENT_CLASSES, all_players=False, checkpoint_path=CHECKPOINT_PATH):
+    """
+    Crawls the college stats pages of players relevant to the current pool on
+    the shared fetch scheduler (its workers and the sports-reference rate
+    limit keep the crawl polite), newest draft classes first. Each finished
+    page is appended to the checkpoint straight away, so an interrupted crawl
+    picks up where it stopped; college_stats.csv is rebuilt at the end.
+    """
+    from tqdm import tqdm
+
+    combine_df = pd.read_csv(COMBINE_CSV)
+    college_df = pd.read_csv(COLLEGE_STATS_CSV) if os.path.exists(COLLEGE_STATS_CSV) else pd.DataFrame()
+    pool_df = pd.read_csv(PLAYER_POOL_CSV, usecols=["Full_Name"]) if os.path.exists(PLAYER_POOL_CSV) else pd.DataFrame(columns=["Full_Name"])
+
+    done = load_checkpoint(checkpoint_path)
+    targets = crawl_targets(combine_df, college_df, pool_df, done, recent_classes, all_players)
+    print(f"Crawling {len(targets)} college stats pages ({len(done)} already checkpointed)")
+
+    scheduler = get_scheduler()
+    futures = {
+        scheduler.submit(row.College_Stats_URL, priority=-row.Draft_Year): row
+        for row in targets.itertuples()
+    }
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            tables = []
-
-            for tid in table_ids.get(position, []):
-                table = soup.find("table", {"id": tid})
-                if not table:
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+    try:
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Scraping college stats"):
+                row = futures[future]
+                try:
+                    response = future.result()
+                    if response.status_code != 200:
+                        print(f"Failed for {row.Full_Name}: {response.status_code}")
+                        if response.status_code in RETRY_STATUSES:
+                            continue
+                        df = None  # e.g. a 404: checkpointed as empty so it is not asked for again
+                    else:
+                        df = parse_college_page(response.text, row.Full_Name, row.Position, row.College_Stats_URL)
+                except Exception as e:
+                    # Not checkpointed, so the next run tries this page again
+                    print(f"Error scraping {row.Full_Name}: {e}")
                     continue
 
-                df = pd.read_html(StringIO(str(table)))[0]
-
-                # Handle multi-index headers
-                if isinstance(df.columns, pd.MultiIndex):
-                    df.columns = [
-                        col[1] if "Unnamed" in col[0] else f"{col[0]}_{col[1]}"
-                        for col in df.columns
-                    ]
-                else:
-                    df.columns = df.columns.astype(str)
-
-                # Clean rows: remove internal headers and career totals
-                df = df[df[df.columns[0]] != df.columns[0]]
-                df = df[df["Season"].notna() & (df["Season"] != "Career")]
-
-                df["Full_Name"] = name
-                df["Position"] = position
-                tables.append(df)
-
-            if tables:
-                combined = pd.concat(tables, axis=1)
-                combined = combined.loc[:, ~combined.columns.duplicated()]
-                all_stats.append(combined)
-
-            time.sleep(random.uniform(2.5, 4.5))
-
-        except Exception as e:
-            print(f"Error scraping {name}: {e}")
-
-    if all_stats:
-        final_df = pd.concat(all_stats, ignore_index=True)
-        final_df.to_csv(out_csv, index=False)
-        print(f"Saved college stats to {out_csv}")
-    else:
+                record = {
+                    "key": row.Key,
+                    "url": row.College_Stats_URL,
+                    "status": response.status_code,
+                    "rows": [] if df is None else df.to_dict("records"),
+                }
+                checkpoint.write(json.dumps(record) + "\n")
+                checkpoint.flush()
+                done[row.Key] = record
+    finally:
+        # Interrupted: drop the queued pages; finished ones are already checkpointed
+        for future in futures:
+            future.cancel()
+
+    final_df = merge_college_stats(college_df, combine_df, done)
+    if final_df.empty:
         print("No stats collected.")
+        return
+    final_df.to_csv(COLLEGE_STATS_CSV + ".tmp", index=False)
+    os.replace(COLLEGE_STATS_CSV + ".tmp", COLLEGE_STATS_CSV)
+    print(f"Saved college stats to {COLLEGE_STATS_CSV}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Crawl college stats for players relevant to the current pool")
+    parser.add_argument("--recent-classes", type=int, default=RECENT_CLASSES, help="draft classes to crawl regardless of the pool")
+    parser.add_argument("--all", action="store_true", help="crawl every offensive combine player")
+    args = parser.parse_args()
+    scrape_college_stats(args.recent_classes, args.all)
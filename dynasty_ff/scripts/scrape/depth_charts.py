@@ -1,10 +1,10 @@
-import time
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
+from fetcher import get_scheduler
+from http_cache import get_cache, is_offline, season_ttl, CacheMiss
 
 # Fantasy-relevant positions only
 PRODUCING_POSITIONS = {"QB", "RB", "WR", "TE"}
@@ -17,22 +17,109 @@ NFL_TEAMS = {
     "ATL", "CAR", "NO", "TB", "ARI", "LAR", "SF", "SEA"
 }
 
-def scrape_depth_chart(team_code):
-    url = f"https://www.espn.com/nfl/team/depth/_/name/{team_code.lower()}"
-    
-    # Setup Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--disable-gpu")
+DEPTH_CHART_URL = "https://www.espn.com/nfl/team/depth/_/name/{team}"
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    driver.get(url)
-    time.sleep(2)  # Wait for JS to render
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
+# Position labels sit in the fixed left column, players in the scrolling table
+POSITION_SELECTOR = ".Table--fixed-left tbody tr"
+PLAYER_SELECTOR = ".Table__Scroller table tbody tr"
 
-    position_table = soup.select(".Table--fixed-left tbody tr")
-    player_table = soup.select(".Table__Scroller table tbody tr")
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_PATH = os.path.join(project_root, "data", "league_data", "depth_charts.csv")
+
+
+class BrowserPool:
+    """
+    A few long-lived headless Chrome sessions shared by the scraping threads.
+    Sessions start on first use (chromedriver is resolved once), a page is
+    read as soon as its depth chart table is in the DOM rather than after a
+    fixed sleep, and every session quits on close().
+    """
+
+    def __init__(self, size=2, timeout=15):
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.Queue()
+        self.drivers = []
+        self.started = 0
+        self.driver_path = None
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def new_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        with self.lock:
+            if self.driver_path is None:
+                self.driver_path = ChromeDriverManager().install()
+
+        # Setup Chrome options
+        chrome_options = Options()
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-gpu")
+        return webdriver.Chrome(service=Service(self.driver_path), options=chrome_options)
+
+    def acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.lock:
+            can_start = self.started < self.size
+            if can_start:
+                self.started += 1
+        if not can_start:
+            return self.idle.get()
+        try:
+            driver = self.new_driver()
+        except Exception:
+            with self.lock:
+                self.started -= 1
+            raise
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+    def render(self, url):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver = self.acquire()
+        try:
+            driver.get(url)
+            WebDriverWait(driver, self.timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+                and d.find_elements(By.CSS_SELECTOR, PLAYER_SELECTOR)
+            )
+            return driver.page_source
+        finally:
+            self.idle.put(driver)
+
+    def close(self):
+        with self.lock:
+            drivers, self.drivers = self.drivers, []
+        for driver in drivers:
+            driver.quit()
+
+
+def parse_depth_chart(html, team_code):
+    """Depth chart rows for the fantasy positions, or None if the page has no depth chart table."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    position_table = soup.select(POSITION_SELECTOR)
+    player_table = soup.select(PLAYER_SELECTOR)
+    if not position_table or not player_table:
+        return None
 
     positions = [row.get_text(strip=True) for row in position_table]
     players = [[cell.get_text(strip=True) for cell in row.select("td")] for row in player_table]
@@ -51,18 +138,56 @@ def scrape_depth_chart(team_code):
                     })
     return data
 
-def scrape_all_depth_charts():
+def scrape_depth_chart(team_code, browsers=None, url_template=DEPTH_CHART_URL):
+    url = url_template.format(team=team_code.lower())
+
+    # Pages are cached so reruns within the day skip the network and the browser
+    cache = get_cache()
+    cached = cache.get(url, allow_stale=is_offline())
+    if cached is not None:
+        return parse_depth_chart(cached.text, team_code) or []
+    if is_offline():
+        raise CacheMiss(f"{url} is not cached and offline mode is on")
+
+    # Fast path: the server-rendered page usually has the table already
+    response = get_scheduler().fetch_network(url)
+    html = response.text if response.status_code == 200 else None
+    data = parse_depth_chart(html, team_code) if html else None
+
+    if data is None:
+        if browsers is None:
+            with BrowserPool(size=1) as pool:
+                html = pool.render(url)
+        else:
+            html = browsers.render(url)
+        data = parse_depth_chart(html, team_code)
+
+    # A page without the table (layout change, failed render) is retried next run
+    if data is not None:
+        cache.store_text(url, html, season_ttl(url))
+    return data or []
+
+def scrape_all_depth_charts(max_workers=8, browser_sessions=2, url_template=DEPTH_CHART_URL, out_path=OUTPUT_PATH):
+    """
+    Scrapes every team concurrently. Pages come over plain HTTP when the
+    table is server-rendered; the rest share `browser_sessions` Chrome
+    sessions, which are only started if some page needs one.
+    """
     all_data = []
-    for team in sorted(NFL_TEAMS):
-        print(f"Scraping: {team}")
-        try:
-            team_data = scrape_depth_chart(team)
-            all_data.extend(team_data)
-        except Exception as e:
-            print(f"Failed to scrape {team}: {e}")
+    scraped = 0
+    teams = sorted(NFL_TEAMS)
+    with BrowserPool(size=browser_sessions) as browsers, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(scrape_depth_chart, team, browsers, url_template) for team in teams]
+        for team, future in zip(teams, futures):
+            try:
+                all_data.extend(future.result())
+                scraped += 1
+            except Exception as e:
+                print(f"Failed to scrape {team}: {e}")
+
     df = pd.DataFrame(all_data)
-    df.to_csv("../data/league_data/depth_charts.csv", index=False)
-    print("Saved to depth_charts.csv")
+    df.to_csv(out_path, index=False)
+    print(f"Saved {len(df)} depth chart rows for {scraped}/{len(teams)} teams to {out_path}")
 
 if __name__ == "__main__":
     scrape_all_depth_charts()
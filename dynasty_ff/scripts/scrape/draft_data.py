@@ -1,33 +1,26 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from io import StringIO
+from fetcher import PFR_BASE_URL, get_scheduler
+from html_tables import find_table
 
 def scrape_draft_data():
   start_year = 2000
   end_year = 2025
   all_drafts = []  
 
-  def flatten_columns(df):
-    # Use second-level header if top-level is 'Unnamed'
-    df.columns = [
-        col[1] if "Unnamed" in col[0] else f"{col[0]}_{col[1]}"
-        for col in df.columns.values
-    ]
-    return df
+  years = list(range(start_year, end_year + 1))
+  urls = [f"{PFR_BASE_URL}/years/{year}/draft.htm" for year in years]
+  responses = get_scheduler().fetch_all(urls)
 
   # Parse each year's draft table
-  for year in range(start_year, end_year + 1):
-      url = f"https://www.pro-football-reference.com/years/{year}/draft.htm"
-      res = requests.get(url)
-      soup = BeautifulSoup(res.content, "html.parser")
-      table = soup.find("table", {"id": "drafts"})
+  for year, res in zip(years, responses):
+      if res is None:
+          continue
+      table = find_table(res.text, "drafts")
 
       if not table:
           continue
 
-      df = pd.read_html(StringIO(str(table)))[0]
-      df = flatten_columns(df)
+      df = table.to_frame(sep="_")
       if 'Rnd' in df.columns:
         df = df[df["Rnd"] != "Rnd"]  # Remove repeated headers
       df["Draft_Year"] = year
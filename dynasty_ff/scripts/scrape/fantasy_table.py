@@ -1,35 +1,29 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import os
-from io import StringIO
+from fetcher import PFR_BASE_URL, get_scheduler
+from http_cache import current_season
+from season_store import load_manifest, save_manifest, bootstrap_manifest, years_to_refresh, merge_partitions
+from html_tables import find_table
 
-def flatten_columns(df):
-    # Use second-level header if top-level is 'Unnamed'
-    df.columns = [
-        col[1] if "Unnamed" in col[0] else f"{col[0]}_{col[1]}"
-        for col in df.columns.values
-    ]
-    return df
-
-def scrape_fantasy_table(start_year=2000, end_year=2024):
+def scrape_fantasy_table(start_year=2000, end_year=2024, years=None):
     all_data = []
 
-    for year in range(start_year, end_year + 1):
-        url = f"https://www.pro-football-reference.com/years/{year}/fantasy.htm"
-        print(f"🔄 Fetching fantasy stats for {year}...")
-        res = requests.get(url)
-        soup = BeautifulSoup(res.text, "html.parser")
-        table = soup.find("table")
+    years = list(years) if years is not None else list(range(start_year, end_year + 1))
+    urls = [f"{PFR_BASE_URL}/years/{year}/fantasy.htm" for year in years]
+    print(f"🔄 Fetching fantasy stats for {len(years)} seasons...")
+    responses = get_scheduler().fetch_all(urls)
+
+    for year, res in zip(years, responses):
+        if res is None:
+            continue
+        table = find_table(res.text)
 
         if table is None:
             print(f"❌ Table not found for {year}")
             continue
 
-        # Read multi-level headers
-        df = pd.read_html(StringIO(str(table)), header=[0, 1])[0]
-        df = flatten_columns(df)
+        # Multi-level headers flatten to "Passing_Yds"; ungrouped columns keep their own name
+        df = table.to_frame(sep="_")
 
         # Identify the true Player column
         player_col = next(col for col in df.columns if col.endswith("_Player") or col == "Player")
@@ -46,13 +40,41 @@ def scrape_fantasy_table(start_year=2000, end_year=2024):
         # Add year for context
         df["Year"] = year
         all_data.append(df)
-        time.sleep(1.5)
 
+    if not all_data:
+        # Nothing fetched (offline, or the season's page isn't published yet)
+        return pd.DataFrame(columns=["Player", "Year"])
     return pd.concat(all_data, ignore_index=True)
 
-def save_fantasy_history():
-    df = scrape_fantasy_table()
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+def save_fantasy_history(incremental=True, start_year=2000, end_year=None):
+    """
+    Saves the fantasy history store. By default only seasons missing from the
+    store (or still in progress) are scraped and merged in; pass
+    incremental=False to re-scrape and rewrite the whole range.
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     path = os.path.join(project_root, "data", "historical_stats", "fantasy_history_2000_2024.csv")
-    df.to_csv(path, index=False)
-    print(f"✅ Saved fantasy history to {path}")
+
+    if not incremental:
+        df = scrape_fantasy_table(start_year, end_year or 2024)
+        if df.empty:
+            print("⚠️ No fantasy seasons fetched - keeping the existing history")
+            return
+        df.to_csv(path, index=False)
+        print(f"✅ Saved fantasy history to {path}")
+        return
+
+    manifest = bootstrap_manifest(load_manifest(), "fantasy", path)
+    years = years_to_refresh(manifest, "fantasy", start_year, end_year or current_season())
+    if not years:
+        print("✅ Fantasy history already up to date")
+        return
+
+    df = scrape_fantasy_table(years=years)
+    if df.empty:
+        print(f"⚠️ No fantasy seasons fetched for {years} - keeping the existing history")
+        return
+
+    changed = merge_partitions(manifest, "fantasy", path, df)
+    save_manifest(manifest)
+    print(f"✅ Updated fantasy history seasons {changed or 'none (unchanged)'} in {path}")
@@ -0,0 +1,170 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import fetch_with_cache, get_cache
+
+PFR_BASE_URL = "https://www.pro-football-reference.com"
+
+# (requests per second, burst) per host. Sports-Reference sites block clients
+# that go over ~20 requests a minute, so every scraper shares one budget.
+HOST_RATE_LIMITS = {
+    "www.pro-football-reference.com": (20 / 60, 1),
+    "www.sports-reference.com": (20 / 60, 1),
+}
+DEFAULT_RATE_LIMIT = (2.0, 4)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchScheduler:
+    """
+    Thread-pooled HTTP fetcher shared by the scrapers.
+
+    URLs are queued by priority (lower runs first), served from the shared
+    response cache when possible, otherwise fetched over a pooled keep-alive
+    session, throttled by a token bucket per host, and retried with
+    exponential backoff on 429/5xx responses and connection errors.
+    """
+
+    def __init__(self, max_workers=4, rate_limits=None, max_retries=4, backoff=2.0, timeout=30, cache=True):
+        self.max_workers = max_workers
+        self.rate_limits = dict(HOST_RATE_LIMITS, **(rate_limits or {}))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = get_cache() if cache is True else (cache or None)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.buckets = {}
+        self.queue = []
+        self.counter = itertools.count()
+        self.cond = threading.Condition()
+        self.workers = []
+        self.closed = False
+
+    def bucket_for(self, host):
+        with self.cond:
+            if host not in self.buckets:
+                rate, capacity = self.rate_limits.get(host, DEFAULT_RATE_LIMIT)
+                self.buckets[host] = TokenBucket(rate, capacity)
+            return self.buckets[host]
+
+    def submit(self, url, priority=0):
+        future = Future()
+        with self.cond:
+            if self.closed:
+                raise RuntimeError("FetchScheduler is closed")
+            heapq.heappush(self.queue, (priority, next(self.counter), url, future))
+            if len(self.workers) < self.max_workers:
+                worker = threading.Thread(target=self.work, daemon=True)
+                worker.start()
+                self.workers.append(worker)
+            self.cond.notify()
+        return future
+
+    def fetch_all(self, urls, priority=0):
+        """Fetches every URL and returns responses in input order (None for failures)."""
+        futures = [self.submit(url, priority) for url in urls]
+        responses = []
+        for url, future in zip(urls, futures):
+            try:
+                responses.append(future.result())
+            except requests.RequestException as e:
+                print(f"❌ Failed to fetch {url}: {e}")
+                responses.append(None)
+        return responses
+
+    def work(self):
+        while True:
+            with self.cond:
+                while not self.queue and not self.closed:
+                    self.cond.wait()
+                if not self.queue:
+                    return
+                _, _, url, future = heapq.heappop(self.queue)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.fetch(url))
+            except Exception as e:
+                future.set_exception(e)
+
+    def fetch(self, url):
+        if self.cache is None:
+            return self.fetch_network(url)
+        return fetch_with_cache(self.cache, url, lambda headers: self.fetch_network(url, headers))
+
+    def fetch_network(self, url, headers=None):
+        bucket = self.bucket_for(urlsplit(url).netloc)
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            time.sleep(self.retry_delay(attempt, response.headers.get("Retry-After")))
+
+    def retry_delay(self, attempt, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, 1)
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.session.close()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The process-wide scheduler, so rate limits hold across every scraper."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FetchScheduler()
+        return _scheduler
@@ -0,0 +1,155 @@
+import io
+import pandas as pd
+
+# Body rows PFR/sports-reference insert to repeat the column headers
+HEADER_ROW_CLASSES = {"thead", "over_header"}
+
+
+class HtmlTable:
+    """
+    A table pulled out of a page: `header` has one list of labels per header
+    row, `rows` the text of every body cell and `links` the first href in
+    each body cell (or None). Colspans are expanded in all three.
+    """
+
+    def __init__(self, header, rows, links):
+        self.header = header
+        self.rows = rows
+        self.links = links
+
+    def column_names(self, sep="_"):
+        """
+        One label per column. Stacked header rows are joined with `sep`
+        ("Rushing" over "Att" -> "Rushing_Att"); blank levels are dropped.
+        Repeats get ".1", ".2", ... suffixes as pd.read_html does.
+        """
+        width = max([len(row) for row in self.header + self.rows] or [0])
+        levels = [row + [""] * (width - len(row)) for row in self.header]
+        names, seen = [], {}
+        for i in range(width):
+            name = sep.join(level[i] for level in levels if level[i]) or str(i)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
+
+    def to_frame(self, sep="_"):
+        """DataFrame with numeric columns typed and empty cells as NaN."""
+        columns = self.column_names(sep)
+        width = len(columns)
+        cells = [row + [""] * (width - len(row)) for row in self.rows]
+        return pd.DataFrame({
+            name: typed_column([row[i] for row in cells])
+            for i, name in enumerate(columns)
+        })
+
+
+def typed_column(values):
+    series = pd.Series([v or None for v in values], dtype=object)
+    try:
+        return pd.to_numeric(series.str.replace(",", "", regex=False))
+    except (ValueError, TypeError):
+        return series
+
+
+def expand_cells(tr):
+    texts, links = [], []
+    for cell in tr:
+        if cell.tag not in ("th", "td"):
+            continue
+        link = cell.find(".//a")
+        span = int(cell.get("colspan") or 1)
+        texts += ["".join(cell.itertext()).strip()] * span
+        links += [link.get("href") if link is not None else None] * span
+    return texts, links
+
+
+def read_table(table):
+    header, rows, links = [], [], []
+    for tr in table.iter("tr"):
+        texts, hrefs = expand_cells(tr)
+        section = tr.getparent().tag
+        if section == "thead" or (section != "tbody" and not rows and is_header_row(tr)):
+            header.append(texts)
+        elif not HEADER_ROW_CLASSES.intersection((tr.get("class") or "").split()):
+            rows.append(texts)
+            links.append(hrefs)
+    return HtmlTable(header, rows, links)
+
+
+def is_header_row(tr):
+    cells = [cell for cell in tr if cell.tag in ("th", "td")]
+    return bool(cells) and all(cell.tag == "th" for cell in cells)
+
+
+def find_tables(html, table_ids):
+    """
+    {table_id: HtmlTable} for the ids found in `html` (str or bytes), read in
+    one streaming pass. Tables sports-reference ships inside HTML comments
+    are found too. Elements are freed as soon as they close, so memory stays
+    around one table rather than the whole page tree.
+    """
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    wanted = set(table_ids)
+    found = {}
+    open_tables = 0
+    for event, el in etree.iterparse(page_stream(html), events=("start", "end", "comment"), html=True, encoding=page_encoding(html)):
+        if event == "comment":
+            text = el.text or ""
+            if open_tables == 0 and "<table" in text:
+                for table in lxml_html.fragment_fromstring(text, create_parent="div").iter("table"):
+                    if table.get("id") in wanted and table.get("id") not in found:
+                        found[table.get("id")] = read_table(table)
+        elif el.tag == "table":
+            if event == "start":
+                open_tables += 1
+                continue
+            open_tables -= 1
+            if el.get("id") in wanted and el.get("id") not in found:
+                found[el.get("id")] = read_table(el)
+        elif event == "start" or open_tables:
+            continue
+
+        if len(found) == len(wanted):
+            break
+        if event != "start" and open_tables == 0:
+            free_element(el)
+    return found
+
+
+def free_element(el):
+    # Drop a finished subtree and any finished siblings before it
+    el.clear(keep_tail=True)
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def page_stream(html):
+    return io.BytesIO(html.encode("utf-8") if isinstance(html, str) else html)
+
+
+def page_encoding(html):
+    # Decoded text is re-encoded as UTF-8; raw bytes rely on the page's own charset
+    return "utf-8" if isinstance(html, str) else None
+
+
+def find_table(html, table_id=None):
+    """
+    The HtmlTable with `table_id` (the page's first table when None), or
+    None if the page does not have it.
+    """
+    if table_id is not None:
+        return find_tables(html, [table_id]).get(table_id)
+
+    from lxml import etree
+
+    for _, el in etree.iterparse(page_stream(html), events=("end",), tag="table", html=True, encoding=page_encoding(html)):
+        return read_table(el)
+    return None
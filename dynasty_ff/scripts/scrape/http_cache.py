@@ -0,0 +1,272 @@
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Supersedes notebooks/pfr_cache.sqlite, the old requests-cache store (empty and
+# in requests-cache's own format, so nothing is imported from it)
+CACHE_PATH = os.path.join(project_root, "data", "cache", "http_cache.sqlite")
+
+DAY = 24 * 60 * 60
+
+# TTLs (seconds) for URLs without a season in them, first match wins.
+# Pages tied to a season are handled by season_ttl() instead.
+URL_CLASS_TTLS = [
+    (re.compile(r"sports-reference\.com/cfb/players/"), 30 * DAY),
+    (re.compile(r"espn\.com/nfl/team/depth/"), DAY),
+]
+DEFAULT_TTL = DAY
+
+SEASON_PATTERN = re.compile(r"/(?:years/)?((?:19|20)\d{2})(?:/|-combine)")
+
+
+class CacheMiss(requests.RequestException):
+    """Raised in offline mode when a URL has never been cached."""
+
+
+def current_season(today=None):
+    # The NFL season is named for the year it kicks off in September
+    today = today or date.today()
+    return today.year if today.month >= 9 else today.year - 1
+
+
+def season_ttl(url, today=None):
+    """
+    Seconds until a cached copy of `url` goes stale, or None if it never does.
+    Completed seasons are immutable; the current (or a future) season and
+    season-less pages fall back to their URL class TTL.
+    """
+    match = SEASON_PATTERN.search(url)
+    if match and int(match.group(1)) < current_season(today):
+        return None
+    if match:
+        return DAY
+    for pattern, ttl in URL_CLASS_TTLS:
+        if pattern.search(url):
+            return ttl
+    return DEFAULT_TTL
+
+
+def is_offline():
+    return os.environ.get("DYNASTY_FF_OFFLINE", "").lower() in {"1", "true", "yes"}
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of zlib-compressed response bodies plus the ETag and
+    Last-Modified validators needed to revalidate them.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                body BLOB,
+                encoding TEXT,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                expires_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS expires_idx ON responses(expires_at)")
+        self.conn.commit()
+
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, status, body, encoding, content_type, etag, last_modified, fetched_at, expires_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ["url", "status", "body", "encoding", "content_type", "etag", "last_modified", "fetched_at", "expires_at"]
+        return dict(zip(keys, row))
+
+    def get(self, url, allow_stale=False):
+        """Cached response for `url` as a requests.Response, or None if missing/stale."""
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+        if not allow_stale and entry["expires_at"] is not None and entry["expires_at"] < time.time():
+            return None
+        return self.to_response(entry)
+
+    def store(self, url, response, ttl=None):
+        expires_at = None if ttl is None else time.time() + ttl
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url, response.status_code, zlib.compress(response.content), response.encoding,
+                    response.headers.get("Content-Type"), response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"), time.time(), expires_at
+                )
+            )
+            self.conn.commit()
+
+    def store_text(self, url, text, ttl=None):
+        """Caches a body produced outside requests (e.g. a browser-rendered page)."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = text.encode("utf-8")
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        self.store(url, response, ttl)
+
+    def refresh(self, url, ttl=None):
+        """Marks an entry fresh again after a 304 Not Modified."""
+        expires_at = None if ttl is None else time.time() + ttl
+        with self.lock:
+            self.conn.execute(
+                "UPDATE responses SET fetched_at = ?, expires_at = ? WHERE url = ?",
+                (time.time(), expires_at, url)
+            )
+            self.conn.commit()
+
+    def validators(self, url):
+        entry = self.lookup(url)
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def to_response(self, entry):
+        response = requests.Response()
+        response.url = entry["url"]
+        response.status_code = entry["status"]
+        response._content = zlib.decompress(entry["body"])
+        response.encoding = entry["encoding"]
+        response.headers = CaseInsensitiveDict({
+            k: v for k, v in (
+                ("Content-Type", entry["content_type"]),
+                ("ETag", entry["etag"]),
+                ("Last-Modified", entry["last_modified"]),
+            ) if v
+        })
+        return response
+
+    def prune(self, expired_only=True, older_than_days=None, pattern=None):
+        clauses, params = [], []
+        if expired_only:
+            clauses.append("expires_at IS NOT NULL AND expires_at < ?")
+            params.append(time.time())
+        if older_than_days is not None:
+            clauses.append("fetched_at < ?")
+            params.append(time.time() - older_than_days * DAY)
+        if pattern:
+            clauses.append("url LIKE ?")
+            params.append(f"%{pattern}%")
+        where = " AND ".join(clauses) or "1"
+        with self.lock:
+            removed = self.conn.execute(f"DELETE FROM responses WHERE {where}", params).rowcount
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+        return removed
+
+    def entries(self, pattern=None):
+        query = "SELECT url, status, length(body), fetched_at, expires_at FROM responses"
+        params = []
+        if pattern:
+            query += " WHERE url LIKE ?"
+            params.append(f"%{pattern}%")
+        with self.lock:
+            return self.conn.execute(query + " ORDER BY url", params).fetchall()
+
+    def stats(self):
+        with self.lock:
+            total, size, permanent, expired = self.conn.execute(
+                "SELECT count(*), coalesce(sum(length(body)), 0), "
+                "sum(expires_at IS NULL), sum(expires_at < ?) FROM responses", (time.time(),)
+            ).fetchone()
+        return {"entries": total, "bytes": size, "permanent": permanent or 0, "expired": expired or 0}
+
+
+def fetch_with_cache(cache, url, fetch):
+    """
+    Serves `url` from the cache when fresh, otherwise calls `fetch(headers)`
+    with conditional-request validators and stores the result. In offline mode
+    stale entries are served and misses raise CacheMiss.
+    """
+    cached = cache.get(url)
+    if cached is not None:
+        return cached
+
+    if is_offline():
+        stale = cache.get(url, allow_stale=True)
+        if stale is None:
+            raise CacheMiss(f"{url} is not cached and offline mode is on")
+        return stale
+
+    ttl = season_ttl(url)
+    response = fetch(cache.validators(url))
+    if response.status_code == 304:
+        cache.refresh(url, ttl)
+        return cache.get(url, allow_stale=True)
+    if response.status_code == 200:
+        cache.store(url, response, ttl)
+    return response
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or prune the scraper HTTP cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="summary of cached entries")
+    list_cmd = sub.add_parser("list", help="list cached URLs")
+    list_cmd.add_argument("--pattern", help="only URLs containing this text")
+    prune_cmd = sub.add_parser("prune", help="delete cached entries")
+    prune_cmd.add_argument("--all", action="store_true", help="include entries that have not expired")
+    prune_cmd.add_argument("--older-than", type=float, metavar="DAYS", help="only entries fetched more than DAYS ago")
+    prune_cmd.add_argument("--pattern", help="only URLs containing this text")
+    args = parser.parse_args()
+
+    cache = get_cache()
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB compressed, "
+              f"{stats['permanent']} permanent, {stats['expired']} expired ({cache.path})")
+    elif args.command == "list":
+        now = time.time()
+        for url, status, size, fetched_at, expires_at in cache.entries(args.pattern):
+            if expires_at is None:
+                state = "permanent"
+            elif expires_at < now:
+                state = "expired"
+            else:
+                state = f"expires in {(expires_at - now) / 3600:.1f}h"
+            print(f"{status}  {size:>8}  {state:<20}  {url}")
+    elif args.command == "prune":
+        removed = cache.prune(expired_only=not args.all, older_than_days=args.older_than, pattern=args.pattern)
+        print(f"🧹 Removed {removed} cached responses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+from http_cache import current_season
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MANIFEST_PATH = os.path.join(project_root, "data", "historical_stats", "season_manifest.json")
+
+# A season's stats are final once its playoffs end; the Super Bowl is in February
+SEASON_FINAL_MONTH = 3
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def partition_hash(df):
+    return hashlib.sha256(df.to_csv(index=False).encode("utf-8")).hexdigest()
+
+
+def manifest_entry(df):
+    return {"rows": len(df), "hash": partition_hash(df), "updated": datetime.now().isoformat(timespec="seconds")}
+
+
+def bootstrap_manifest(manifest, source, store_path, year_col="Year"):
+    """Records partitions already present in an existing store so they are not re-scraped."""
+    partitions = manifest.setdefault(source, {})
+    if partitions or not os.path.exists(store_path):
+        return manifest
+    existing = pd.read_csv(store_path)
+    for year, part in existing.groupby(year_col, sort=True):
+        partitions[str(int(year))] = manifest_entry(part.reset_index(drop=True))
+    return manifest
+
+
+def season_final(year):
+    """When season `year`'s stats stop changing (March of the following year)."""
+    return datetime(year + 1, SEASON_FINAL_MONTH, 1)
+
+
+def scraped_at(entry):
+    # Entries written before "scraped" was recorded fall back to their last write
+    return datetime.fromisoformat(entry.get("scraped", entry["updated"]))
+
+
+def years_to_refresh(manifest, source, start_year, end_year):
+    """
+    Seasons that are missing from the store plus any that may still change:
+    the current season, and any season last scraped before it was final
+    (e.g. the prior season when nothing ran between its playoffs and the
+    September rollover).
+    """
+    known = manifest.get(source, {})
+    season = current_season()
+    return [
+        year for year in range(start_year, end_year + 1)
+        if str(year) not in known or year >= season or scraped_at(known[str(year)]) < season_final(year)
+    ]
+
+
+def merge_partitions(manifest, source, store_path, new_df, year_col="Year"):
+    """
+    Replaces the refreshed seasons in `store_path` with `new_df`'s rows and
+    leaves every other season untouched. Partitions whose content hash is
+    unchanged are skipped (only their scrape time is recorded); returns the
+    list of seasons actually written. An empty `new_df` (nothing fetched)
+    leaves the store and manifest as is.
+    """
+    if new_df.empty:
+        return []
+    partitions = manifest.setdefault(source, {})
+    changed = {}
+    for year, part in new_df.groupby(year_col, sort=True):
+        part = part.reset_index(drop=True)
+        entry = manifest_entry(part)
+        entry["scraped"] = entry["updated"]
+        known = partitions.get(str(int(year)), {})
+        if known.get("hash") != entry["hash"]:
+            changed[int(year)] = (part, entry)
+        else:
+            # Unchanged, but fetched now: a final season stops being refreshed
+            known["scraped"] = entry["scraped"]
+
+    if not changed:
+        return []
+
+    if os.path.exists(store_path):
+        existing = pd.read_csv(store_path)
+        existing = existing[~existing[year_col].isin(list(changed))]
+        merged = pd.concat([existing] + [part for part, _ in changed.values()], ignore_index=True)
+    else:
+        merged = pd.concat([part for part, _ in changed.values()], ignore_index=True)
+
+    merged = merged.sort_values(year_col, kind="mergesort")
+    merged.to_csv(store_path, index=False)
+
+    for year, (_, entry) in changed.items():
+        partitions[str(year)] = entry
+    return sorted(changed)
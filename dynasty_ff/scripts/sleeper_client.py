@@ -0,0 +1,188 @@
+import asyncio
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:  # falls back to a pooled requests session on worker threads
+    aiohttp = None
+
+SLEEPER_API = "https://api.sleeper.app/v1"
+
+# Sleeper asks clients to stay under 1000 calls a minute
+MAX_CONCURRENCY = 8
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+LEAGUE_ENDPOINTS = {
+    "settings": "league/{league_id}",
+    "rosters": "league/{league_id}/rosters",
+    "users": "league/{league_id}/users",
+    "traded_picks": "league/{league_id}/traded_picks",
+}
+TRANSACTIONS_ENDPOINT = "league/{league_id}/transactions/{week}"
+SEASON_WEEKS = range(1, 19)
+
+
+class LeagueData:
+    """
+    Everything fetched for one Sleeper league: `settings` is the league
+    object (scoring_settings, roster_positions, ...), `rosters`, `users` and
+    `traded_picks` the raw API lists, and `transactions` every week's
+    transactions in one list.
+    """
+
+    def __init__(self, league_id, settings, rosters, users, traded_picks, transactions):
+        self.league_id = str(league_id)
+        self.settings = settings
+        self.rosters = rosters
+        self.users = users
+        self.traded_picks = traded_picks
+        self.transactions = transactions
+
+    def owner_names(self):
+        return {user["user_id"]: user.get("display_name", "Unknown") for user in self.users}
+
+    def roster_frame(self):
+        """One row per rostered player, as written to rosters.csv."""
+        owners = self.owner_names()
+        rows = []
+        for r in self.rosters:
+            owner_name = owners.get(r.get("owner_id"), "Unknown")
+            for pid in r.get("players") or []:
+                rows.append({
+                    "Team": owner_name,
+                    "Sleeper_Player_ID": pid,
+                    "Roster_ID": r.get("roster_id"),
+                    "Notes": "Rostered"
+                })
+        return pd.DataFrame(rows, columns=["Team", "Sleeper_Player_ID", "Roster_ID", "Notes"])
+
+
+class SleeperClient:
+    """
+    Async Sleeper API client. Every request goes through one pooled
+    keep-alive session, at most `max_concurrency` are in flight at once, and
+    429/5xx responses and connection errors are retried with exponential
+    backoff. Use as `async with SleeperClient() as client: ...`.
+    """
+
+    def __init__(self, base_url=SLEEPER_API, max_concurrency=MAX_CONCURRENCY, max_retries=4, backoff=1.0, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = None
+        self.semaphore = None
+        self.executor = None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if aiohttp is not None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        else:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if aiohttp is not None:
+            await self.session.close()
+        else:
+            self.session.close()
+            self.executor.shutdown()
+
+    async def request(self, url):
+        """(status, Retry-After header, body bytes); connection failures raise requests.ConnectionError."""
+        if aiohttp is None:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self.request_sync, url)
+        try:
+            async with self.session.get(url) as response:
+                return response.status, response.headers.get("Retry-After"), await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise requests.ConnectionError(f"{url}: {e}") from e
+
+    def request_sync(self, url):
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.Timeout as e:
+            raise requests.ConnectionError(f"{url}: {e}") from e
+        return response.status_code, response.headers.get("Retry-After"), response.content
+
+    async def get_json(self, path):
+        url = f"{self.base_url}/{path}"
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self.semaphore:
+                    status, retry_after, body = await self.request(url)
+            except requests.ConnectionError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    if status >= 400:
+                        raise requests.HTTPError(f"{status} error for {url}")
+                    return json.loads(body)
+            await asyncio.sleep(self.retry_delay(attempt, retry_after))
+
+    def retry_delay(self, attempt, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def fetch_league(self, league_id, weeks=SEASON_WEEKS):
+        """Settings, rosters, users, traded picks and each week's transactions, fetched concurrently."""
+        paths = [path.format(league_id=league_id) for path in LEAGUE_ENDPOINTS.values()]
+        paths += [TRANSACTIONS_ENDPOINT.format(league_id=league_id, week=week) for week in weeks]
+        results = await asyncio.gather(*(self.get_json(path) for path in paths))
+
+        fields = dict(zip(LEAGUE_ENDPOINTS, results))
+        if fields["settings"] is None:
+            raise requests.HTTPError(f"Sleeper has no league {league_id}")
+        transactions = [t for week in results[len(LEAGUE_ENDPOINTS):] for t in week or []]
+        return LeagueData(
+            league_id,
+            fields["settings"],
+            fields["rosters"] or [],
+            fields["users"] or [],
+            fields["traded_picks"] or [],
+            transactions,
+        )
+
+    async def fetch_leagues(self, league_ids, weeks=SEASON_WEEKS):
+        leagues = await asyncio.gather(*(self.fetch_league(league_id, weeks) for league_id in league_ids))
+        return {league.league_id: league for league in leagues}
+
+
+def fetch_leagues(league_ids, weeks=SEASON_WEEKS, **client_options):
+    """
+    {league_id: LeagueData} for every league, all fetched concurrently over
+    one connection pool. `client_options` go to SleeperClient (base_url,
+    max_concurrency, max_retries, ...). Pass weeks=() to skip transactions.
+
+    Safe to call from code already inside an event loop (e.g. a Jupyter
+    cell): the fetch then runs on a worker thread with its own loop. Async
+    callers can also use SleeperClient.fetch_leagues directly.
+    """
+    async def run():
+        async with SleeperClient(**client_options) as client:
+            return await client.fetch_leagues([str(league_id) for league_id in league_ids], weeks)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(lambda: asyncio.run(run())).result()
@@ -0,0 +1,144 @@
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import requests
+
+try:
+    import ijson
+except ImportError:  # falls back to json.load on the cached payload
+    ijson = None
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrape"))
+
+from http_cache import CacheMiss, is_offline
+
+PLAYERS_URL = "https://api.sleeper.app/v1/players/nfl"
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SLEEPER_CACHE_DIR = os.path.join(project_root, "data", "cache", "sleeper")
+PAYLOAD_PATH = os.path.join(SLEEPER_CACHE_DIR, "players_nfl.json")
+SNAPSHOT_PATH = os.path.join(SLEEPER_CACHE_DIR, "players.pkl")
+CHANGES_PATH = os.path.join(SLEEPER_CACHE_DIR, "player_changes.csv")
+
+PAYLOAD_TTL = 24 * 60 * 60
+
+# Fields compared between snapshots
+PLAYER_FIELDS = ["Full_Name", "Position", "Status", "NFL_Team", "years_exp", "rookie_year", "Birth_Date"]
+
+
+def download_payload(path=PAYLOAD_PATH):
+    """Streams the players blob to disk so it is never held in memory whole."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with requests.get(PLAYERS_URL, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(path + ".tmp", "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+    os.replace(path + ".tmp", path)
+    print(f"✅ Downloaded Sleeper players to {path}")
+
+
+def iter_players(path=PAYLOAD_PATH):
+    """(player_id, player dict) pairs, parsed one player at a time when ijson is available."""
+    with open(path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.kvitems(f, "", use_float=True)
+        else:
+            yield from json.load(f).items()
+
+
+def parse_players(path=PAYLOAD_PATH):
+    """Projects the payload onto the fields the pipeline uses, as compact typed columns."""
+    columns = {field: [] for field in ["Sleeper_Player_ID"] + PLAYER_FIELDS}
+    for pid, p in iter_players(path):
+        columns["Sleeper_Player_ID"].append(pid)
+        columns["Full_Name"].append(p.get("full_name"))
+        columns["Position"].append(p.get("position") or None)
+        columns["Status"].append(p.get("status"))
+        columns["NFL_Team"].append(p.get("team") or None)
+        columns["years_exp"].append(p.get("years_exp", 0))
+        columns["rookie_year"].append((p.get("metadata") or {}).get("rookie_year", 0))
+        columns["Birth_Date"].append(p.get("birth_date"))
+
+    df = pd.DataFrame(columns)
+    for col in ["Position", "Status", "NFL_Team"]:
+        df[col] = df[col].astype("category")
+    df["years_exp"] = pd.to_numeric(df["years_exp"], errors="coerce").astype("Int16")
+    df["rookie_year"] = pd.to_numeric(df["rookie_year"], errors="coerce").astype("Int16")
+    return df
+
+
+def diff_snapshots(old, new):
+    """Per-player changes between two snapshots: added, removed, or the fields that changed."""
+    old = old.set_index("Sleeper_Player_ID")
+    new = new.set_index("Sleeper_Player_ID")
+    rows = [(pid, "added", "") for pid in new.index.difference(old.index)]
+    rows += [(pid, "removed", "") for pid in old.index.difference(new.index)]
+
+    common = new.index.intersection(old.index)
+    changed = pd.DataFrame(index=common)
+    for field in PLAYER_FIELDS:
+        before = old.loc[common, field].astype(object)
+        after = new.loc[common, field].astype(object)
+        changed[field] = ~((before == after) | (before.isna() & after.isna()))
+    changed = changed[changed.any(axis=1)]
+    for pid, flags in changed.iterrows():
+        rows.append((pid, "changed", "|".join(flags.index[flags.to_numpy()])))
+
+    return pd.DataFrame(rows, columns=["Sleeper_Player_ID", "Change", "Fields"])
+
+
+def refresh_snapshot():
+    """Re-parses the cached payload and records what changed since the last snapshot."""
+    new = parse_players()
+    if os.path.exists(SNAPSHOT_PATH):
+        changes = diff_snapshots(pd.read_pickle(SNAPSHOT_PATH), new)
+        changes.to_csv(CHANGES_PATH, index=False)
+        print(f"🔄 {len(changes)} Sleeper players changed since the last snapshot")
+    new.to_pickle(SNAPSHOT_PATH)
+    return new
+
+
+def load_player_universe(refresh=False, max_age=PAYLOAD_TTL):
+    """
+    Every Sleeper NFL player with the fields we use. The payload is downloaded
+    at most once per `max_age` seconds (or when refresh=True), and the parsed
+    snapshot is reused until the payload changes. In offline mode a stale
+    payload is used and a missing one raises CacheMiss; if a download fails,
+    the stale payload is used (with a warning) when there is one.
+    """
+    payload_age = time.time() - os.path.getmtime(PAYLOAD_PATH) if os.path.exists(PAYLOAD_PATH) else None
+    if refresh or payload_age is None or payload_age > max_age:
+        if is_offline():
+            if payload_age is None:
+                raise CacheMiss(f"{PLAYERS_URL} is not cached and offline mode is on")
+        else:
+            try:
+                download_payload()
+            except requests.RequestException as e:
+                if payload_age is None:
+                    raise
+                print(f"⚠️ Could not refresh Sleeper players ({e}) - using the copy from {payload_age / 3600:.0f}h ago")
+
+    if os.path.exists(SNAPSHOT_PATH) and os.path.getmtime(SNAPSHOT_PATH) >= os.path.getmtime(PAYLOAD_PATH):
+        return pd.read_pickle(SNAPSHOT_PATH)
+    return refresh_snapshot()
+
+
+def changed_player_ids(kinds=("added", "removed", "changed"), fields=None):
+    """
+    IDs that changed in the latest refresh, for stages that only recompute
+    those players. With `fields`, "changed" players count only when one of
+    those fields changed.
+    """
+    if not os.path.exists(CHANGES_PATH):
+        return set()
+    changes = pd.read_csv(CHANGES_PATH, dtype={"Sleeper_Player_ID": str, "Fields": str}, keep_default_na=False)
+    selected = changes["Change"].isin(kinds)
+    if fields is not None:
+        touched = changes["Fields"].str.split("|").apply(lambda changed: bool(set(changed) & set(fields)))
+        selected &= (changes["Change"] != "changed") | touched
+    return set(changes.loc[selected, "Sleeper_Player_ID"])
@@ -0,0 +1,80 @@
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIER_CUTOFFS_PATH = os.path.join(project_root, "data", "league_data", "tier_cutoffs.csv")
+
+# Tier for values outside every cutoff (and NaN)
+FALLBACK_TIER = "Bench"
+
+
+class TierScheme:
+    """
+    One table-driven tiering: per position, (cutoff, label) pairs best tier
+    first. With direction "max" a value belongs to the first tier whose
+    cutoff it does not exceed (positional ranks, lower is better); with
+    "min" to the first tier whose cutoff it reaches (points, higher is
+    better). Anything else gets FALLBACK_TIER.
+    """
+
+    def __init__(self, name, direction, cutoffs):
+        if direction not in ("max", "min"):
+            raise ValueError(f"Tier scheme {name}: direction must be 'max' or 'min', not {direction!r}")
+        self.name = name
+        self.direction = direction
+        self.cutoffs = cutoffs
+
+    def positions(self):
+        return list(self.cutoffs)
+
+    def labels(self, pos):
+        """The position's tier labels, best first (FALLBACK_TIER not included)."""
+        return [label for _, label in self.cutoffs.get(pos, [])]
+
+    def loosest_tiers(self, positions):
+        """The last (widest) tier of each row's position, FALLBACK_TIER for positions the scheme lacks."""
+        last = {pos: pairs[-1][1] for pos, pairs in self.cutoffs.items() if pairs}
+        return pd.Series(positions, dtype=object).map(last).fillna(FALLBACK_TIER).to_numpy(dtype=object)
+
+    def classify(self, values, positions):
+        """Tier label for every (value, position) pair, one binary search per position."""
+        values = np.asarray(values, dtype=float)
+        positions = np.asarray(positions, dtype=object)
+        tiers = np.full(len(values), FALLBACK_TIER, dtype=object)
+        for pos, pairs in self.cutoffs.items():
+            mask = positions == pos
+            bounds = np.array([cutoff for cutoff, _ in pairs], dtype=float)
+            names = np.array([label for _, label in pairs] + [FALLBACK_TIER], dtype=object)
+            # Bounds ascend either way ("min" cutoffs are negated); NaN sorts past the end -> fallback
+            if self.direction == "max":
+                idx = np.searchsorted(bounds, values[mask], side="left")
+            else:
+                idx = np.searchsorted(-bounds, -values[mask], side="left")
+            tiers[mask] = names[idx]
+        return tiers
+
+
+@lru_cache(maxsize=None)
+def load_tier_schemes(path=TIER_CUTOFFS_PATH):
+    """{scheme name: TierScheme} from the cutoffs table (Scheme, Position, Label, Cutoff, Direction)."""
+    df = pd.read_csv(path)
+    schemes = {}
+    for name, rows in df.groupby("Scheme", sort=False):
+        directions = rows["Direction"].unique()
+        if len(directions) != 1:
+            raise ValueError(f"Tier scheme {name} mixes directions: {', '.join(directions)}")
+        # Positions keep the table's order; each position's tiers run best first
+        rows = rows.sort_values("Cutoff", ascending=directions[0] == "max", kind="stable")
+        cutoffs = {
+            pos: list(zip(pos_rows["Cutoff"].tolist(), pos_rows["Label"].tolist()))
+            for pos, pos_rows in rows.groupby("Position", sort=False)
+        }
+        cutoffs = {pos: cutoffs[pos] for pos in df.loc[df["Scheme"] == name, "Position"].drop_duplicates()}
+        schemes[name] = TierScheme(name, directions[0], cutoffs)
+    return schemes
+
+
+def tier_scheme(name):
+    return load_tier_schemes()[name]
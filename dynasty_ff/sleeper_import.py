@@ -1,42 +1,42 @@
 import os
+import sys
 import json
 import pandas as pd
-from sleeper_wrapper import League
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+
+from sleeper_client import SEASON_WEEKS, fetch_leagues
+
+def get_league(league_id: str, weeks=()):
+    return fetch_leagues([league_id], weeks=weeks)[str(league_id)]
 
 def get_roster_dataframe(league_id: str) -> pd.DataFrame:
-    league = League(league_id)
-    rosters = league.get_rosters()
-    users = league.get_users()
-    user_map = {user["user_id"]: user.get("display_name", "Unknown") for user in users}
-
-    rows = []
-    for r in rosters:
-        owner_name = user_map.get(r.get("owner_id"), "Unknown")
-        for pid in r.get("players", []):
-            rows.append({
-                "Team": owner_name,
-                "Sleeper_Player_ID": pid,
-                "Roster_ID": r.get("roster_id"),
-                "Notes": "Rostered"
-            })
-
-    return pd.DataFrame(rows)
+    return get_league(league_id).roster_frame()
 
 def get_league_settings(league_id: str) -> dict:
-    league = League(league_id)
-    return league.get_league()
+    return get_league(league_id).settings
 
-def save_rosters_and_settings(league_id: str):
-    # Dynamically set save path to project_root/data/league_data
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    save_dir = os.path.join(project_root, "data", "league_data")
+def save_league_files(league, save_dir: str):
+    """Writes rosters.csv and scoring_raw.json, plus traded picks and transactions, for one fetched league."""
     os.makedirs(save_dir, exist_ok=True)
 
-    df = get_roster_dataframe(league_id)
-    df.to_csv(os.path.join(save_dir, "rosters.csv"), index=False)
+    league.roster_frame().to_csv(os.path.join(save_dir, "rosters.csv"), index=False)
     print(f"✅ Saved rosters.csv to {save_dir}")
 
-    settings = get_league_settings(league_id)
     with open(os.path.join(save_dir, "scoring_raw.json"), "w") as f:
-        json.dump(settings, f, indent=2)
+        json.dump(league.settings, f, indent=2)
     print(f"✅ Saved scoring_raw.json to {save_dir}")
+
+    with open(os.path.join(save_dir, "traded_picks.json"), "w") as f:
+        json.dump(league.traded_picks, f, indent=2)
+    with open(os.path.join(save_dir, "transactions.json"), "w") as f:
+        json.dump(league.transactions, f, indent=2)
+
+def save_rosters_and_settings(league_id: str, save_dir: str = None):
+    # Dynamically set save path to project_root/data/league_data
+    if save_dir is None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        save_dir = os.path.join(project_root, "data", "league_data")
+
+    # One fetch for rosters, users, settings, traded picks and transactions
+    save_league_files(get_league(league_id, weeks=SEASON_WEEKS), save_dir)
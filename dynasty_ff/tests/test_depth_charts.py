@@ -0,0 +1,121 @@
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(tests_dir), "scripts", "scrape"))
+
+import fetcher
+import http_cache
+from depth_charts import NFL_TEAMS, scrape_all_depth_charts, scrape_depth_chart
+from fetcher import FetchScheduler
+from http_cache import ResponseCache
+
+FIXTURE_PATH = os.path.join(tests_dir, "fixtures", "espn_depth_chart.html")
+TEAM_PATH = re.compile(r"^/depth/(\w+)$")
+
+
+class FixtureSite:
+    """
+    Serves the ESPN depth chart fixture for /depth/<team>, filled in with the
+    team code. Teams in `blank` get a page without the depth chart table.
+    """
+
+    def __init__(self, blank=()):
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            self.page = f.read()
+        self.blank = {team.lower() for team in blank}
+        self.hits = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                site.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.host = f"127.0.0.1:{self.server.server_address[1]}"
+        self.url_template = f"http://{self.host}/depth/{{team}}"
+
+    def handle(self, handler):
+        self.hits.append(handler.path)
+        match = TEAM_PATH.match(handler.path)
+        if match is None:
+            status, payload = 404, b"not found"
+        elif match.group(1) in self.blank:
+            status, payload = 200, b"<html><body>Loading...</body></html>"
+        else:
+            status, payload = 200, self.page.replace("__TEAM__", match.group(1).upper()).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class BlankBrowsers:
+    """Stands in for the Chrome pool when a page never renders the table."""
+
+    def render(self, url):
+        return "<html><body>Still loading...</body></html>"
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.delenv("DYNASTY_FF_OFFLINE", raising=False)
+    # A private response cache, and a scheduler that doesn't throttle the local host
+    monkeypatch.setattr(http_cache, "_cache", ResponseCache(str(tmp_path / "http_cache.sqlite")))
+    with FixtureSite() as site:
+        monkeypatch.setattr(fetcher, "_scheduler", FetchScheduler(cache=None, rate_limits={site.host: (1000, 1000)}))
+        yield site
+
+
+def test_scrapes_every_team_from_fixture_pages(site, tmp_path):
+    out_path = tmp_path / "depth_charts.csv"
+    scrape_all_depth_charts(url_template=site.url_template, out_path=str(out_path))
+
+    df = pd.read_csv(out_path)
+    # QB, RB, WR and TE starters plus the backup QB; the tackles are dropped
+    assert len(df) == 5 * len(NFL_TEAMS) == 160
+    assert set(df["NFL_Team"]) == NFL_TEAMS
+    kc = df[df["NFL_Team"] == "KC"]
+    assert kc[["Position", "Depth", "Player"]].values.tolist() == [
+        ["QB", 1, "KC Passer"], ["QB", 2, "KC Backup Passer"],
+        ["RB", 1, "KC Runner"], ["WR", 1, "KC Wideout"], ["TE", 1, "KC Tight End"],
+    ]
+
+    # A rerun is served from the cache without touching the site
+    hits = len(site.hits)
+    scrape_all_depth_charts(url_template=site.url_template, out_path=str(out_path))
+    assert len(site.hits) == hits
+    assert len(pd.read_csv(out_path)) == 160
+
+
+def test_pages_without_a_depth_chart_are_not_cached(site):
+    site.blank = {"ari"}
+    url = site.url_template.format(team="ari")
+    assert scrape_depth_chart("ARI", BlankBrowsers(), site.url_template) == []
+    assert http_cache.get_cache().get(url) is None
+
+    # Once the page renders again, the next run picks it up
+    site.blank.clear()
+    assert len(scrape_depth_chart("ARI", BlankBrowsers(), site.url_template)) == 5
+    assert site.hits.count("/depth/ari") == 2
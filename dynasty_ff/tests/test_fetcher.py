@@ -0,0 +1,138 @@
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "scrape"))
+
+from fetcher import FetchScheduler
+
+
+class StubHost:
+    """
+    A local HTTP server that answers every path with its own name and records
+    the order and time of each request. Paths in `fail_once` answer
+    `fail_status` (with `retry_after` as Retry-After) the first time; paths
+    in `slow` are held for `delay` seconds.
+    """
+
+    def __init__(self, fail_once=(), fail_status=503, retry_after=None, slow=(), delay=0.3):
+        self.fail_once = set(fail_once)
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.slow = set(slow)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.host = f"127.0.0.1:{self.server.server_address[1]}"
+        self.url = f"http://{self.host}"
+
+    def paths(self):
+        return [path for path, _ in self.requests]
+
+    def hits(self, path):
+        return self.paths().count(path)
+
+    def handle(self, handler):
+        with self.lock:
+            first_hit = handler.path not in self.paths()
+            self.requests.append((handler.path, time.monotonic()))
+        if handler.path in self.slow:
+            time.sleep(self.delay)
+        if handler.path in self.fail_once and first_hit:
+            status, payload = self.fail_status, b"unavailable"
+        else:
+            status, payload = 200, handler.path.encode("utf-8")
+        handler.send_response(status)
+        if status != 200 and self.retry_after is not None:
+            handler.send_header("Retry-After", str(self.retry_after))
+        handler.send_header("Content-Type", "text/html")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def scheduler_for(stub, **kwargs):
+    # No response cache, so every fetch reaches the stub
+    kwargs.setdefault("rate_limits", {stub.host: (1000, 1000)})
+    return FetchScheduler(cache=None, **kwargs)
+
+
+def test_requests_to_a_host_are_spaced_by_its_token_bucket():
+    with StubHost() as stub:
+        scheduler = scheduler_for(stub, max_workers=4, rate_limits={stub.host: (10, 1)})
+        responses = scheduler.fetch_all([f"{stub.url}/page/{i}" for i in range(5)])
+        scheduler.close()
+
+    assert [r.text for r in responses] == [f"/page/{i}" for i in range(5)]
+    times = sorted(t for _, t in stub.requests)
+    # 10 requests a second with a burst of 1: ~0.1s between requests despite 4 workers
+    assert min(b - a for a, b in zip(times, times[1:])) >= 0.08
+    assert times[-1] - times[0] >= 0.35
+
+
+def test_retryable_statuses_honor_retry_after():
+    for status in (429, 503):
+        with StubHost(fail_once=["/busy"], fail_status=status, retry_after=1) as stub:
+            # A backoff this long would time the test out if Retry-After were ignored
+            scheduler = scheduler_for(stub, backoff=60)
+            start = time.monotonic()
+            [response] = scheduler.fetch_all([f"{stub.url}/busy"])
+            elapsed = time.monotonic() - start
+            scheduler.close()
+
+        assert response.status_code == 200
+        assert stub.hits("/busy") == 2
+        assert 1 <= elapsed < 10
+
+
+def test_queued_urls_run_in_priority_order():
+    with StubHost(slow=["/first"]) as stub:
+        scheduler = scheduler_for(stub, max_workers=1)
+        # The single worker is busy with /first while the rest queue up
+        futures = [scheduler.submit(f"{stub.url}/first")]
+        time.sleep(0.1)
+        futures += [scheduler.submit(f"{stub.url}/p{priority}", priority) for priority in (5, 1, 3, 0)]
+        for future in futures:
+            future.result()
+        scheduler.close()
+
+    assert stub.paths() == ["/first", "/p0", "/p1", "/p3", "/p5"]
+
+
+def test_fetch_all_returns_none_for_failed_urls():
+    # A port nothing listens on: the connection is refused
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_url = f"http://127.0.0.1:{sock.getsockname()[1]}/gone"
+
+    with StubHost() as stub:
+        scheduler = scheduler_for(stub, max_retries=1, backoff=0.01)
+        responses = scheduler.fetch_all([f"{stub.url}/ok", dead_url])
+        scheduler.close()
+
+    assert responses[0].text == "/ok"
+    assert responses[1] is None
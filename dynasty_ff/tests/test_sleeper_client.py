@@ -0,0 +1,170 @@
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from sleeper_client import LEAGUE_ENDPOINTS, fetch_leagues
+
+LEAGUES = {
+    "111": {
+        "settings": {"league_id": "111", "name": "Alpha", "scoring_settings": {"rec": 1.0}},
+        "rosters": [{"roster_id": 1, "owner_id": "u1", "players": ["4046", "6794"]}],
+        "users": [{"user_id": "u1", "display_name": "alpha_owner"}],
+        "traded_picks": [{"season": "2026", "round": 1, "roster_id": 1, "owner_id": 2}],
+    },
+    "222": {
+        "settings": {"league_id": "222", "name": "Beta", "scoring_settings": {"rec": 0.5}},
+        "rosters": [{"roster_id": 1, "owner_id": "u2", "players": ["9509"]}, {"roster_id": 2, "owner_id": None, "players": None}],
+        "users": [{"user_id": "u2", "display_name": "beta_owner"}],
+        "traded_picks": [],
+    },
+}
+PATHS = {
+    re.compile(r"^/league/(\w+)$"): "settings",
+    re.compile(r"^/league/(\w+)/rosters$"): "rosters",
+    re.compile(r"^/league/(\w+)/users$"): "users",
+    re.compile(r"^/league/(\w+)/traded_picks$"): "traded_picks",
+}
+TRANSACTIONS_PATH = re.compile(r"^/league/(\w+)/transactions/(\d+)$")
+
+
+class FakeSleeper:
+    """
+    A local stand-in for the Sleeper API. Unknown leagues answer `null`, as
+    Sleeper does. Each request is held for `delay` seconds so overlapping
+    requests can be counted. Paths in `fail_once` answer 503 (with
+    `retry_after` as Retry-After) the first time they are requested.
+    """
+
+    def __init__(self, delay=0.02, fail_once=(), retry_after=None):
+        self.delay = delay
+        self.fail_once = set(fail_once)
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.hits = {}
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                fake.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def body_for(self, path):
+        match = TRANSACTIONS_PATH.match(path)
+        if match:
+            league_id, week = match.groups()
+            if league_id not in LEAGUES:
+                return None
+            return [{"transaction_id": f"{league_id}-{week}", "leg": int(week)}]
+        for pattern, field in PATHS.items():
+            match = pattern.match(path)
+            if match:
+                league = LEAGUES.get(match.group(1))
+                return league[field] if league else None
+        return None
+
+    def handle(self, handler):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.hits[handler.path] = self.hits.get(handler.path, 0) + 1
+            first_hit = self.hits[handler.path] == 1
+        try:
+            time.sleep(self.delay)
+            if handler.path in self.fail_once and first_hit:
+                status, payload = 503, b"unavailable"
+            else:
+                status, payload = 200, json.dumps(self.body_for(handler.path)).encode("utf-8")
+            handler.send_response(status)
+            if status == 503 and self.retry_after is not None:
+                handler.send_header("Retry-After", str(self.retry_after))
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_fetches_every_league_once_with_typed_results():
+    with FakeSleeper() as fake:
+        leagues = fetch_leagues(["111", 222], weeks=range(1, 4), base_url=fake.url)
+
+    assert sorted(leagues) == ["111", "222"]
+    alpha = leagues["111"]
+    assert alpha.settings["scoring_settings"] == {"rec": 1.0}
+    assert [t["leg"] for t in alpha.transactions] == [1, 2, 3]
+    assert alpha.traded_picks == LEAGUES["111"]["traded_picks"]
+    assert alpha.roster_frame().to_dict(orient="records") == [
+        {"Team": "alpha_owner", "Sleeper_Player_ID": "4046", "Roster_ID": 1, "Notes": "Rostered"},
+        {"Team": "alpha_owner", "Sleeper_Player_ID": "6794", "Roster_ID": 1, "Notes": "Rostered"},
+    ]
+    # An ownerless roster with no players contributes nothing
+    assert leagues["222"].roster_frame()["Team"].tolist() == ["beta_owner"]
+    # One request per endpoint and week, no repeats
+    assert len(fake.hits) == 2 * (len(LEAGUE_ENDPOINTS) + 3)
+    assert set(fake.hits.values()) == {1}
+
+
+def test_concurrency_is_bounded():
+    with FakeSleeper(delay=0.05) as fake:
+        fetch_leagues(["111", "222"], weeks=range(1, 7), base_url=fake.url, max_concurrency=3)
+
+    assert 1 < fake.max_in_flight <= 3
+
+
+def test_503_is_retried_after_retry_after():
+    path = "/league/111/rosters"
+    with FakeSleeper(fail_once=[path], retry_after=1) as fake:
+        start = time.perf_counter()
+        # A backoff this long would time the test out if Retry-After were ignored
+        leagues = fetch_leagues(["111"], weeks=(), base_url=fake.url, backoff=60)
+        elapsed = time.perf_counter() - start
+
+    assert fake.hits[path] == 2
+    assert 1 <= elapsed < 10
+    assert leagues["111"].rosters == LEAGUES["111"]["rosters"]
+
+
+def test_missing_league_raises():
+    with FakeSleeper() as fake:
+        with pytest.raises(requests.HTTPError, match="no league 999"):
+            fetch_leagues(["999"], weeks=(), base_url=fake.url)
+
+
+def test_callable_inside_a_running_event_loop():
+    async def notebook_cell(url):
+        return fetch_leagues(["222"], weeks=(), base_url=url)
+
+    with FakeSleeper() as fake:
+        leagues = asyncio.run(notebook_cell(fake.url))
+
+    assert leagues["222"].settings["name"] == "Beta"